@@ -1,14 +1,18 @@
 # app/auth_utils.py
+import logging
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.database import get_db_async
 from app.models import User
+from app import config
+
+logger = logging.getLogger(__name__)
 
 # Configuration for JWT
 SECRET_KEY = "your-super-secret-key"  # CHANGE THIS!
@@ -19,6 +23,8 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+# Same scheme without the automatic 401, for endpoints that also take a query token
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -44,7 +50,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     )
 
     if not token:
-        print("❌ No token provided")
+        logger.debug("No token provided")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="No authentication token provided",
@@ -52,28 +58,26 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         )
 
     try:
-        print(f"🔍 Validating token: {token[:20]}..." if len(token) > 20 else f"🔍 Validating token: {token}")
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         role: str = payload.get("role")
-        print(f"✅ Token decoded - Username: {username}, Role: {role}")
 
         if username is None or role is None:
-            print("❌ Username or role is None in token payload")
+            logger.info("Token without username or role")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Invalid token payload - Username: {username}, Role: {role}",
                 headers={"WWW-Authenticate": "Bearer"},
             )
     except jwt.ExpiredSignatureError:
-        print("❌ Token has expired")
+        logger.debug("Token has expired")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
     except JWTError as e:
-        print(f"❌ JWT Error: {e}")
+        logger.info("Token validation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Token validation failed: {str(e)}",
@@ -87,6 +91,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
 async def get_current_active_user(user_data: dict = Depends(get_current_user)):
     return user_data
 
+# Streaming endpoints are opened with EventSource, which cannot send an
+# Authorization header, so the token may also come from ?access_token=
+async def get_current_stream_user(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    access_token: Optional[str] = Query(None)
+):
+    return await get_current_user(token or access_token)
+
 # This is the new function to get the current manager user
 async def get_current_active_manager(user_data: dict = Depends(get_current_user)):
     if user_data["role"] != "manager":
@@ -95,3 +107,13 @@ async def get_current_active_manager(user_data: dict = Depends(get_current_user)
             detail="You do not have permission to access this resource"
         )
     return user_data
+
+
+# Admin endpoints are restricted to the employee ids listed in ADMIN_USERS
+async def get_current_active_admin(user_data: dict = Depends(get_current_user)):
+    if user_data["username"] not in config.ADMIN_USERS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access this resource"
+        )
+    return user_data
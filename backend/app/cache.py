@@ -0,0 +1,149 @@
+# app/cache.py
+"""
+Small in-process caches and a topic registry used to invalidate them when the
+underlying tables change ("catalog", "assignments", ...).
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """A dict with per-entry expiry and a size bound (oldest entries are evicted first)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, tuple] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RebuildableIndex:
+    """
+    An in-memory structure built from the database on first use and rebuilt
+    lazily after clear(). Subclasses implement build(db) and return a snapshot;
+    readers always see either the old or the new snapshot, never a half-built
+    one. A subclass may patch its published snapshot in place (PeopleIndex
+    does, for dirty employees) as long as each patch is applied in one
+    synchronous step, with no await in between, so no reader sees it half done.
+    """
+
+    def __init__(self):
+        self._snapshot: Any = None
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def build(self, db) -> Any:
+        raise NotImplementedError
+
+    async def get(self, db) -> Any:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            generation = self._generation
+            snapshot = await self.build(db)
+            # Don't keep a snapshot that was invalidated while it was being built.
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._snapshot = None
+
+
+_topics: Dict[str, List[Any]] = defaultdict(list)
+
+
+def register(topic: str, cache: Any) -> Any:
+    """Registers anything with a clear() method to be flushed by invalidate(topic)."""
+    _topics[topic].append(cache)
+    return cache
+
+
+def invalidate(topic: str) -> None:
+    for cache in _topics.get(topic, ()):
+        cache.clear()
+
+
+def topics() -> List[str]:
+    return list(_topics)
+
+
+def invalidate_all() -> None:
+    for caches in _topics.values():
+        for cache in caches:
+            cache.clear()
+
+
+def call_on_commit(db, callback: Callable[[], None]) -> None:
+    """
+    Runs `callback` once the session's outer transaction commits, and not at
+    all if it rolls back. A callback queued inside a savepoint is dropped if
+    that savepoint rolls back; releasing a savepoint doesn't run anything.
+    """
+    session = db.sync_session
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    session.info.setdefault("on_commit", []).append((transaction, callback))
+
+
+def _within(transaction, ancestor) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_commit")
+def _run_committed(session: Session) -> None:
+    # Also dispatched when a savepoint is released; wait for the outer commit.
+    if session.in_nested_transaction():
+        return
+    for _, callback in session.info.pop("on_commit", ()):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop("on_commit", None)
+        return
+    # A savepoint rolled back: only what was queued inside it is void.
+    pending = session.info.get("on_commit")
+    if pending:
+        session.info["on_commit"] = [
+            (transaction, callback) for transaction, callback in pending
+            if not _within(transaction, previous_transaction)
+        ]
@@ -0,0 +1,85 @@
+# app/config.py
+"""
+Runtime settings read from the environment (and backend/.env when present).
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def env_list(name: str) -> list:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+def env_mapping(name: str) -> dict:
+    """"a=1,b=2" -> {"a": "1", "b": "2"}"""
+    return {key.strip(): value.strip() for key, _, value in (item.partition("=") for item in env_list(name)) if value}
+
+
+# --- Admin access ---
+# Comma-separated employee ids allowed to call the /admin endpoints.
+ADMIN_USERS = set(env_list("ADMIN_USERS"))
+
+# --- Logging ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "json" (one object per line) or "text"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Per-logger levels, e.g. "sqlalchemy.engine=INFO,app.excel_loader=WARNING".
+# sqlalchemy.engine=INFO logs every statement (what echo=True used to do).
+LOG_LEVELS = env_mapping("LOG_LEVELS")
+# Fraction of records below WARNING kept per logger, e.g. "uvicorn.access=0.1"
+LOG_SAMPLE_RATES = {name: float(rate) for name, rate in env_mapping("LOG_SAMPLE_RATES").items()}
+# Records per logger and message per minute before further ones are dropped (0 = unlimited)
+LOG_RATE_LIMIT_PER_MINUTE = env_int("LOG_RATE_LIMIT_PER_MINUTE", 120)
+
+# --- Slow-query log ---
+SLOW_QUERY_THRESHOLD_MS = env_float("SLOW_QUERY_THRESHOLD_MS", 200.0)
+SLOW_QUERY_LOG_SIZE = env_int("SLOW_QUERY_LOG_SIZE", 200)
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+# Entries show parameter names and types; values only when enabled (debugging
+# against test data), since any bind may carry a secret.
+SLOW_QUERY_LOG_VALUES = os.getenv("SLOW_QUERY_LOG_VALUES", "0") == "1"
+
+# --- Event-loop lag monitor ---
+# How often the loop is probed, how long it must be stuck before the blocking
+# stack is sampled, and how many sampled stalls are kept.
+LOOP_LAG_INTERVAL_MS = env_float("LOOP_LAG_INTERVAL_MS", 100.0)
+LOOP_BLOCK_THRESHOLD_MS = env_float("LOOP_BLOCK_THRESHOLD_MS", 200.0)
+LOOP_STALL_LOG_SIZE = env_int("LOOP_STALL_LOG_SIZE", 100)
+
+# --- On-demand request profiling ---
+# Profiles kept per worker, lifetime of the admin's profile token, and the
+# sampling interval when pyinstrument is installed.
+PROFILE_LOG_SIZE = env_int("PROFILE_LOG_SIZE", 20)
+PROFILE_TOKEN_MINUTES = env_int("PROFILE_TOKEN_MINUTES", 15)
+PROFILE_INTERVAL_MS = env_float("PROFILE_INTERVAL_MS", 1.0)
+
+# --- Server-sent events ---
+# Postgres NOTIFY channel used to fan events out to every worker.
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "skillorbit_events")
+EVENTS_QUEUE_SIZE = env_int("EVENTS_QUEUE_SIZE", 100)
+EVENTS_HEARTBEAT_SECONDS = env_float("EVENTS_HEARTBEAT_SECONDS", 15.0)
+# Channel for cache invalidation messages between workers (app/invalidation.py).
+INVALIDATION_CHANNEL = os.getenv("INVALIDATION_CHANNEL", "skillorbit_invalidation")
+
+# --- Org directory ---
+# manager_employee is maintained outside the API, so nothing announces its
+# changes; the in-memory directory is rebuilt at least this often.
+ORG_DIRECTORY_TTL_SECONDS = env_float("ORG_DIRECTORY_TTL_SECONDS", 300.0)
+
+# --- HTTP caching ---
+# How long a worker trusts its copy of a data version before re-reading it;
+# bounds how stale another worker's ETags can be.
+DATA_VERSION_TTL_SECONDS = env_float("DATA_VERSION_TTL_SECONDS", 5.0)
@@ -0,0 +1,206 @@
+# app/coverage.py
+"""
+Team skill coverage and bus-factor analysis.
+
+The team's skills form an employees x skills matrix of levels (1-5, the best
+of competency and self-reported level, as held by the people index). It is
+kept in coordinate form (row, column, level arrays), because a person holds a
+few dozen of the team's thousands of skills, and every figure is a NumPy
+reduction over those arrays:
+
+    holders      people at or above the coverage level, per skill
+    bus factor   the same count: how many people must leave before nobody
+                 covers the skill; 1 means a single point of failure
+    next best    for a skill with one holder, the strongest other person
+    substitute   for each sole holder, the teammate whose skill profile is
+                 most similar (cosine similarity of level vectors)
+"""
+
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from app.org_directory import Report
+from app.people_index import PeopleSnapshot
+
+# Substitutes are computed for at most this many at-risk members.
+MAX_SUBSTITUTE_ROWS = 200
+
+
+class LevelMatrix(NamedTuple):
+    rows: np.ndarray     # employee position in the team
+    columns: np.ndarray  # skill column
+    levels: np.ndarray
+    keys: List[str]
+    names: List[str]
+    shape: tuple
+
+
+def level_matrix(snapshot: PeopleSnapshot, team: Sequence[Report]) -> LevelMatrix:
+    """The team's levels for every skill anyone in it holds, as coordinate arrays."""
+    column_of: Dict[str, int] = {}
+    names: List[str] = []
+    rows: List[int] = []
+    columns: List[int] = []
+    levels: List[int] = []
+    people = snapshot.people
+    add_row, add_column, add_level = rows.append, columns.append, levels.append
+    for row, member in enumerate(team):
+        person = people.get(member.employee_empid)
+        if person is None:
+            continue
+        for key, holding in person.skills.items():
+            level = holding.level
+            if level <= 0:
+                continue
+            column = column_of.get(key)
+            if column is None:
+                column = column_of[key] = len(names)
+                names.append(holding.skill)
+            add_row(row)
+            add_column(column)
+            add_level(level)
+    return LevelMatrix(
+        np.array(rows, dtype=np.int32), np.array(columns, dtype=np.int32), np.array(levels, dtype=np.int8),
+        list(column_of), names, (len(team), len(names)),
+    )
+
+
+def _member(team: Sequence[Report], row: int) -> dict:
+    return {"employee_empid": team[row].employee_empid, "employee_name": team[row].employee_name}
+
+
+def analyze(snapshot: PeopleSnapshot, team: Sequence[Report], min_level: int, limit: int = 200) -> dict:
+    """
+    Coverage of `team` at `min_level`. Skills are listed most at risk first
+    (fewest holders, then fewest people with any level), up to `limit`; the
+    summary counts all of them.
+    """
+    matrix = level_matrix(snapshot, team)
+    team_size, skill_count = matrix.shape
+    rows, columns, levels = matrix.rows, matrix.columns, matrix.levels
+    names = matrix.names
+
+    # Step 1: per-skill reductions
+    covers = levels >= min_level
+    holders = np.bincount(columns[covers], minlength=skill_count)
+    held = np.bincount(columns, minlength=skill_count)
+    level_sums = np.bincount(columns, weights=levels, minlength=skill_count)
+    average_level = np.divide(level_sums, held, out=np.zeros(skill_count), where=held > 0)
+
+    # Step 2: for single-holder skills, the holder and the best other person.
+    # Entries sorted by (column, level desc): the first entry of a column is
+    # its holder, the second the next best.
+    single = holders == 1
+    in_single = np.flatnonzero(single[columns])
+    order = in_single[np.lexsort((-levels[in_single], columns[in_single]))]
+    first = np.ones(order.size, dtype=bool)
+    first[1:] = columns[order[1:]] != columns[order[:-1]]
+    second = np.zeros(order.size, dtype=bool)
+    second[1:] = first[:-1] & ~first[1:]
+    sole_holder = {int(c): int(r) for c, r in zip(columns[order[first]], rows[order[first]])}
+    next_best = {
+        int(c): (int(r), int(level))
+        for c, r, level in zip(columns[order[second]], rows[order[second]], levels[order[second]])
+    }
+
+    # Step 3: members who are the sole holder of something, and their closest substitutes
+    sole_counts = np.bincount(np.fromiter(sole_holder.values(), dtype=np.int64, count=len(sole_holder)), minlength=team_size)
+    at_risk = np.flatnonzero(sole_counts)
+    at_risk = at_risk[np.argsort(-sole_counts[at_risk], kind="stable")][:MAX_SUBSTITUTE_ROWS]
+    substitutes = _closest_substitutes(matrix, at_risk)
+    covered_counts = np.bincount(rows[covers], minlength=team_size)
+
+    sole_skills: Dict[int, List[str]] = {}
+    for column, row in sole_holder.items():
+        sole_skills.setdefault(row, []).append(names[column])
+
+    skills = []
+    for column in np.lexsort((held, holders))[:limit].tolist():
+        holder_count = int(holders[column])
+        entry = {
+            "skill": names[column],
+            "skill_key": matrix.keys[column],
+            "holders": holder_count,
+            "bus_factor": holder_count,
+            "people_with_any_level": int(held[column]),
+            "average_level": round(float(average_level[column]), 2),
+            "redundancy": round(holder_count / team_size, 3),
+            "sole_holder": None,
+            "next_best": None,
+        }
+        if column in sole_holder:
+            entry["sole_holder"] = _member(team, sole_holder[column])
+            if column in next_best:
+                next_row, next_level = next_best[column]
+                entry["next_best"] = {**_member(team, next_row), "level": next_level}
+        skills.append(entry)
+
+    members = []
+    for row, (substitute, similarity) in zip(at_risk.tolist(), substitutes):
+        members.append({
+            **_member(team, row),
+            "skills_held": int(covered_counts[row]),
+            "sole_holder_of": sorted(sole_skills.get(row, [])),
+            "closest_substitute": (
+                {**_member(team, substitute), "similarity": round(similarity, 3)} if substitute is not None else None
+            ),
+        })
+
+    return {
+        "team_size": team_size,
+        "min_level": min_level,
+        "summary": {
+            "skills": skill_count,
+            "single_points_of_failure": int(single.sum()),
+            "uncovered": int((holders == 0).sum()),
+            "average_bus_factor": round(float(holders.mean()), 2) if skill_count else None,
+        },
+        "skills": skills,
+        "at_risk_members": members,
+    }
+
+
+def _closest_substitutes(matrix: LevelMatrix, members: np.ndarray) -> list:
+    """
+    (row, similarity) of the most similar other member for each of `members`,
+    or (None, 0.0) if nobody shares a skill with them. Dot products only run
+    over the members' own skill columns: every (member, skill) entry is paired
+    with the entries of everyone else holding that skill, and the products are
+    summed per (member, other) with one bincount.
+    """
+    team_size, skill_count = matrix.shape
+    if members.size == 0:
+        return []
+    rows, columns = matrix.rows, matrix.columns
+    levels = matrix.levels.astype(np.float32)
+    norms = np.sqrt(np.bincount(rows, weights=levels * levels, minlength=team_size))
+    norms[norms == 0] = 1.0
+
+    # Entries grouped by column: column c is by_column[starts[c]:starts[c + 1]]
+    by_column = np.argsort(columns, kind="stable")
+    starts = np.searchsorted(columns[by_column], np.arange(skill_count + 1))
+
+    position = np.full(team_size, -1, dtype=np.int64)
+    position[members] = np.arange(members.size)
+    own = np.flatnonzero(position[rows] >= 0)
+    counts = starts[columns[own] + 1] - starts[columns[own]]
+    # Concatenated ranges starts[c]:starts[c + 1] for every own entry
+    total = int(counts.sum())
+    range_starts = np.repeat(starts[columns[own]] - (np.cumsum(counts) - counts), counts)
+    paired = by_column[np.arange(total) + range_starts]
+
+    owner = np.repeat(position[rows[own]], counts)
+    dots = np.bincount(
+        owner * team_size + rows[paired],
+        weights=np.repeat(levels[own], counts) * levels[paired],
+        minlength=members.size * team_size,
+    ).reshape(members.size, team_size)
+    similarity = dots / (norms[members][:, None] * norms[None, :])
+    similarity[np.arange(members.size), members] = -1.0
+    best = similarity.argmax(axis=1)
+    scores = similarity[np.arange(members.size), best]
+    return [
+        (row, score) if score > 0 else (None, 0.0)
+        for row, score in zip(best.tolist(), scores.tolist())
+    ]
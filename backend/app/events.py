@@ -0,0 +1,111 @@
+# app/events.py
+"""
+Per-user change events for the /events/stream push channel.
+
+Route handlers call `publish()` inside their transaction. On Postgres the
+events go out with pg_notify, which the database delivers only if the
+transaction commits, to every worker's NotifyBridge; each worker then fans
+them out to its own subscribers. Without the bridge (other databases, or
+while the listener is reconnecting) events are held on the session and
+delivered locally after commit.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import cache, config
+from app.notify_bridge import bridge
+
+logger = logging.getLogger(__name__)
+
+# Sent to a subscriber whose events were dropped; the client should refetch.
+RESYNC = {"type": "resync", "data": {}}
+
+NOTIFY_EVENTS_SQL = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"
+)
+
+
+class EventBroker:
+    """In-process fan-out: one bounded queue per open stream, keyed by user."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    @asynccontextmanager
+    async def subscribe(self, user: str):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user].add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user]
+
+    def publish_local(self, event: dict) -> None:
+        for queue in self._subscribers.get(event["user"], ()):
+            self._put(queue, {"type": event["type"], "data": event.get("data", {})})
+
+    def resync_all(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._put(queue, RESYNC)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, item: dict) -> None:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # A slow client gets one resync instead of an unbounded backlog.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+broker = EventBroker(config.EVENTS_QUEUE_SIZE)
+
+
+async def publish(db: AsyncSession, users: Iterable[str], event_type: str, data: Optional[dict] = None) -> None:
+    """Queues `event_type` for each user; delivered only if `db` commits."""
+    events: List[dict] = [
+        {"user": user, "type": event_type, "data": data or {}}
+        for user in dict.fromkeys(users) if user
+    ]
+    if not events:
+        return
+    if bridge.connected:
+        await db.execute(NOTIFY_EVENTS_SQL, {
+            "channel": config.EVENTS_CHANNEL,
+            "payloads": [json.dumps(e, default=str) for e in events],
+        })
+    else:
+        # Open the transaction first, so the events belong to it (or to the
+        # current savepoint) and a rollback discards them.
+        await db.connection()
+        for pending in events:
+            cache.call_on_commit(db, partial(broker.publish_local, pending))
+
+
+def _handle_notification(payload: str) -> None:
+    broker.publish_local(json.loads(payload))
+
+
+bridge.listen(config.EVENTS_CHANNEL, _handle_notification)
+# Notifications sent while the listener was down are gone; tell clients to refetch.
+bridge.on_reconnect(broker.resync_all)
@@ -3,10 +3,16 @@ import numpy as np
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from .models import Trainer, TrainingDetail
+from .parsing import parse_seats, training_window
+from . import invalidation, taxonomy, versions
+from .org_directory import org_directory
 import logging
-from typing import Any
+from typing import Any, List
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Skipped rows are reported as one message listing up to this many row numbers.
+SKIPPED_ROWS_SHOWN = 20
 
 
 def clean_headers(df: pd.DataFrame) -> pd.DataFrame:
@@ -22,29 +28,39 @@ def clean_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def log_skipped_rows(sheet: str, column: str, rows: List[int]) -> None:
+    """One summary line per sheet instead of a warning (and a row dump) per skipped row."""
+    if not rows:
+        return
+    shown = ", ".join(str(row) for row in rows[:SKIPPED_ROWS_SHOWN])
+    more = f" and {len(rows) - SKIPPED_ROWS_SHOWN} more" if len(rows) > SKIPPED_ROWS_SHOWN else ""
+    logger.warning("Skipped %s '%s' rows with no '%s': rows %s%s", len(rows), sheet, column, shown, more)
+
+
 async def load_all_from_excel(excel_file_source: Any, db: AsyncSession):
     """
     Loads all data from a given Excel file source in a single, safe transaction.
     """
-    logging.info(f"--- Starting Excel data load ---")
+    logger.info("--- Starting Excel data load ---")
     try:
-        logging.info("Step 1: Clearing old data from tables...")
+        logger.info("Step 1: Clearing old data from tables...")
         await db.execute(text("DELETE FROM training_assignments"))
         await db.execute(text("DELETE FROM training_details"))
         await db.execute(text("DELETE FROM trainers"))
-        logging.info("-> Old data cleared successfully.")
+        logger.info("-> Old data cleared successfully.")
 
         # --- 1. Load Trainers Details ---
-        logging.info("Step 2: Reading 'Trainers Details' sheet from Excel...")
+        logger.info("Step 2: Reading 'Trainers Details' sheet from Excel...")
         df_trainers = pd.read_excel(excel_file_source, sheet_name="Trainers Details", engine='openpyxl')
         df_trainers = df_trainers.replace({np.nan: None})
         df_trainers = clean_headers(df_trainers)
-        logging.info(f"-> Found {len(df_trainers)} rows in 'Trainers Details'.")
+        logger.info("-> Found %s rows in 'Trainers Details'.", len(df_trainers))
 
         trainers_to_add = []
+        skipped = []
         for i, row in enumerate(df_trainers.to_dict('records')):
             if not row.get("competency"):
-                logging.warning(f"Skipping trainer row {i+2} due to missing 'competency': {row}")
+                skipped.append(i + 2)
                 continue
             trainers_to_add.append(
                 Trainer(
@@ -55,18 +71,22 @@ async def load_all_from_excel(excel_file_source: Any, db: AsyncSession):
                 )
             )
 
+        log_skipped_rows("Trainers Details", "competency", skipped)
+
         # --- 2. Load Training Details ---
-        logging.info("Step 3: Reading 'Training Details' sheet from Excel...")
+        logger.info("Step 3: Reading 'Training Details' sheet from Excel...")
         excel_file_source.seek(0)
         df_trainings = pd.read_excel(excel_file_source, sheet_name="Training Details", engine='openpyxl')
         df_trainings = df_trainings.replace({np.nan: None})
         df_trainings = clean_headers(df_trainings)
-        logging.info(f"-> Found {len(df_trainings)} rows in 'Training Details'.")
+        logger.info("-> Found %s rows in 'Training Details'.", len(df_trainings))
 
+        org = await org_directory.get(db)
         trainings_to_add = []
+        skipped = []
         for i, row in enumerate(df_trainings.to_dict('records')):
             if not row.get("trainingname_program"):
-                logging.warning(f"Skipping training row {i+2} due to missing 'trainingname_program': {row}")
+                skipped.append(i + 2)
                 continue
 
             date_val = row.get("training_dates")
@@ -76,6 +96,7 @@ async def load_all_from_excel(excel_file_source: Any, db: AsyncSession):
             # .date() extracts just the date part, which is common for DBs.
             # If your DB column is DATETIME or TIMESTAMP, you can remove .date()
             final_date = pd.to_datetime(date_val).date() if pd.notna(date_val) else None
+            starts_at, ends_at = training_window(final_date, row.get("time"), row.get("duration_(in_hrs)"))
 
             trainings_to_add.append(
                 TrainingDetail(
@@ -88,6 +109,7 @@ async def load_all_from_excel(excel_file_source: Any, db: AsyncSession):
                     prerequisites=row.get("perquisites"),
                     skill_category=row.get("skill_category_(l1_-_l5)"),
                     trainer_name=row.get("trainer_name"),
+                    trainer_empid=org.trainer_empid(row.get("email_id"), row.get("trainer_name")),
                     email=row.get("email_id"),
                     
                     # Pass the corrected date object, not a string
@@ -95,29 +117,43 @@ async def load_all_from_excel(excel_file_source: Any, db: AsyncSession):
                     
                     # Also corrected duration and seats to be strings (as per your model), but better if they are integers
                     duration=str(row.get("duration_(in_hrs)")) if pd.notna(row.get("duration_(in_hrs)")) else None,
-                    seats=str(row.get("no._of_seats")) if pd.notna(row.get("no._of_seats)")) else None,
+                    seats=str(row.get("no._of_seats")) if pd.notna(row.get("no._of_seats")) else None,
+                    seat_capacity=parse_seats(row.get("no._of_seats")),
                     
                     time=row.get("time"),
+                    starts_at=starts_at,
+                    ends_at=ends_at,
                     training_type=row.get("training_type"),
                     assessment_details=row.get("assessment_details"),
                 )
             )
 
+        log_skipped_rows("Training Details", "trainingname_program", skipped)
+
         # --- 3. Add all objects to the session ---
-        logging.info(f"Step 4: Preparing to add {len(trainers_to_add)} trainers and {len(trainings_to_add)} trainings to the database session.")
+        logger.info("Step 4: Preparing to add %s trainers and %s trainings to the database session.", len(trainers_to_add), len(trainings_to_add))
         if trainers_to_add:
             db.add_all(trainers_to_add)
         if trainings_to_add:
             db.add_all(trainings_to_add)
-        logging.info("-> Data added to session successfully.")
+        logger.info("-> Data added to session successfully.")
+
+        # New skill names from both sheets go into the skill dictionary, and any
+        # competency rows loaded since the last upload get linked to it.
+        await db.flush()
+        linked = await taxonomy.populate(db)
+        logger.info("-> Skill dictionary updated (%s skill names linked).", linked)
+        # New catalog version: every cached catalog body and ETag goes stale.
+        await versions.bump(db, [versions.CATALOG])
+        await invalidation.publish(db, topics=["catalog", "trainers"])
 
         # --- 4. Commit the transaction ---
-        logging.info("Step 5: Committing transaction to the database...")
+        logger.info("Step 5: Committing transaction to the database...")
         await db.commit()
-        logging.info("✅ COMMIT SUCCESSFUL! Database has been updated with the new data from Excel.")
+        logger.info("✅ COMMIT SUCCESSFUL! Database has been updated with the new data from Excel.")
 
     except Exception as e:
-        logging.error(f"❌ An error occurred during the Excel loading process: {e}", exc_info=True)
-        logging.error("Rolling back all changes. Your database is in its original state.")
+        logger.error("❌ An error occurred during the Excel loading process: %s", e, exc_info=True)
+        logger.error("Rolling back all changes. Your database is in its original state.")
         await db.rollback()
         raise
\ No newline at end of file
@@ -0,0 +1,111 @@
+# app/http_cache.py
+"""
+Conditional GET helpers: strong ETags built from data versions, 304s for
+If-None-Match / If-Modified-Since, and JSON bodies pre-rendered once per
+version in identity, gzip and (when the brotli package is installed) br
+encodings.
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+CACHE_CONTROL = "private, no-cache"
+ENCODINGS = ("identity", "gzip", "br") if brotli is not None else ("identity", "gzip")
+
+
+class Rendered(NamedTuple):
+    # encoding ("identity", "gzip", "br") -> body
+    bodies: Dict[str, bytes]
+
+
+def render(payload) -> Rendered:
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+    bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=6)}
+    if "br" in ENCODINGS:
+        bodies["br"] = brotli.compress(body, quality=5)
+    return Rendered(bodies)
+
+
+def _etag(tag: str, encoding: str) -> str:
+    # Each encoding is a different byte sequence, so it gets its own strong ETag.
+    return f'"{tag}"' if encoding == "identity" else f'"{tag}-{encoding}"'
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def choose_encoding(request: Request, available) -> str:
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, 0) > 0:
+            return encoding
+    return "identity"
+
+
+def is_fresh(request: Request, tag: str, last_modified: Optional[datetime]) -> bool:
+    """True if the client's copy matches `tag` (in any encoding) or is not older than last_modified."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        known = {_etag(tag, encoding) for encoding in ENCODINGS}
+        candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+        return "*" in candidates or bool(candidates & known)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # "-0000" (and obsolete zone names) parse as naive; HTTP dates are UTC
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def _headers(tag: str, encoding: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": _etag(tag, encoding), "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding, Authorization"}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def not_modified(request: Request, tag: str, last_modified: Optional[datetime], encoded: bool = True) -> Response:
+    """A 304 carrying the ETag of the variant the client would have received."""
+    encoding = choose_encoding(request, ENCODINGS) if encoded else "identity"
+    return Response(status_code=304, headers=_headers(tag, encoding, last_modified))
+
+
+def respond(request: Request, rendered: Rendered, tag: str, last_modified: Optional[datetime]) -> Response:
+    encoding = choose_encoding(request, rendered.bodies)
+    headers = _headers(tag, encoding, last_modified)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=rendered.bodies[encoding], media_type="application/json", headers=headers)
+
+
+def respond_json(payload, tag: str, last_modified: Optional[datetime]) -> Response:
+    """An uncompressed, un-cached JSON body with the validators; for per-user responses."""
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+    return Response(content=body, media_type="application/json", headers=_headers(tag, "identity", last_modified))
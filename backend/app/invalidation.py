@@ -0,0 +1,108 @@
+# app/invalidation.py
+"""
+Cross-worker cache invalidation.
+
+Writers call `publish()` inside their transaction with what they changed:
+
+    topics   cache topics to flush everywhere ("catalog", "skills", ...)
+    versions data versions that were bumped (name -> Version)
+    people   employees whose search entries must be reloaded
+
+The message is applied to this worker's caches when the session commits and,
+on Postgres, sent with pg_notify in the same transaction, so other workers
+see it only if the write committed, in commit order. Each worker receives
+messages on its NotifyBridge connection and applies the ones it didn't send.
+
+Postgres never drops a committed notification for a connected listener, so
+the only gap is while a worker's listener connection is down: on reconnect
+the worker flushes every cache instead of guessing what it missed.
+"""
+
+import json
+import logging
+import os
+import socket
+import uuid
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import cache, config
+from app.notify_bridge import bridge
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+# NOTIFY payloads are capped at 8000 bytes; versions and people are sent in
+# slices small enough to stay well under that.
+ITEMS_PER_MESSAGE = 50
+
+NOTIFY_SQL = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
+
+# message kind -> handler(items) for kinds owned by other modules
+_handlers: Dict[str, Callable[[list], None]] = {}
+
+
+def handle(kind: str, handler: Callable[[list], None]) -> None:
+    """Registers how to apply the items of one message kind ("versions", "people")."""
+    _handlers[kind] = handler
+
+
+def _apply(message: Mapping[str, list]) -> None:
+    for topic in message.get("topics", ()):
+        cache.invalidate(topic)
+    for kind, handler in _handlers.items():
+        items = message.get(kind)
+        if items:
+            handler(items)
+
+
+def _payloads(message: Dict[str, list]) -> List[str]:
+    payloads = []
+    if message.get("topics"):
+        payloads.append(json.dumps({"sender": WORKER_ID, "topics": message["topics"]}))
+    for kind, items in message.items():
+        if kind == "topics":
+            continue
+        for offset in range(0, len(items), ITEMS_PER_MESSAGE):
+            payloads.append(json.dumps({"sender": WORKER_ID, kind: items[offset:offset + ITEMS_PER_MESSAGE]}, default=str))
+    return payloads
+
+
+async def publish(
+    db: AsyncSession,
+    topics: Iterable[str] = (),
+    versions: Optional[Mapping[str, tuple]] = None,
+    people: Iterable[str] = (),
+) -> None:
+    """Invalidates on every worker once `db` commits (and nowhere on rollback)."""
+    message: Dict[str, list] = {}
+    if topics:
+        message["topics"] = list(dict.fromkeys(topics))
+    if versions:
+        message["versions"] = [[name, *version] for name, version in versions.items()]
+    if people:
+        message["people"] = list(dict.fromkeys(people))
+    if not message:
+        return
+
+    cache.call_on_commit(db, lambda: _apply(message))
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(NOTIFY_SQL, {"channel": config.INVALIDATION_CHANNEL, "payloads": _payloads(message)})
+
+
+def _handle_notification(payload: str) -> None:
+    message = json.loads(payload)
+    if message.get("sender") == WORKER_ID:
+        return  # already applied on commit
+    _apply(message)
+
+
+def _flush_after_gap() -> None:
+    logger.info("Invalidation listener connected; flushing all caches")
+    cache.invalidate_all()
+
+
+bridge.listen(config.INVALIDATION_CHANNEL, _handle_notification)
+bridge.on_reconnect(_flush_after_gap)
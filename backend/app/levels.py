@@ -0,0 +1,33 @@
+# app/levels.py
+"""
+Expertise level parsing shared by the dashboards, recommendations and search.
+"""
+
+from typing import Optional
+
+TEXT_LEVELS = {
+    'BEGINNER': 1,
+    'INTERMEDIATE': 2,
+    'ADVANCED': 3,
+    'EXPERT': 4
+}
+
+
+def parse_level(level_str: Optional[str]) -> Optional[int]:
+    """
+    Converts 'L0'..'L5' or Beginner/Intermediate/Advanced/Expert to a number.
+    Returns None for missing or unrecognised values.
+    """
+    if level_str is None:
+        return None
+    value = level_str.strip().upper()
+
+    # Handle L-format (L0, L1, L2, L3, L4, L5)
+    if value.startswith('L'):
+        try:
+            number = int(value.lstrip('L'))
+        except ValueError:
+            return None
+        return number if number >= 0 else None
+
+    return TEXT_LEVELS.get(value)
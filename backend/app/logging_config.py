@@ -0,0 +1,177 @@
+# app/logging_config.py
+"""
+Central logging setup.
+
+Loggers only put records on an in-memory queue (QueueHandler); a
+QueueListener thread formats and writes them, so logging never blocks the
+event loop on stderr. Records are emitted as JSON lines carrying the request
+id and route of the request that logged them. Levels are set per logger from
+LOG_LEVELS, records below WARNING can be sampled per logger
+(LOG_SAMPLE_RATES), and every logger/message pair is rate limited
+(LOG_RATE_LIMIT_PER_MINUTE) with a count of what was dropped.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from app import config
+from app.request_context import current_request
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - [%(request_id)s] %(message)s"
+# uvicorn installs its own handlers; route them through the queue as well.
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+# Distinct (logger, message template) pairs tracked by RateLimitFilter
+MAX_RATE_WINDOWS = 10000
+
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps each record with the current request; runs in the logging thread, before queueing."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        info = current_request.get()
+        record.request_id = info.request_id if info else None
+        record.route = info.route if info else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of the records below WARNING from the configured loggers."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        name = record.name
+        while name:
+            rate = self.rates.get(name)
+            if rate is not None:
+                return random.random() < rate
+            name = name.rpartition(".")[0]
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    At most `per_minute` records per logger and message template per minute;
+    the first record after a suppressed stretch reports how many were dropped.
+    Errors are never limited.
+    """
+
+    def __init__(self, per_minute: int):
+        super().__init__()
+        self.per_minute = per_minute
+        # (logger, template) -> [window start, emitted, suppressed]
+        self._windows: Dict[Tuple[str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR or self.per_minute <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= 60:
+            if window is None and len(self._windows) >= MAX_RATE_WINDOWS:
+                self._prune(now)
+            suppressed = window[2] if window else 0
+            window = self._windows[key] = [now, 0, 0]
+            if suppressed:
+                record.suppressed = suppressed
+        if window[1] >= self.per_minute:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+    def _prune(self, now: float) -> None:
+        """Drops expired windows, keeping those with a suppressed count still to report if possible."""
+        expired = [key for key, window in self._windows.items() if now - window[0] >= 60]
+        quiet = [key for key in expired if not self._windows[key][2]]
+        for key in quiet if len(self._windows) - len(quiet) < MAX_RATE_WINDOWS else expired:
+            del self._windows[key]
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        # request_id, route, suppressed and any `extra=` fields
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; only make the record
+        # safe to hand over (arguments may be mutated after this call).
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+
+def setup_logging() -> None:
+    """Installs the queue-based pipeline on the root logger. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    if config.LOG_FORMAT == "text":
+        output.setFormatter(logging.Formatter(TEXT_FORMAT, defaults={"request_id": "-"}))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    handler = _QueueHandler(queue.SimpleQueue())
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(config.LOG_SAMPLE_RATES))
+    handler.addFilter(RateLimitFilter(config.LOG_RATE_LIMIT_PER_MINUTE))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(config.LOG_LEVEL.upper())
+    for name in UVICORN_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = True
+    for name, level in config.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flushes queued records; called at exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,157 @@
+# app/loop_monitor.py
+"""
+Event-loop lag monitor.
+
+A ticker task sleeps LOOP_LAG_INTERVAL_MS at a time and records how late it
+wakes up in a histogram; anything beyond a few milliseconds means some
+callback held the loop. A watchdog thread watches the ticker's heartbeat:
+when the loop has not come back for LOOP_BLOCK_THRESHOLD_MS it samples the
+loop thread's stack, so a stall is recorded with the code that was running
+and the route it was serving, not just its duration.
+"""
+
+import asyncio
+import itertools
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app import config
+from app.request_context import RequestContextMiddleware, RequestInfo
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the lag histogram buckets, in milliseconds.
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+STACK_DEPTH = 40
+
+_MIDDLEWARE_CODE = RequestContextMiddleware.__call__.__code__
+
+
+class LagHistogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, lag_ms: float) -> None:
+        for index, bound in enumerate(BUCKETS_MS):
+            if lag_ms <= bound:
+                self.counts[index] += 1
+                break
+        self.total += 1
+        self.sum_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = list(itertools.accumulate(self.counts))
+        return {
+            "buckets": [
+                {"le_ms": "+Inf" if bound == float("inf") else bound, "count": count}
+                for bound, count in zip(BUCKETS_MS, cumulative)
+            ],
+            "count": self.total,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+def _route_on_stack(frame) -> Optional[str]:
+    """The route being served, read from the request middleware's frame on the blocked stack."""
+    while frame is not None:
+        if frame.f_code is _MIDDLEWARE_CODE:
+            scope = frame.f_locals.get("scope")
+            if isinstance(scope, dict) and scope.get("type") == "http":
+                return RequestInfo(scope).route
+        frame = frame.f_back
+    return None
+
+
+class LoopMonitor:
+    def __init__(self, interval_ms: float, threshold_ms: float, log_size: int):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.histogram = LagHistogram()
+        self.stalls: deque = deque(maxlen=log_size)
+        self._stall_ids = itertools.count(1)
+        self._open_stall: Optional[Dict[str, Any]] = None
+        self._last_tick = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            # Measured from the previous heartbeat, so a stall that starts
+            # before this task first runs is still counted.
+            lag_ms = max(now - self._last_tick - self.interval, 0) * 1000
+            self._last_tick = now
+            self.histogram.observe(lag_ms)
+            stall = self._open_stall
+            if stall is not None:
+                self._open_stall = None
+                stall["duration_ms"] = round(lag_ms, 1)
+                logger.warning("Event loop blocked for %.0f ms in %s", lag_ms, stall["route"] or "a background task")
+
+    def _watch(self) -> None:
+        """Runs in its own thread: samples the loop thread's stack while the loop is stuck."""
+        sampled_tick = None
+        while not self._stopped.wait(self.threshold / 4):
+            last_tick = self._last_tick
+            if time.monotonic() - last_tick < self.interval + self.threshold or last_tick == sampled_tick:
+                continue
+            # One sample per stall, taken once it has crossed the threshold.
+            sampled_tick = last_tick
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stall = {
+                "id": next(self._stall_ids),
+                "detected_at": datetime.utcnow().isoformat(),
+                "route": _route_on_stack(frame),
+                "duration_ms": None,  # filled in when the loop resumes
+                "stack": traceback.format_stack(frame, limit=STACK_DEPTH),
+            }
+            self.stalls.append(stall)
+            self._open_stall = stall
+
+    def report(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        stalls: List[Dict[str, Any]] = list(reversed(self.stalls))
+        return {
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag": self.histogram.snapshot(),
+            "stalls": stalls[:limit] if limit else stalls,
+        }
+
+
+monitor = LoopMonitor(config.LOOP_LAG_INTERVAL_MS, config.LOOP_BLOCK_THRESHOLD_MS, config.LOOP_STALL_LOG_SIZE)
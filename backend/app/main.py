@@ -2,12 +2,19 @@ import logging
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routes import register, login, dashboard_routes, additional_skills, training_routes, assignment_routes
-from app.database import AsyncSessionLocal, create_db_and_tables
-from app.excel_loader import load_all_from_excel
+from app.routes import register, login, dashboard_routes, additional_skills, training_routes, assignment_routes, admin_routes, recommendation_routes, trainer_routes, event_routes, skill_routes, search_routes, export_routes, trend_routes
+from app.database import AsyncSessionLocal, async_engine
+from app.migrations import check_schema_version
+from app.request_context import RequestContextMiddleware
+from app.profiling import ProfilingMiddleware
+from app.notify_bridge import bridge
+from app import slow_query_log
+from app.loop_monitor import monitor
+from app.org_directory import org_directory
+from app.logging_config import setup_logging
 
 # --- Configuration ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+setup_logging()
 
 # --- FastAPI App Initialization ---
 app = FastAPI(
@@ -28,6 +35,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
+# --- Slow-query log ---
+slow_query_log.install(async_engine)
 
 # --- API Routers ---
 app.include_router(register.router)
@@ -36,6 +48,14 @@ app.include_router(dashboard_routes.router)
 app.include_router(additional_skills.router)
 app.include_router(training_routes.router)
 app.include_router(assignment_routes.router)
+app.include_router(recommendation_routes.router)
+app.include_router(trainer_routes.router)
+app.include_router(event_routes.router)
+app.include_router(skill_routes.router)
+app.include_router(search_routes.router)
+app.include_router(export_routes.router)
+app.include_router(trend_routes.router)
+app.include_router(admin_routes.router)
 
 
 # <<< NEW: Root Endpoint for Welcome Message >>>
@@ -54,20 +74,23 @@ async def upload_and_refresh_data(file: UploadFile = File(...)):
     Accepts an Excel file upload, reads its content in memory, and refreshes the database.
     This is the most reliable way to update data as it bypasses all file system caching.
     """
-    logging.info(f"API: Received file '{file.filename}' for data refresh.")
+    logging.info("API: Received file '%s' for data refresh.", file.filename)
 
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload an Excel file.")
 
+    # Imported here so pandas/numpy/openpyxl are only loaded by workers that handle an upload.
+    from app.excel_loader import load_all_from_excel
+
     try:
         async with AsyncSessionLocal() as db:
             await load_all_from_excel(file.file, db)
         
-        logging.info(f"Successfully processed and loaded data from '{file.filename}'.")
+        logging.info("Successfully processed and loaded data from '%s'.", file.filename)
         return {"message": f"Data from '{file.filename}' has been successfully uploaded and the database has been refreshed."}
     
     except Exception as e:
-        logging.error(f"An error occurred during file processing and database refresh: {e}", exc_info=True)
+        logging.error("An error occurred during file processing and database refresh: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"An internal error occurred: {e}")
 
 
@@ -77,7 +100,22 @@ async def on_startup():
     """
     This function runs when the FastAPI application starts.
     """
-    logging.info("STARTUP: Initializing database...")
-    await create_db_and_tables()
-    logging.info("STARTUP: Database initialization complete.")
+    # Schema changes are applied by `python -m app.migrations`, not on every boot.
+    logging.info("STARTUP: Checking database schema version...")
+    await check_schema_version(async_engine)
+    logging.info("STARTUP: Database schema is up to date.")
+    # Cross-worker fan-out for /events/stream and cache invalidation; started
+    # before anything is cached, and its first connect flushes the caches
+    # anyway in case it isn't up yet
+    bridge.start(async_engine)
+    # Warm the org directory so the first logins and dashboards don't build it
+    async with AsyncSessionLocal() as db:
+        await org_directory.get(db)
+    monitor.start()
     logging.info("STARTUP: Server is ready. Please go to /docs for the API documentation and to upload data.")
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await monitor.stop()
+    await bridge.stop()
@@ -0,0 +1,428 @@
+# app/migrations.py
+"""
+Explicit schema migrations. Workers never create or alter tables on boot;
+they only compare the recorded schema version with SCHEMA_VERSION.
+
+    cd backend
+    python -m app.migrations            # apply pending migrations
+    python -m app.migrations --status   # show recorded and expected versions
+
+Each migration runs in its own transaction and must be idempotent, because a
+database created by step 1 (create_all from the current models) already has
+most of what later steps add.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, text, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from app.models import (
+    AdditionalSkill, Base, DataVersion, EmployeeCompetency, ManagerEmployee, Skill, SkillAlias, SkillLevelHistory,
+    SkillTrendRollup, Trainer, TrainingDetail,
+)
+
+logger = logging.getLogger(__name__)
+
+Migration = Tuple[int, str, Callable[[AsyncConnection], Awaitable[None]]]
+
+
+async def _initial_schema(conn: AsyncConnection) -> None:
+    await conn.run_sync(Base.metadata.create_all)
+
+
+async def _catalog_indexes(conn: AsyncConnection) -> None:
+    def create(sync_conn):
+        for index in TrainingDetail.__table__.indexes:
+            index.create(sync_conn, checkfirst=True)
+    await conn.run_sync(create)
+
+
+# Weighted document for catalog search; a stored generated column, so Postgres
+# keeps it current on every insert/update, including the Excel bulk load.
+TRAINING_SEARCH_DOCUMENT = """
+    setweight(to_tsvector('english', coalesce(training_name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(skill, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(competency, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(training_topics, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(prerequisites, '')), 'D')
+"""
+
+
+async def _catalog_search(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    await conn.execute(text(
+        "ALTER TABLE training_details ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({TRAINING_SEARCH_DOCUMENT}) STORED"
+    ))
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_training_details_search_vector "
+        "ON training_details USING GIN (search_vector)"
+    ))
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_training_details_name_trgm "
+        "ON training_details USING GIN (training_name gin_trgm_ops)"
+    ))
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_training_details_skill_trgm "
+        "ON training_details USING GIN (skill gin_trgm_ops)"
+    ))
+
+
+async def _assignment_seats(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    await conn.execute(text("ALTER TABLE training_details ADD COLUMN IF NOT EXISTS seat_capacity INTEGER"))
+    await conn.execute(text(
+        "UPDATE training_details SET seat_capacity = substring(seats from '[0-9]+')::integer "
+        "WHERE seat_capacity IS NULL AND seats ~ '[0-9]'"
+    ))
+    await conn.execute(text(
+        "ALTER TABLE training_assignments ADD COLUMN IF NOT EXISTS status VARCHAR NOT NULL DEFAULT 'assigned'"
+    ))
+    # Keep the oldest row of any duplicate pair before enforcing uniqueness.
+    await conn.execute(text(
+        "DELETE FROM training_assignments a USING training_assignments b "
+        "WHERE a.training_id = b.training_id AND a.employee_empid = b.employee_empid AND a.id > b.id"
+    ))
+    await conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_training_assignments_training_employee "
+        "ON training_assignments (training_id, employee_empid)"
+    ))
+
+
+async def _unique_additional_skills(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    # Keep the most recently updated row of any duplicate pair.
+    await conn.execute(text(
+        "DELETE FROM additional_skills a USING additional_skills b "
+        "WHERE a.employee_empid = b.employee_empid AND a.skill_name = b.skill_name "
+        "AND (a.updated_at, a.id) < (b.updated_at, b.id)"
+    ))
+    await conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_additional_skills_employee_skill "
+        "ON additional_skills (employee_empid, skill_name)"
+    ))
+
+
+async def _skill_taxonomy(conn: AsyncConnection) -> None:
+    def create(sync_conn):
+        Skill.__table__.create(sync_conn, checkfirst=True)
+        SkillAlias.__table__.create(sync_conn, checkfirst=True)
+    await conn.run_sync(create)
+    if conn.dialect.name != "postgresql":
+        return
+    for table in ("employee_competency", "additional_skills"):
+        await conn.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS skill_id INTEGER REFERENCES skills (id)"
+        ))
+        await conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_skill_id ON {table} (skill_id)"))
+
+    # Build the dictionary from the data already in the database.
+    from app import taxonomy
+    session = AsyncSession(bind=conn)
+    linked = await taxonomy.populate(session)
+    logger.info("Linked %s distinct skill names to the skill dictionary", linked)
+
+
+async def _data_versions(conn: AsyncConnection) -> None:
+    await conn.run_sync(lambda sync_conn: DataVersion.__table__.create(sync_conn, checkfirst=True))
+
+
+async def _skill_history(conn: AsyncConnection) -> None:
+    def create(sync_conn):
+        SkillLevelHistory.__table__.create(sync_conn, checkfirst=True)
+        SkillTrendRollup.__table__.create(sync_conn, checkfirst=True)
+    await conn.run_sync(create)
+    if conn.dialect.name != "postgresql":
+        return
+
+    from app import skill_history
+
+    # A year of monthly partitions either side of today; later months are
+    # created on first write. The default partition catches anything else.
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS skill_level_history_default PARTITION OF skill_level_history DEFAULT"
+    ))
+    month = date.today().replace(day=1)
+    for _ in range(12):
+        month = (month - timedelta(days=1)).replace(day=1)
+    session = AsyncSession(bind=conn)
+    for _ in range(25):
+        await skill_history.ensure_partition(session, month)
+        month = skill_history.next_month(month)
+
+    # Baseline: today's levels as one change from "unrated", so trends start
+    # from the current state instead of zero.
+    if (await conn.execute(select(SkillLevelHistory.id).limit(1))).first():
+        return
+    now = datetime.utcnow()
+    last_id = 0
+    while True:
+        result = await conn.execute(
+            select(
+                EmployeeCompetency.id, EmployeeCompetency.employee_empid, EmployeeCompetency.skill,
+                EmployeeCompetency.skill_id, EmployeeCompetency.department,
+                EmployeeCompetency.current_expertise, EmployeeCompetency.target_expertise,
+            )
+            .where(EmployeeCompetency.id > last_id, EmployeeCompetency.employee_empid.isnot(None))
+            .order_by(EmployeeCompetency.id)
+            .limit(1000)
+        )
+        rows = result.all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        await skill_history.record_changes(
+            session,
+            [
+                skill_history.LevelChange(
+                    row.employee_empid, row.skill, row.skill_id, row.department,
+                    None, None, row.current_expertise, row.target_expertise,
+                )
+                for row in rows
+            ],
+            changed_by=None,
+            source="baseline",
+            recorded_at=now,
+        )
+
+
+async def _training_schedule(conn: AsyncConnection) -> None:
+    from app.parsing import training_window
+
+    if conn.dialect.name == "postgresql":
+        await conn.execute(text("ALTER TABLE training_details ADD COLUMN IF NOT EXISTS starts_at TIMESTAMP"))
+        await conn.execute(text("ALTER TABLE training_details ADD COLUMN IF NOT EXISTS ends_at TIMESTAMP"))
+        # Overlap lookups for schedule conflicts (app/schedule.py)
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_training_details_schedule ON training_details "
+            "USING GIST (tsrange(starts_at, ends_at)) WHERE starts_at IS NOT NULL"
+        ))
+
+    # Backfill from the free-text columns, with the same parser as ingest.
+    last_id = 0
+    while True:
+        result = await conn.execute(
+            select(TrainingDetail.id, TrainingDetail.training_date, TrainingDetail.time, TrainingDetail.duration)
+            .where(TrainingDetail.id > last_id, TrainingDetail.training_date.isnot(None))
+            .order_by(TrainingDetail.id)
+            .limit(1000)
+        )
+        rows = result.all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        windows = []
+        for row in rows:
+            starts_at, ends_at = training_window(row.training_date, row.time, row.duration)
+            windows.append({"training_id": row.id, "starts_at": starts_at, "ends_at": ends_at})
+        await conn.execute(
+            text("UPDATE training_details SET starts_at = :starts_at, ends_at = :ends_at WHERE id = :training_id"),
+            windows,
+        )
+
+
+async def _split_version_merged_skills(conn: AsyncConnection) -> None:
+    """
+    The first skill_key stripped any trailing number, so "ISO 26262" and
+    "ISO 9001" shared the skill "iso". Re-keys every skill and alias with the
+    current rule and moves spellings (and the rows using them) to their own skill.
+    """
+    from app.taxonomy import skill_key, spelling_key
+
+    # Display names for skills created here, as first written in the data
+    display_names = {}
+    for name_column in (EmployeeCompetency.skill, AdditionalSkill.skill_name, TrainingDetail.skill, Trainer.skill):
+        for (name,) in await conn.execute(select(name_column).distinct().where(name_column.isnot(None))):
+            display_names.setdefault(spelling_key(name), " ".join(name.split()))
+
+    # Step 1: each skill takes its own name's key; the old key stays an alias
+    skills = {row.id: row for row in await conn.execute(select(Skill.id, Skill.key, Skill.name, Skill.category))}
+    key_of = {skill_id: row.key for skill_id, row in skills.items()}
+    id_of_key = {row.key: skill_id for skill_id, row in skills.items()}
+    aliases = dict((await conn.execute(select(SkillAlias.alias_key, SkillAlias.skill_id))).all())
+    for skill_id, row in skills.items():
+        new_key = skill_key(row.name)
+        if not new_key or new_key == row.key or new_key in id_of_key:
+            continue
+        await conn.execute(update(Skill).where(Skill.id == skill_id).values(key=new_key))
+        if row.key not in aliases:
+            await conn.execute(insert(SkillAlias).values(alias_key=row.key, skill_id=skill_id))
+        del id_of_key[row.key]
+        id_of_key[new_key] = skill_id
+        key_of[skill_id] = new_key
+
+    # Step 2: aliases whose key changed move to that key's skill, created if needed
+    moves = {}  # spelling -> (old skill id, new skill id)
+    for spelling, skill_id in aliases.items():
+        new_key = skill_key(spelling)
+        if new_key == key_of[skill_id]:
+            # The skill's own key now; the alias is redundant
+            if spelling == new_key:
+                await conn.execute(delete(SkillAlias).where(SkillAlias.alias_key == spelling))
+            continue
+        if not new_key:
+            continue
+        target = id_of_key.get(new_key)
+        if target is None:
+            result = await conn.execute(
+                insert(Skill)
+                .values(key=new_key, name=display_names.get(spelling, spelling), category=skills[skill_id].category)
+                .returning(Skill.id)
+            )
+            target = id_of_key[new_key] = result.scalar_one()
+            key_of[target] = new_key
+        if spelling == new_key:
+            await conn.execute(delete(SkillAlias).where(SkillAlias.alias_key == spelling))
+        else:
+            await conn.execute(update(SkillAlias).where(SkillAlias.alias_key == spelling).values(skill_id=target))
+        moves[spelling] = (skill_id, target)
+    if not moves:
+        return
+
+    # Step 3: rows written with a moved spelling follow it
+    moved_from = {old for old, _ in moves.values()}
+    for model, name_column in ((EmployeeCompetency, EmployeeCompetency.skill), (AdditionalSkill, AdditionalSkill.skill_name)):
+        result = await conn.execute(
+            select(model.id, model.skill_id, name_column.label("name")).where(model.skill_id.in_(moved_from))
+        )
+        relinks = []
+        for row in result:
+            move = moves.get(spelling_key(row.name))
+            if move and move[0] == row.skill_id:
+                relinks.append({"row_id": row.id, "new_skill_id": move[1]})
+        if relinks:
+            await conn.execute(
+                update(model.__table__)
+                .where(model.__table__.c.id == bindparam("row_id"))
+                .values(skill_id=bindparam("new_skill_id")),
+                relinks,
+            )
+    logger.info("Moved %s skill spellings to their own skills", len(moves))
+
+
+async def _trainer_empids(conn: AsyncConnection) -> None:
+    """Schedule conflicts match trainers by employee id, not by the display name in trainer_name."""
+    from app.org_directory import OrgSnapshot
+
+    if conn.dialect.name == "postgresql":
+        await conn.execute(text("ALTER TABLE training_details ADD COLUMN IF NOT EXISTS trainer_empid VARCHAR"))
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_training_details_trainer_empid ON training_details (trainer_empid)"
+        ))
+
+    # Backfill with the same resolution as ingest.
+    org = OrgSnapshot((await conn.execute(select(
+        ManagerEmployee.manager_empid, ManagerEmployee.manager_name, ManagerEmployee.manager_is_trainer,
+        ManagerEmployee.employee_empid, ManagerEmployee.employee_name, ManagerEmployee.employee_is_trainer,
+    ))).all())
+    result = await conn.execute(
+        select(TrainingDetail.id, TrainingDetail.trainer_name, TrainingDetail.email)
+        .where(TrainingDetail.trainer_empid.is_(None))
+    )
+    resolved = []
+    for row in result:
+        empid = org.trainer_empid(row.email, row.trainer_name)
+        if empid is not None:
+            resolved.append({"training_id": row.id, "trainer_empid": empid})
+    if resolved:
+        await conn.execute(
+            text("UPDATE training_details SET trainer_empid = :trainer_empid WHERE id = :training_id"),
+            resolved,
+        )
+    logger.info("Resolved the trainer of %s trainings", len(resolved))
+
+MIGRATIONS: List[Migration] = [
+    (1, "initial schema", _initial_schema),
+    (2, "training catalog keyset/filter indexes", _catalog_indexes),
+    (3, "training catalog full-text and trigram search", _catalog_search),
+    (4, "numeric seat capacity, assignment status and unique assignments", _assignment_seats),
+    (5, "unique additional skill names per employee", _unique_additional_skills),
+    (6, "skill dictionary, aliases and skill_id links", _skill_taxonomy),
+    (7, "data versions for HTTP caching", _data_versions),
+    (8, "partitioned skill-level history and trend rollups", _skill_history),
+    (9, "parsed training start/end times and schedule overlap index", _training_schedule),
+    (10, "split skills merged by the old version-suffix rule", _split_version_merged_skills),
+    (11, "trainer employee ids on trainings", _trainer_empids),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+async def get_recorded_version(conn: AsyncConnection) -> Optional[int]:
+    try:
+        result = await conn.execute(text("SELECT version FROM schema_version"))
+    except DBAPIError:
+        return None
+    return result.scalar_one_or_none()
+
+
+async def migrate(engine: AsyncEngine) -> int:
+    """Applies all pending migrations and returns the resulting version."""
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+        current = await get_recorded_version(conn)
+        if current is None:
+            await conn.execute(text("INSERT INTO schema_version (version) VALUES (0)"))
+            current = 0
+
+    for version, description, apply in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info("Applying migration %s: %s", version, description)
+        async with engine.begin() as conn:
+            await apply(conn)
+            await conn.execute(text("UPDATE schema_version SET version = :v"), {"v": version})
+        current = version
+    return current
+
+
+async def check_schema_version(engine: AsyncEngine) -> None:
+    """
+    Cheap boot-time check: one single-row SELECT. Refuses to start on a
+    database that is behind this code.
+    """
+    async with engine.connect() as conn:
+        recorded = await get_recorded_version(conn)
+
+    if recorded is None or recorded < SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {recorded}, this code needs {SCHEMA_VERSION}. "
+            "Run `python -m app.migrations` before starting the API."
+        )
+    if recorded > SCHEMA_VERSION:
+        logger.warning("Database schema version %s is newer than this code (%s).", recorded, SCHEMA_VERSION)
+
+
+async def _main(status_only: bool) -> None:
+    from app.database import async_engine
+
+    try:
+        if status_only:
+            async with async_engine.connect() as conn:
+                recorded = await get_recorded_version(conn)
+            print(f"recorded schema version: {recorded}, code expects: {SCHEMA_VERSION}")
+        else:
+            version = await migrate(async_engine)
+            print(f"Database schema is at version {version}.")
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply SkillOrbit database migrations.")
+    parser.add_argument("--status", action="store_true", help="only report the recorded schema version")
+    args = parser.parse_args()
+    from app.logging_config import setup_logging
+    setup_logging()
+    asyncio.run(_main(args.status))
@@ -1,7 +1,7 @@
 # app/models.py
 
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Date, Boolean, Identity, Index
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -22,6 +22,21 @@ class ManagerEmployee(Base):
     manager_is_trainer = Column(Boolean, default=False, nullable=False)
     employee_is_trainer = Column(Boolean, default=False, nullable=False)
 
+# Canonical skill dictionary; `key` is taxonomy.skill_key() of the name
+class Skill(Base):
+    __tablename__ = 'skills'
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False)
+    category = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# Alternative spellings (and manual synonyms) that resolve to a skill
+class SkillAlias(Base):
+    __tablename__ = 'skill_aliases'
+    alias_key = Column(String, primary_key=True)
+    skill_id = Column(Integer, ForeignKey('skills.id', ondelete="CASCADE"), nullable=False, index=True)
+
 class EmployeeCompetency(Base):
     __tablename__ = 'employee_competency'
     id = Column(Integer, primary_key=True, index=True)
@@ -34,6 +49,7 @@ class EmployeeCompetency(Base):
     destination = Column(String)
     competency = Column(String)
     skill = Column(String)
+    skill_id = Column(Integer, ForeignKey('skills.id'), nullable=True, index=True)
     current_expertise = Column(String)
     target_expertise = Column(String)
     comments = Column(String)
@@ -42,9 +58,13 @@ class EmployeeCompetency(Base):
 
 class AdditionalSkill(Base):
     __tablename__ = 'additional_skills'
+    __table_args__ = (
+        Index("uq_additional_skills_employee_skill", "employee_empid", "skill_name", unique=True),
+    )
     id = Column(Integer, primary_key=True, index=True)
     employee_empid = Column(String, ForeignKey('users.username'), nullable=False)
     skill_name = Column(String, nullable=False)
+    skill_id = Column(Integer, ForeignKey('skills.id'), nullable=True, index=True)
     skill_level = Column(String, nullable=False)
     skill_category = Column(String, nullable=False)
     description = Column(String, nullable=True)
@@ -72,19 +92,95 @@ class TrainingDetail(Base):
     prerequisites = Column(String, nullable=True)
     skill_category = Column(String, nullable=True)
     trainer_name = Column(String, nullable=False)
+    # Employee id of the trainer, resolved from trainer_name/email at ingest
+    # (OrgSnapshot.trainer_empid); NULL when nobody in the org matches
+    trainer_empid = Column(String, nullable=True, index=True)
     email = Column(String, nullable=True)
     training_date = Column(Date, nullable=True) # CHANGED: From String to Date for proper sorting/filtering
     duration = Column(String, nullable=True)
     time = Column(String, nullable=True)
     training_type = Column(String, nullable=True)
     seats = Column(String, nullable=True)
+    # Numeric form of `seats`, parsed at ingest; NULL means unlimited
+    seat_capacity = Column(Integer, nullable=True)
     assessment_details = Column(String, nullable=True)
+    # [starts_at, ends_at) parsed from training_date/time/duration at ingest
+    # (parsing.training_window); NULL when the training has no date
+    starts_at = Column(DateTime, nullable=True)
+    ends_at = Column(DateTime, nullable=True)
+
+# Catalog keyset pagination walks (training_date DESC, id DESC); each
+# server-side filter gets its own composite index with the same ordering tail.
+CATALOG_FILTER_COLUMNS = ("division", "department", "competency", "skill", "skill_category", "training_type", "trainer_name")
+
+Index(
+    "ix_training_details_date_id",
+    TrainingDetail.training_date.desc(),
+    TrainingDetail.id.desc(),
+)
+for _column in CATALOG_FILTER_COLUMNS:
+    Index(
+        f"ix_training_details_{_column}_date_id",
+        getattr(TrainingDetail, _column),
+        TrainingDetail.training_date.desc(),
+        TrainingDetail.id.desc(),
+    )
 
 class TrainingAssignment(Base):
     __tablename__ = 'training_assignments'
+    __table_args__ = (
+        Index("uq_training_assignments_training_employee", "training_id", "employee_empid", unique=True),
+    )
     id = Column(Integer, primary_key=True, index=True)
     training_id = Column(Integer, ForeignKey('training_details.id'), nullable=False)
     employee_empid = Column(String, ForeignKey('users.username'), nullable=False)
     manager_empid = Column(String, ForeignKey('users.username'), nullable=False)
     # Match existing DB column name 'assignment_date' (timestamp)
-    assignment_date = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    assignment_date = Column(DateTime, default=datetime.utcnow)
+    # 'assigned' holds a seat; 'waitlisted' was requested after the training filled up
+    status = Column(String, nullable=False, default="assigned", server_default="assigned")
+
+# Monotonic version per cached resource ("catalog", "assignments:<empid>"),
+# bumped in the same transaction as the change; used for HTTP ETags
+class DataVersion(Base):
+    __tablename__ = 'data_versions'
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+# Append-only log of competency level changes. On Postgres the table is
+# range-partitioned by month on recorded_at (partitions are created by
+# skill_history.ensure_partition), which is why recorded_at is in the key.
+class SkillLevelHistory(Base):
+    __tablename__ = 'skill_level_history'
+    __table_args__ = (
+        Index("ix_skill_level_history_employee_recorded", "employee_empid", "recorded_at"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+    id = Column(BigInteger, Identity(), primary_key=True)
+    recorded_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    employee_empid = Column(String, nullable=False)
+    skill = Column(String, nullable=True)
+    skill_id = Column(Integer, nullable=True)
+    department = Column(String, nullable=True)
+    previous_current_expertise = Column(String, nullable=True)
+    previous_target_expertise = Column(String, nullable=True)
+    current_expertise = Column(String, nullable=True)
+    target_expertise = Column(String, nullable=True)
+    changed_by = Column(String, nullable=True)
+    # manager_update, baseline, ...
+    source = Column(String, nullable=False)
+
+# Trend rollups: per scope and time bucket, the change in the summed level,
+# summed gap and number of rated skills. A bucket's state is the running sum
+# of deltas up to it, so trends never read the raw history.
+class SkillTrendRollup(Base):
+    __tablename__ = 'skill_trend_rollup'
+    scope_kind = Column(String, primary_key=True)   # employee, team, department
+    scope_id = Column(String, primary_key=True)
+    granularity = Column(String, primary_key=True)  # week, month
+    bucket_start = Column(Date, primary_key=True)
+    level_sum_delta = Column(BigInteger, nullable=False, default=0)
+    gap_sum_delta = Column(BigInteger, nullable=False, default=0)
+    skill_count_delta = Column(BigInteger, nullable=False, default=0)
+    changes = Column(BigInteger, nullable=False, default=0)
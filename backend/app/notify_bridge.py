@@ -0,0 +1,96 @@
+# app/notify_bridge.py
+"""
+One dedicated asyncpg connection per worker that LISTENs on Postgres
+channels and hands each NOTIFY payload to an in-process callback. Lets a
+change committed by one worker reach the other workers.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Optional
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = (1, 2, 5, 10, 30)
+
+
+class NotifyBridge:
+    def __init__(self):
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._dsn: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncpg.Connection] = None
+        self._on_reconnect: list = []
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def listen(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Registers a handler for a channel; call before start()."""
+        self._handlers[channel] = handler
+
+    def on_reconnect(self, callback: Callable[[], None]) -> None:
+        """
+        Called after every successful connect, including the first: whatever
+        was notified before the listener was up (even at boot, while caches
+        were being filled) never arrived.
+        """
+        self._on_reconnect.append(callback)
+
+    def start(self, engine: AsyncEngine) -> None:
+        if engine.dialect.name != "postgresql" or self._task is not None:
+            return
+        self._dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.connected:
+            await self._connection.close()
+        self._connection = None
+
+    def _dispatch(self, connection, pid, channel, payload) -> None:
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        try:
+            handler(payload)
+        except Exception:
+            logger.exception("Notify handler for %s failed", channel)
+
+    async def _run(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                self._connection = await asyncpg.connect(self._dsn)
+                for channel in self._handlers:
+                    await self._connection.add_listener(channel, self._dispatch)
+                logger.info("Listening for notifications on %s", ", ".join(self._handlers))
+                for callback in self._on_reconnect:
+                    callback()
+                attempt = 0
+                # Wait until the connection drops; asyncpg reports it via the termination listener.
+                closed = asyncio.get_running_loop().create_future()
+                self._connection.add_termination_listener(lambda _conn: closed.done() or closed.set_result(None))
+                await closed
+                logger.warning("Notification connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Notification listener unavailable: %s", e)
+            self._connection = None
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS[min(attempt, len(RECONNECT_DELAY_SECONDS) - 1)])
+            attempt += 1
+
+
+bridge = NotifyBridge()
@@ -0,0 +1,247 @@
+# app/org_directory.py
+"""
+In-memory org directory built from `manager_employee`: names, trainer flags,
+managers and direct reports of every employee.
+
+Each employee is a position in a sorted id list; flags live in a bytearray
+and both directions of the reporting graph are CSR arrays (offsets + ids),
+so a 50k-person org is a few flat arrays rather than thousands of dicts.
+The snapshot is loaded at startup and rebuilt as a whole when the "org"
+topic is invalidated or it is older than ORG_DIRECTORY_TTL_SECONDS, since
+the table is changed outside the API. An id the snapshot doesn't know is
+looked up in the database. Permission checks (`manages`) always read the
+table.
+
+Trainings name their trainer the way the Excel sheet does, by display name;
+`trainer_empid` resolves that to an employee id at ingest.
+"""
+
+import time
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import cache, config
+from app.models import ManagerEmployee
+from app.taxonomy import spelling_key
+
+IS_MANAGER = 1
+IS_EMPLOYEE = 2
+MANAGER_IS_TRAINER = 4
+EMPLOYEE_IS_TRAINER = 8
+
+_COLUMNS = (
+    ManagerEmployee.manager_empid, ManagerEmployee.manager_name, ManagerEmployee.manager_is_trainer,
+    ManagerEmployee.employee_empid, ManagerEmployee.employee_name, ManagerEmployee.employee_is_trainer,
+)
+
+
+class Report(NamedTuple):
+    employee_empid: str
+    employee_name: Optional[str]
+
+
+class OrgEntry(NamedTuple):
+    empid: str
+    employee_name: Optional[str]
+    manager_name: Optional[str]
+    is_manager: bool
+    manager_is_trainer: bool
+    employee_is_trainer: bool
+    reports: Tuple[Report, ...]
+    managers: Tuple[str, ...]
+
+    @property
+    def is_trainer(self) -> bool:
+        return self.manager_is_trainer or self.employee_is_trainer
+
+
+def _csr(size: int, edges: List[Tuple[int, int]]) -> Tuple[array, array]:
+    """Adjacency lists as offsets/ids arrays: the targets of i are ids[offsets[i]:offsets[i + 1]]."""
+    edges.sort()
+    offsets = array("i", [0] * (size + 1))
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+    return offsets, array("i", (target for _, target in edges))
+
+
+class OrgSnapshot:
+    __slots__ = (
+        "empids", "position", "flags", "employee_names", "manager_names",
+        "report_offsets", "report_ids", "manager_offsets", "manager_ids", "_empid_by_name",
+    )
+
+    def __init__(self, rows: Sequence):
+        self.empids: List[str] = sorted({row.manager_empid for row in rows} | {row.employee_empid for row in rows})
+        self.position = {empid: i for i, empid in enumerate(self.empids)}
+        size = len(self.empids)
+        self.flags = bytearray(size)
+        self.employee_names: List[Optional[str]] = [None] * size
+        self.manager_names: List[Optional[str]] = [None] * size
+
+        edges: List[Tuple[int, int]] = []
+        for row in rows:
+            manager, employee = self.position[row.manager_empid], self.position[row.employee_empid]
+            self.flags[manager] |= IS_MANAGER | (MANAGER_IS_TRAINER if row.manager_is_trainer else 0)
+            self.flags[employee] |= IS_EMPLOYEE | (EMPLOYEE_IS_TRAINER if row.employee_is_trainer else 0)
+            if row.manager_name and self.manager_names[manager] is None:
+                self.manager_names[manager] = row.manager_name
+            if row.employee_name and self.employee_names[employee] is None:
+                self.employee_names[employee] = row.employee_name
+            edges.append((manager, employee))
+        self.report_offsets, self.report_ids = _csr(size, list(edges))
+        self.manager_offsets, self.manager_ids = _csr(size, [(employee, manager) for manager, employee in edges])
+        self._empid_by_name: Optional[Dict[str, str]] = None
+
+    def entry(self, empid: str) -> Optional[OrgEntry]:
+        i = self.position.get(empid)
+        if i is None:
+            return None
+        flags = self.flags[i]
+        reports = self.report_ids[self.report_offsets[i]:self.report_offsets[i + 1]]
+        managers = self.manager_ids[self.manager_offsets[i]:self.manager_offsets[i + 1]]
+        return OrgEntry(
+            empid,
+            self.employee_names[i],
+            self.manager_names[i],
+            bool(flags & IS_MANAGER),
+            bool(flags & MANAGER_IS_TRAINER),
+            bool(flags & EMPLOYEE_IS_TRAINER),
+            tuple(Report(self.empids[r], self.employee_names[r]) for r in reports),
+            tuple(self.empids[m] for m in managers),
+        )
+
+    def subtree(self, empid: str) -> List[str]:
+        """Everyone below `empid` at any depth, breadth first."""
+        start = self.position.get(empid)
+        if start is None:
+            return []
+        seen = {start}
+        order: List[int] = []
+        frontier = [start]
+        while frontier:
+            following = []
+            for i in frontier:
+                for r in self.report_ids[self.report_offsets[i]:self.report_offsets[i + 1]]:
+                    if r not in seen:
+                        seen.add(r)
+                        order.append(r)
+                        following.append(r)
+            frontier = following
+        return [self.empids[i] for i in order]
+
+    def trainer_empid(self, *names: Optional[str]) -> Optional[str]:
+        """
+        The employee id behind the first of `names` (an id or a display name)
+        that someone in the org answers to. Where two people share a name, a
+        trainer wins.
+        """
+        if self._empid_by_name is None:
+            by_name: Dict[str, str] = {}
+            # Trainers go last so they overwrite namesakes
+            order = sorted(range(len(self.empids)), key=lambda i: bool(self.flags[i] & (MANAGER_IS_TRAINER | EMPLOYEE_IS_TRAINER)))
+            for i in order:
+                for name in (self.employee_names[i], self.manager_names[i]):
+                    if name:
+                        by_name[spelling_key(name)] = self.empids[i]
+            self._empid_by_name = by_name
+        for name in names:
+            if not name:
+                continue
+            if name in self.position:
+                return name
+            empid = self._empid_by_name.get(spelling_key(name))
+            if empid is not None:
+                return empid
+        return None
+
+
+class OrgDirectory(cache.RebuildableIndex):
+    def __init__(self):
+        super().__init__()
+        # Ids found in neither the snapshot nor the table (users outside the org)
+        self._absent = cache.TTLCache(ttl_seconds=60, max_entries=10000)
+        self._built_at = 0.0
+
+    async def build(self, db: AsyncSession) -> OrgSnapshot:
+        self._built_at = time.monotonic()
+        self._absent.clear()
+        result = await db.execute(select(*_COLUMNS))
+        return OrgSnapshot(result.all())
+
+    def clear(self) -> None:
+        super().clear()
+        self._absent.clear()
+
+    async def get(self, db: AsyncSession) -> OrgSnapshot:
+        if self._snapshot is not None and time.monotonic() - self._built_at >= config.ORG_DIRECTORY_TTL_SECONDS:
+            self.clear()
+        return await super().get(db)
+
+    async def lookup(self, db: AsyncSession, empid: str) -> Optional[OrgEntry]:
+        snapshot = await self.get(db)
+        entry = snapshot.entry(empid)
+        if entry is not None or empid is None or self._absent.get(empid):
+            return entry
+        # Miss: the table may have changed without an invalidation. Answer
+        # from the database and rebuild the snapshot on the next lookup.
+        result = await db.execute(
+            select(*_COLUMNS).where(or_(ManagerEmployee.manager_empid == empid, ManagerEmployee.employee_empid == empid))
+        )
+        rows = result.all()
+        if not rows:
+            self._absent.set(empid, True)
+            return None
+        self.clear()
+        return OrgSnapshot(rows).entry(empid)
+
+    async def reports(self, db: AsyncSession, manager_empid: str) -> Tuple[Report, ...]:
+        entry = await self.lookup(db, manager_empid)
+        return entry.reports if entry else ()
+
+    async def team(self, db: AsyncSession, manager_empid: str, subtree: bool = False) -> List[Report]:
+        """Direct reports, or everyone below the manager with subtree=True."""
+        if not subtree:
+            return list(await self.reports(db, manager_empid))
+        snapshot = await self.get(db)
+        return [Report(empid, snapshot.employee_names[snapshot.position[empid]]) for empid in snapshot.subtree(manager_empid)]
+
+    async def manages(self, db: AsyncSession, manager_empid: str, employee_empid: str) -> bool:
+        """
+        Whether the employee reports to the manager, read from the table (one
+        primary-key lookup): an authorization check can't wait for the
+        snapshot to notice that an employee moved.
+        """
+        result = await db.execute(
+            select(ManagerEmployee.employee_empid)
+            .where(ManagerEmployee.manager_empid == manager_empid, ManagerEmployee.employee_empid == employee_empid)
+        )
+        return result.first() is not None
+
+    async def managed_among(self, db: AsyncSession, manager_empid: str, empids: Iterable[str]) -> set:
+        """The subset of `empids` reporting to the manager, read from the table like `manages`."""
+        empids = list(empids)
+        if not empids:
+            return set()
+        result = await db.execute(
+            select(ManagerEmployee.employee_empid)
+            .where(ManagerEmployee.manager_empid == manager_empid, ManagerEmployee.employee_empid.in_(empids))
+        )
+        return set(result.scalars())
+
+    async def managers_of(self, db: AsyncSession, empids: Iterable[str]) -> dict:
+        snapshot = await self.get(db)
+        managers = {}
+        for empid in empids:
+            entry = snapshot.entry(empid) or await self.lookup(db, empid)
+            if entry is not None and entry.managers:
+                managers[empid] = entry.managers
+        return managers
+
+
+org_directory = cache.register("org", OrgDirectory())
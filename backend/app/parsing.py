@@ -0,0 +1,111 @@
+# app/parsing.py
+"""
+Parsers for the loosely formatted training fields that arrive as strings from
+Excel and the Angular form.
+"""
+
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional, Tuple
+
+# "1,000" is one number; "20,30" is 20 followed by 30
+_FIRST_NUMBER = re.compile(r"\d{1,3}(?:,\d{3})+(?!\d)|\d+")
+
+
+def parse_seats(value: Any) -> Optional[int]:
+    """'20', '20.0', 20.0, '20 seats' or '1,000' -> the count; None when no number is present."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value == value else None  # NaN check
+    match = _FIRST_NUMBER.search(str(value))
+    return int(match.group().replace(",", "")) if match else None
+
+
+# "10:30", "10.30", "10:30 am", "2 PM"; a bare "10" only as the start of a
+# range ("10 - 12pm"), so "Day 2" or "Batch 1" is not read as a time.
+_TIME = re.compile(r"(?<![\d.:])(\d{1,2})(?:[:.](\d{2}))?(?!\d)\s*([ap]\.?m\.?(?![a-z]))?", re.IGNORECASE)
+_RANGE_SEPARATOR = re.compile(r"\s*(?:-|–|to)\s*", re.IGNORECASE)
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(h(?:ou)?rs?|h|min(?:ute)?s?|m)?", re.IGNORECASE)
+
+# A dated training without a usable start time blocks the whole day; one
+# with a start time but no duration is assumed to take this long.
+DEFAULT_DURATION = timedelta(hours=1)
+
+
+def _time_from_match(match) -> Optional[time]:
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower().startswith("p") else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+def _is_qualified(match) -> bool:
+    """Has minutes or am/pm, so it reads as a time of day rather than a count."""
+    return bool(match.group(2) or match.group(3))
+
+
+def parse_time_range(value: Any) -> Tuple[Optional[time], Optional[time]]:
+    """
+    '10:00 AM', '14:30' or '10am - 12pm' -> (start, end); end only when a range
+    is given. A number with neither minutes nor am/pm is not a time.
+    """
+    if value is None:
+        return None, None
+    if isinstance(value, datetime):
+        return value.time(), None
+    if isinstance(value, time):
+        return value, None
+    text = str(value)
+    found = list(_TIME.finditer(text))
+    matches = [
+        match for i, match in enumerate(found)
+        if _is_qualified(match) or (
+            i + 1 < len(found) and _is_qualified(found[i + 1])
+            and _RANGE_SEPARATOR.fullmatch(text[match.end():found[i + 1].start()])
+        )
+    ]
+    if not matches:
+        return None, None
+    start = _time_from_match(matches[0])
+    end = _time_from_match(matches[1]) if len(matches) > 1 else None
+    # "10 - 12pm": the meridiem written once applies to both ends
+    if start and end and matches[1].group(3) and not matches[0].group(3) and start.hour + 12 <= end.hour:
+        start = time(start.hour + 12, start.minute)
+    return start, end
+
+
+def parse_duration(value: Any) -> Optional[timedelta]:
+    """'2', 2.5, '2 hrs', '90 min' -> timedelta; bare numbers are hours (the Excel column is in hours)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return timedelta(hours=value) if value == value and value > 0 else None
+    match = _DURATION.search(str(value))
+    if not match:
+        return None
+    amount = float(match.group(1))
+    if amount <= 0:
+        return None
+    unit = (match.group(2) or "h").lower()
+    return timedelta(minutes=amount) if unit.startswith("m") else timedelta(hours=amount)
+
+
+def training_window(training_date: Optional[date], time_value: Any, duration_value: Any) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """(starts_at, ends_at) of a training, or (None, None) when it has no date."""
+    if training_date is None:
+        return None, None
+    if isinstance(training_date, datetime):
+        training_date = training_date.date()
+    start_time, end_time = parse_time_range(time_value)
+    if start_time is None:
+        starts_at = datetime.combine(training_date, time.min)
+        return starts_at, starts_at + timedelta(days=1)
+    starts_at = datetime.combine(training_date, start_time)
+    if end_time is not None and end_time > start_time:
+        return starts_at, datetime.combine(training_date, end_time)
+    return starts_at, starts_at + (parse_duration(duration_value) or DEFAULT_DURATION)
@@ -0,0 +1,247 @@
+# app/people_index.py
+"""
+Inverted index for "who has skill X at level >= N" across the whole org.
+
+Postings map a skill key to one set of people per level (0-5), built from
+employee competencies (current expertise) and self-reported additional
+skills. Division/department/project values map to sets of people, and the
+manager tree is kept as child lists, so a search is a union of a few level
+sets intersected with the filter sets.
+
+Writes don't rebuild the index: routes mark the employees they changed with
+mark_dirty_on_commit() (on every worker, via the invalidation bus) and the
+next search reloads just those employees.
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import cache, invalidation
+from app.levels import parse_level
+from app.models import AdditionalSkill, EmployeeCompetency, ManagerEmployee, Skill, SkillAlias
+from app.taxonomy import skill_key, spelling_key
+
+MAX_LEVEL = 5
+
+SOURCE_COMPETENCY = "competency"
+SOURCE_ADDITIONAL = "additional_skill"
+
+
+class Holding(NamedTuple):
+    skill: str
+    level: int
+    expertise: str
+    source: str
+
+
+class Person:
+    __slots__ = ("empid", "name", "division", "department", "project", "skills")
+
+    def __init__(self, empid: str):
+        self.empid = empid
+        self.name: Optional[str] = None
+        self.division: Optional[str] = None
+        self.department: Optional[str] = None
+        self.project: Optional[str] = None
+        # skill key -> best holding
+        self.skills: Dict[str, Holding] = {}
+
+
+def _facet(value: Optional[str]) -> Optional[str]:
+    return spelling_key(value)
+
+
+class PeopleSnapshot:
+    def __init__(self, aliases: Dict[str, str], children: Dict[str, List[str]]):
+        # alias spelling -> canonical skill key
+        self.aliases = aliases
+        self.children = children
+        self.people: Dict[str, Person] = {}
+        # skill key -> level -> empids
+        self.postings: Dict[str, List[Set[str]]] = {}
+        self.facets: Dict[str, Dict[str, Set[str]]] = {
+            "division": defaultdict(set), "department": defaultdict(set), "project": defaultdict(set),
+        }
+        self._subtrees: Dict[str, Set[str]] = {}
+
+    def person(self, empid: str) -> Person:
+        person = self.people.get(empid)
+        if person is None:
+            person = self.people[empid] = Person(empid)
+        return person
+
+    def add_holding(self, person: Person, name: Optional[str], expertise: Optional[str], source: str) -> None:
+        key = skill_key(name)
+        level = parse_level(expertise) if expertise else None
+        if not key or level is None:
+            return
+        level = min(level, MAX_LEVEL)
+        current = person.skills.get(key)
+        # Keep the highest level; on a tie prefer the manager-assessed competency.
+        if current is not None and (current.level, current.source == SOURCE_COMPETENCY) >= (level, source == SOURCE_COMPETENCY):
+            return
+        if current is not None:
+            self.postings[key][current.level].discard(person.empid)
+        person.skills[key] = Holding(name.strip(), level, expertise, source)
+        self.postings.setdefault(key, [set() for _ in range(MAX_LEVEL + 1)])[level].add(person.empid)
+
+    def set_facets(self, person: Person, division: Optional[str], department: Optional[str], project: Optional[str]) -> None:
+        for facet, value in (("division", division), ("department", department), ("project", project)):
+            if value and getattr(person, facet) is None:
+                setattr(person, facet, value)
+                self.facets[facet][_facet(value)].add(person.empid)
+
+    def remove(self, empid: str) -> None:
+        person = self.people.get(empid)
+        if person is None:
+            return
+        for key, holding in person.skills.items():
+            self.postings[key][holding.level].discard(empid)
+        for facet in self.facets:
+            value = getattr(person, facet)
+            if value:
+                self.facets[facet][_facet(value)].discard(empid)
+        person.skills = {}
+        person.division = person.department = person.project = None
+
+    def resolve_skill(self, skill: str) -> Optional[str]:
+        return self.aliases.get(spelling_key(skill)) or skill_key(skill)
+
+    def subtree(self, manager_empid: str) -> Set[str]:
+        """Everyone below the manager, at any depth."""
+        members = self._subtrees.get(manager_empid)
+        if members is None:
+            members = set()
+            queue = deque([manager_empid])
+            while queue:
+                for child in self.children.get(queue.popleft(), ()):
+                    if child not in members:
+                        members.add(child)
+                        queue.append(child)
+            self._subtrees[manager_empid] = members
+        return members
+
+
+async def _load_people(db: AsyncSession, snapshot: PeopleSnapshot, empids: Optional[Iterable[str]] = None) -> None:
+    """Loads competencies and additional skills, for everyone or just `empids`."""
+    competency_query = select(
+        EmployeeCompetency.employee_empid, EmployeeCompetency.employee_name, EmployeeCompetency.division,
+        EmployeeCompetency.department, EmployeeCompetency.project, EmployeeCompetency.skill,
+        EmployeeCompetency.current_expertise,
+    )
+    additional_query = select(AdditionalSkill.employee_empid, AdditionalSkill.skill_name, AdditionalSkill.skill_level)
+    if empids is not None:
+        empids = list(empids)
+        competency_query = competency_query.where(EmployeeCompetency.employee_empid.in_(empids))
+        additional_query = additional_query.where(AdditionalSkill.employee_empid.in_(empids))
+
+    for row in await db.execute(competency_query):
+        if not row.employee_empid:
+            continue
+        person = snapshot.person(row.employee_empid)
+        person.name = person.name or row.employee_name
+        snapshot.set_facets(person, row.division, row.department, row.project)
+        snapshot.add_holding(person, row.skill, row.current_expertise, SOURCE_COMPETENCY)
+    for row in await db.execute(additional_query):
+        snapshot.add_holding(snapshot.person(row.employee_empid), row.skill_name, row.skill_level, SOURCE_ADDITIONAL)
+
+
+class PeopleIndex(cache.RebuildableIndex):
+    def __init__(self):
+        super().__init__()
+        self._dirty: Set[str] = set()
+
+    async def build(self, db: AsyncSession) -> PeopleSnapshot:
+        # The full load below sees every change committed so far; later
+        # commits mark their employees dirty again.
+        self._dirty.clear()
+        alias_result = await db.execute(
+            select(SkillAlias.alias_key, Skill.key).join(Skill, Skill.id == SkillAlias.skill_id)
+        )
+        org_result = await db.execute(
+            select(ManagerEmployee.manager_empid, ManagerEmployee.employee_empid, ManagerEmployee.employee_name)
+        )
+        children: Dict[str, List[str]] = defaultdict(list)
+        names: Dict[str, str] = {}
+        for manager_empid, employee_empid, employee_name in org_result:
+            children[manager_empid].append(employee_empid)
+            if employee_name:
+                names[employee_empid] = employee_name
+
+        snapshot = PeopleSnapshot(dict(alias_result.all()), dict(children))
+        await _load_people(db, snapshot)
+        for empid, name in names.items():
+            snapshot.person(empid).name = name
+        return snapshot
+
+    def clear(self) -> None:
+        super().clear()
+        self._dirty.clear()
+
+    async def mark_dirty_on_commit(self, db: AsyncSession, empids: Iterable[str]) -> None:
+        await invalidation.publish(db, people=empids)
+
+    def mark_dirty(self, empids: Iterable[str]) -> None:
+        self._dirty.update(empids)
+
+    async def get(self, db: AsyncSession) -> PeopleSnapshot:
+        snapshot = await super().get(db)
+        if self._dirty:
+            dirty, self._dirty = self._dirty, set()
+            fresh = PeopleSnapshot(snapshot.aliases, snapshot.children)
+            try:
+                await _load_people(db, fresh, dirty)
+            except BaseException:
+                # Retry these employees on the next search
+                self._dirty |= dirty
+                raise
+            # Swap the employees' entries in one synchronous step, so no
+            # concurrent search sees a half-updated employee.
+            for empid in dirty:
+                snapshot.remove(empid)
+                person = fresh.people.get(empid)
+                if person is None:
+                    continue
+                target = snapshot.person(empid)
+                target.name = person.name or target.name
+                snapshot.set_facets(target, person.division, person.department, person.project)
+                for key, holding in person.skills.items():
+                    snapshot.add_holding(target, holding.skill, holding.expertise, holding.source)
+        return snapshot
+
+
+def search(
+    snapshot: PeopleSnapshot,
+    skill: str,
+    min_level: int,
+    division: Optional[str] = None,
+    department: Optional[str] = None,
+    project: Optional[str] = None,
+    manager_empid: Optional[str] = None,
+) -> List[Tuple[Person, Holding]]:
+    """Matching people ranked by level, manager-assessed before self-reported, then name."""
+    key = snapshot.resolve_skill(skill)
+    levels = snapshot.postings.get(key)
+    if not levels:
+        return []
+
+    candidates: Set[str] = set()
+    for level in range(max(min_level, 0), MAX_LEVEL + 1):
+        candidates |= levels[level]
+    for facet, value in (("division", division), ("department", department), ("project", project)):
+        if value:
+            candidates &= snapshot.facets[facet].get(_facet(value), set())
+    if manager_empid:
+        candidates &= snapshot.subtree(manager_empid)
+
+    matches = [(snapshot.people[empid], snapshot.people[empid].skills[key]) for empid in candidates]
+    matches.sort(key=lambda match: (-match[1].level, match[1].source != SOURCE_COMPETENCY, match[0].name or match[0].empid))
+    return matches
+
+
+people_index = cache.register("org", PeopleIndex())
+cache.register("skills", people_index)
+invalidation.handle("people", people_index.mark_dirty)
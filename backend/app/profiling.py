@@ -0,0 +1,201 @@
+# app/profiling.py
+"""
+On-demand profiling of single requests.
+
+An admin gets a short-lived signed token from POST /admin/profiles/token and
+sends it as the `X-Profile` header (or `?profile=` query parameter) on the
+request to investigate. The middleware then runs that one request under a
+profiler covering dependency resolution, the handler and the SQL it issues,
+stores the result in a bounded ring buffer and returns its id in the
+`X-Profile-Id` response header. Requests without the flag pass straight
+through the middleware.
+
+pyinstrument is used when installed (sampling, async-aware: only the
+request's own task is attributed). Otherwise cProfile is used, which sees
+every coroutine running on the loop during the request.
+"""
+
+import cProfile
+import io
+import itertools
+import pstats
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from html import escape
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from jose import JWTError, jwt
+
+from app import config
+from app.auth_utils import ALGORITHM, SECRET_KEY
+from app.request_context import RequestInfo
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # optional dependency
+    Profiler = None
+
+HEADER = b"x-profile"
+QUERY_PARAMETER = "profile"
+TOKEN_PURPOSE = "profile"
+MAX_SQL_STATEMENTS = 500
+
+
+class RequestProfile:
+    def __init__(self, profile_id: int, route: str, requested_by: str, engine: str):
+        self.id = profile_id
+        self.route = route
+        self.requested_by = requested_by
+        self.engine = engine
+        self.created_at = datetime.utcnow()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.sql: List[Dict[str, Any]] = []
+        self.session: Any = None  # pyinstrument Session or pstats.Stats, rendered on demand
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "route": self.route,
+            "requested_by": self.requested_by,
+            "profiler": self.engine,
+            "created_at": self.created_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "status_code": self.status_code,
+            "sql_statements": len(self.sql),
+            "sql_ms": round(sum(entry["duration_ms"] for entry in self.sql), 2),
+        }
+
+    def render_html(self) -> str:
+        if self.engine == "pyinstrument":
+            from pyinstrument.renderers import HTMLRenderer
+            return HTMLRenderer().render(self.session)
+        return f"<html><body><h3>{escape(self.route)}</h3><pre>{escape(self.render_text())}</pre></body></html>"
+
+    def render_text(self) -> str:
+        if self.engine == "pyinstrument":
+            from pyinstrument.renderers import ConsoleRenderer
+            return ConsoleRenderer(unicode=True, color=False).render(self.session)
+        output = io.StringIO()
+        pstats.Stats(self.session, stream=output).sort_stats("cumulative").print_stats(80)
+        return output.getvalue()
+
+    def render_speedscope(self) -> Optional[str]:
+        if self.engine != "pyinstrument":
+            return None
+        return SpeedscopeRenderer().render(self.session)
+
+
+_profiles: deque = deque(maxlen=config.PROFILE_LOG_SIZE)
+_profile_ids = itertools.count(1)
+# Set only while a profiled request runs; read by the SQL timing hook.
+active_profile: ContextVar[Optional[RequestProfile]] = ContextVar("active_profile", default=None)
+# cProfile and the sampling profiler each support one active session per thread.
+_busy = False
+
+
+def create_token(admin_username: str, minutes: Optional[int] = None) -> str:
+    expires = datetime.utcnow() + timedelta(minutes=minutes or config.PROFILE_TOKEN_MINUTES)
+    return jwt.encode({"sub": admin_username, "purpose": TOKEN_PURPOSE, "exp": expires}, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def _token_owner(token: str) -> Optional[str]:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("purpose") != TOKEN_PURPOSE or payload.get("sub") not in config.ADMIN_USERS:
+        return None
+    return payload["sub"]
+
+
+def record_statement(statement: str, duration_ms: float) -> None:
+    """Called by the engine timing hook for every statement; a no-op outside profiled requests."""
+    profile = active_profile.get()
+    if profile is not None and len(profile.sql) < MAX_SQL_STATEMENTS:
+        profile.sql.append({"statement": statement, "duration_ms": round(duration_ms, 2)})
+
+
+def get_profile(profile_id: int) -> Optional[RequestProfile]:
+    for profile in _profiles:
+        if profile.id == profile_id:
+            return profile
+    return None
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    return [profile.summary() for profile in reversed(_profiles)]
+
+
+def _requested_token(scope: dict) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == HEADER:
+            return value.decode("latin-1")
+    query = scope.get("query_string")
+    if query and QUERY_PARAMETER.encode() in query:
+        values = parse_qs(query.decode("latin-1")).get(QUERY_PARAMETER)
+        if values:
+            return values[0]
+    return None
+
+
+class ProfilingMiddleware:
+    """Plain ASGI middleware; requests without a profile token are passed through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        token = _requested_token(scope) if scope["type"] == "http" else None
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        owner = _token_owner(token)
+        if owner is None or _busy:
+            # Invalid tokens are ignored rather than rejected, so the flag never breaks a request.
+            await self.app(scope, receive, _with_header(send, b"x-profile-status", b"busy" if owner else b"invalid"))
+            return
+        await self._profile(scope, receive, send, owner)
+
+    async def _profile(self, scope, receive, send, owner: str):
+        global _busy
+        _busy = True
+        profile = RequestProfile(
+            next(_profile_ids), RequestInfo(scope).route, owner, "pyinstrument" if Profiler else "cprofile"
+        )
+        send = _with_header(send, b"x-profile-id", str(profile.id).encode(), profile)
+        reset = active_profile.set(profile)
+        if Profiler is not None:
+            profiler = Profiler(interval=config.PROFILE_INTERVAL_MS / 1000, async_mode="enabled")
+        else:
+            profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.start() if Profiler is not None else profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if Profiler is not None:
+                profile.session = profiler.stop()
+            else:
+                profiler.disable()
+                profile.session = profiler
+            profile.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            # The route is known once routing has run.
+            profile.route = RequestInfo(scope).route
+            active_profile.reset(reset)
+            _profiles.append(profile)
+            _busy = False
+
+
+def _with_header(send, name: bytes, value: bytes, profile: Optional[RequestProfile] = None):
+    async def send_with_header(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": [*message.get("headers", ()), (name, value)]}
+            if profile is not None:
+                profile.status_code = message.get("status")
+        await send(message)
+    return send_with_header
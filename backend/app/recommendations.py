@@ -0,0 +1,195 @@
+# app/recommendations.py
+"""
+Matches competency gaps to upcoming trainings.
+
+The catalog is indexed once per change as skill key -> trainings sorted by
+date (with a competency-level fallback), so ranking a whole team is a batch
+of dictionary lookups and bisects instead of one query per employee.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import cache
+from app.levels import parse_level
+from app.models import TrainingDetail
+from app.taxonomy import skill_key
+
+# Level-fit buckets, best first.
+FIT_NEXT_LEVEL = 0      # training level is exactly current + 1
+FIT_WITHIN_GAP = 1      # further up, but not beyond the target
+FIT_UNKNOWN_LEVEL = 2   # the training has no usable level
+FIT_ABOVE_TARGET = 3    # overshoots the target
+FIT_LABELS = {
+    FIT_NEXT_LEVEL: "next_level",
+    FIT_WITHIN_GAP: "within_gap",
+    FIT_UNKNOWN_LEVEL: "unknown_level",
+    FIT_ABOVE_TARGET: "above_target",
+}
+
+
+class CatalogEntry(NamedTuple):
+    id: int
+    training_name: str
+    skill: Optional[str]
+    competency: Optional[str]
+    skill_category: Optional[str]
+    level: Optional[int]
+    training_date: date
+    time: Optional[str]
+    training_type: Optional[str]
+    trainer_name: Optional[str]
+
+
+class Gap(NamedTuple):
+    employee_empid: str
+    skill: Optional[str]
+    competency: Optional[str]
+    current_expertise: Optional[str]
+    target_expertise: Optional[str]
+    current_level: int
+    target_level: int
+
+
+# Per key: (dates, entries), both sorted by (training_date, id), so the first
+# upcoming training is a bisect on the dates list.
+_Postings = Tuple[List[date], List[CatalogEntry]]
+
+
+class CatalogSnapshot(NamedTuple):
+    by_skill: Dict[str, _Postings]
+    by_competency: Dict[str, _Postings]
+
+
+class TrainingCatalogIndex(cache.RebuildableIndex):
+    async def build(self, db: AsyncSession) -> CatalogSnapshot:
+        result = await db.execute(
+            select(
+                TrainingDetail.id, TrainingDetail.training_name, TrainingDetail.skill,
+                TrainingDetail.competency, TrainingDetail.skill_category, TrainingDetail.training_date,
+                TrainingDetail.time, TrainingDetail.training_type, TrainingDetail.trainer_name,
+            )
+            .where(TrainingDetail.training_date.isnot(None))
+            .order_by(TrainingDetail.training_date, TrainingDetail.id)
+        )
+        by_skill: Dict[str, _Postings] = defaultdict(lambda: ([], []))
+        by_competency: Dict[str, _Postings] = defaultdict(lambda: ([], []))
+        for row in result:
+            entry = CatalogEntry(
+                row.id, row.training_name, row.skill, row.competency, row.skill_category,
+                parse_level(row.skill_category), row.training_date, row.time, row.training_type, row.trainer_name,
+            )
+            for postings, key in ((by_skill, skill_key(row.skill)), (by_competency, skill_key(row.competency))):
+                if key:
+                    dates, entries = postings[key]
+                    dates.append(entry.training_date)
+                    entries.append(entry)
+        return CatalogSnapshot(dict(by_skill), dict(by_competency))
+
+
+training_catalog_index = cache.register("catalog", TrainingCatalogIndex())
+
+
+def level_fit(gap: Gap, training_level: Optional[int]) -> Optional[int]:
+    """Fit bucket for a training against a gap, or None if it teaches nothing new."""
+    if training_level is None:
+        return FIT_UNKNOWN_LEVEL
+    if training_level <= gap.current_level:
+        return None
+    if training_level == gap.current_level + 1:
+        return FIT_NEXT_LEVEL
+    if training_level <= gap.target_level:
+        return FIT_WITHIN_GAP
+    return FIT_ABOVE_TARGET
+
+
+def _upcoming(postings: Optional[_Postings], today: date) -> Iterable[CatalogEntry]:
+    if not postings:
+        return ()
+    dates, entries = postings
+    return entries[bisect_left(dates, today):]
+
+
+def rank_for_gap(
+    snapshot: CatalogSnapshot,
+    gap: Gap,
+    today: date,
+    per_gap: int,
+    exclude_ids: Set[int] = frozenset(),
+) -> List[dict]:
+    """
+    Upcoming trainings for one gap ordered by (level fit, skill before
+    competency match, date). Trainings already assigned are skipped.
+    """
+    candidates = []
+    seen = set()
+    for match_rank, match, postings in (
+        (0, "skill", snapshot.by_skill.get(skill_key(gap.skill))),
+        (1, "competency", snapshot.by_competency.get(skill_key(gap.competency))),
+    ):
+        for entry in _upcoming(postings, today):
+            if entry.id in seen or entry.id in exclude_ids:
+                continue
+            fit = level_fit(gap, entry.level)
+            if fit is None:
+                continue
+            seen.add(entry.id)
+            candidates.append(((fit, match_rank, entry.training_date, entry.id), match, fit, entry))
+
+    candidates.sort(key=lambda candidate: candidate[0])
+    return [
+        {
+            "training_id": entry.id,
+            "training_name": entry.training_name,
+            "skill": entry.skill,
+            "competency": entry.competency,
+            "skill_category": entry.skill_category,
+            "training_date": entry.training_date.isoformat(),
+            "time": entry.time,
+            "training_type": entry.training_type,
+            "trainer_name": entry.trainer_name,
+            "match": match,
+            "level_fit": FIT_LABELS[fit],
+        }
+        for _, match, fit, entry in candidates[:per_gap]
+    ]
+
+
+def gaps_from_rows(rows: Iterable) -> List[Gap]:
+    """Competency rows (with employee_empid, skill, competency, current/target expertise) that are gaps."""
+    gaps = []
+    for row in rows:
+        current, target = parse_level(row.current_expertise), parse_level(row.target_expertise)
+        if current is None or target is None or current >= target:
+            continue
+        gaps.append(Gap(
+            row.employee_empid, row.skill, row.competency,
+            row.current_expertise, row.target_expertise, current, target,
+        ))
+    return gaps
+
+
+def recommend(
+    snapshot: CatalogSnapshot,
+    gaps: Iterable[Gap],
+    assigned: Dict[str, Set[int]],
+    per_gap: int,
+    today: Optional[date] = None,
+) -> Dict[str, List[dict]]:
+    """Recommendations for many employees in one pass: empid -> list of gaps with ranked trainings."""
+    today = today or date.today()
+    by_employee: Dict[str, List[dict]] = defaultdict(list)
+    for gap in gaps:
+        by_employee[gap.employee_empid].append({
+            "skill": gap.skill,
+            "competency": gap.competency,
+            "current_expertise": gap.current_expertise,
+            "target_expertise": gap.target_expertise,
+            "trainings": rank_for_gap(snapshot, gap, today, per_gap, assigned.get(gap.employee_empid, frozenset())),
+        })
+    return by_employee
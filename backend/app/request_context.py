@@ -0,0 +1,82 @@
+# app/request_context.py
+"""
+Per-request context shared with code that has no access to the Request object
+(SQLAlchemy event hooks, logging, monitors).
+"""
+
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 64
+
+
+def _incoming_request_id(scope: dict) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == REQUEST_ID_HEADER and 0 < len(value) <= MAX_REQUEST_ID_LENGTH:
+            return value.decode("latin-1")
+    return None
+
+
+class RequestInfo:
+    __slots__ = ("method", "path", "scope", "request_id")
+
+    def __init__(self, scope: dict, request_id: Optional[str] = None):
+        self.method = scope.get("method", "")
+        self.path = scope.get("path", "")
+        self.scope = scope
+        self.request_id = request_id
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route on the scope once routing is done,
+        # which gives "/assignments/{id}" instead of the concrete path.
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.path
+        return f"{self.method} {path}"
+
+
+current_request: ContextVar[Optional[RequestInfo]] = ContextVar("current_request", default=None)
+
+
+def get_current_route() -> Optional[str]:
+    info = current_request.get()
+    return info.route if info else None
+
+
+def get_current_request_id() -> Optional[str]:
+    info = current_request.get()
+    return info.request_id if info else None
+
+
+class RequestContextMiddleware:
+    """
+    Plain ASGI middleware (no extra task per request) that publishes the
+    current request in `current_request`. Each request gets an id (the
+    caller's X-Request-ID if sent) that is echoed in the response and logged.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex
+        token = current_request.set(RequestInfo(scope, request_id))
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", ()), (REQUEST_ID_HEADER, request_id.encode("latin-1"))],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            current_request.reset(token)
@@ -1,11 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import Boolean, Integer, String, case, cast, column, delete, literal, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List
+from typing import Dict, List
 from app.database import get_db_async
 from app.models import AdditionalSkill
-from app.schemas import AdditionalSkillCreate, AdditionalSkillUpdate, AdditionalSkillResponse
+from app.schemas import (
+    AdditionalSkillCreate, AdditionalSkillUpdate, AdditionalSkillResponse,
+    AdditionalSkillBatch, AdditionalSkillBatchUpdate, AdditionalSkillBatchResponse,
+)
 from app.auth_utils import get_current_active_user
+from app import events, taxonomy
+from app.people_index import people_index
 
 router = APIRouter(prefix="/additional-skills", tags=["Additional Skills"])
 
@@ -32,25 +40,27 @@ async def create_additional_skill(
     """Create a new additional skill for the current user"""
     employee_empid = current_user.get("username")
     
-    # Check if skill already exists for this user
-    existing_skill = await db.execute(
-        select(AdditionalSkill).where(
-            AdditionalSkill.employee_empid == employee_empid,
-            AdditionalSkill.skill_name == skill_data.skill_name
-        )
-    )
-    if existing_skill.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Skill already exists for this user"
-        )
-    
+    skill_ids = await taxonomy.resolve_skills(db, [(skill_data.skill_name, skill_data.skill_category)])
     new_skill = AdditionalSkill(
         employee_empid=employee_empid,
+        skill_id=skill_ids.get(skill_data.skill_name),
         **skill_data.dict()
     )
     
+    # Duplicates are rejected by the unique (employee_empid, skill_name) index
     db.add(new_skill)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Skill already exists for this user"
+        )
+    await events.publish(db, [employee_empid], "additional_skill_created", {
+        "skill_id": new_skill.id, "skill_name": new_skill.skill_name
+    })
+    await people_index.mark_dirty_on_commit(db, [employee_empid])
     await db.commit()
     await db.refresh(new_skill)
     
@@ -83,9 +93,26 @@ async def update_additional_skill(
     
     # Update fields
     update_data = skill_data.dict(exclude_unset=True)
+    if update_data.get("skill_name"):
+        skill_ids = await taxonomy.resolve_skills(
+            db, [(update_data["skill_name"], update_data.get("skill_category") or skill.skill_category)]
+        )
+        update_data["skill_id"] = skill_ids.get(update_data["skill_name"])
     for field, value in update_data.items():
         setattr(skill, field, value)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Skill already exists for this user"
+        )
     
+    await events.publish(db, [employee_empid], "additional_skill_updated", {
+        "skill_id": skill.id, "skill_name": skill.skill_name
+    })
+    await people_index.mark_dirty_on_commit(db, [employee_empid])
     await db.commit()
     await db.refresh(skill)
     
@@ -116,6 +143,169 @@ async def delete_additional_skill(
         )
     
     await db.delete(skill)
+    await events.publish(db, [employee_empid], "additional_skill_deleted", {"skill_id": skill_id})
+    await people_index.mark_dirty_on_commit(db, [employee_empid])
     await db.commit()
     
     return {"message": "Skill deleted successfully"}
+
+
+# --- Batch endpoint ---
+
+additional_skills_table = AdditionalSkill.__table__
+UPDATABLE_FIELDS = ("skill_name", "skill_level", "skill_category", "description")
+NULLABLE_FIELDS = {"description"}
+
+
+def _is_set(item: AdditionalSkillBatchUpdate, field: str) -> bool:
+    value = getattr(item, field)
+    return field in item.model_fields_set and (value is not None or field in NULLABLE_FIELDS)
+
+
+def _changes(update_items: List[AdditionalSkillBatchUpdate], skill_ids: Dict[str, int]):
+    """
+    A VALUES list with one row per update: the new value of every field plus a
+    set_<field> flag, so one UPDATE can change different fields on each row.
+    A renamed skill also carries its dictionary id, cast explicitly: in a
+    batch without renames every skill_id is NULL, and Postgres would type an
+    untyped NULL column as text.
+    """
+    rows = []
+    for item in update_items:
+        row = {"id": item.id}
+        for field in UPDATABLE_FIELDS:
+            is_set = _is_set(item, field)
+            row[field] = getattr(item, field) if is_set else None
+            row[f"set_{field}"] = is_set
+        skill_id = skill_ids.get(item.skill_name) if row["set_skill_name"] else None
+        row["skill_id"] = cast(literal(skill_id, Integer), Integer)
+        rows.append(tuple(row.values()))
+
+    columns = [column("id", Integer)]
+    for field in UPDATABLE_FIELDS:
+        columns += [column(field, String), column(f"set_{field}", Boolean)]
+    columns.append(column("skill_id", Integer))
+    return values(*columns, name="changes").data(rows)
+
+
+def _update_statement(employee_empid: str, update_items: List[AdditionalSkillBatchUpdate], skill_ids: Dict[str, int]):
+    changes = _changes(update_items, skill_ids)
+    return (
+        update(additional_skills_table)
+        .where(
+            additional_skills_table.c.id == changes.c.id,
+            additional_skills_table.c.employee_empid == employee_empid
+        )
+        .values({
+            **{
+                field: case((changes.c[f"set_{field}"], changes.c[field]), else_=additional_skills_table.c[field])
+                for field in UPDATABLE_FIELDS
+            },
+            "skill_id": case(
+                (changes.c.set_skill_name, changes.c.skill_id), else_=additional_skills_table.c.skill_id
+            ),
+        })
+        .returning(*additional_skills_table.c)
+    )
+
+
+async def _update_skills(
+    db: AsyncSession, employee_empid: str, update_items: List[AdditionalSkillBatchUpdate], skill_ids: Dict[str, int]
+):
+    result = await db.execute(_update_statement(employee_empid, update_items, skill_ids))
+    return {row.id: row for row in result}
+
+
+@router.post("/batch", response_model=AdditionalSkillBatchResponse)
+async def batch_additional_skills(
+    batch: AdditionalSkillBatch,
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Applies creates, updates and deletes for the current user in one
+    transaction: one DELETE, one UPDATE ... FROM (VALUES ...) and one
+    INSERT ... ON CONFLICT DO NOTHING. Deletes run first and creates last, so a
+    batch can free a skill name and reuse it. Returns a result per item.
+    """
+    employee_empid = current_user.get("username")
+    results = []
+
+    # Dictionary ids for every new or changed name, in one lookup
+    skill_ids = await taxonomy.resolve_skills(db, [
+        *((item.skill_name, item.skill_category) for item in batch.creates),
+        *((item.skill_name, item.skill_category) for item in batch.updates if _is_set(item, "skill_name")),
+    ])
+
+    # Step 1: deletes
+    deleted_ids = set()
+    if batch.deletes:
+        deleted = await db.execute(
+            delete(additional_skills_table)
+            .where(
+                additional_skills_table.c.employee_empid == employee_empid,
+                additional_skills_table.c.id.in_(batch.deletes)
+            )
+            .returning(additional_skills_table.c.id)
+        )
+        deleted_ids = set(deleted.scalars())
+    for index, skill_id in enumerate(batch.deletes):
+        results.append({"op": "delete", "index": index, "status": "deleted" if skill_id in deleted_ids else "not_found"})
+
+    # Step 2: updates. The last update for an id wins; earlier ones are reported as duplicates.
+    last_update = {item.id: index for index, item in enumerate(batch.updates)}
+    update_items = [batch.updates[index] for index in last_update.values()]
+    updated = {}
+    if update_items:
+        try:
+            async with db.begin_nested():
+                updated = await _update_skills(db, employee_empid, update_items, skill_ids)
+        except IntegrityError:
+            # A rename collided with an existing skill name; find out which one
+            # by retrying item by item, each in its own savepoint.
+            for item in update_items:
+                try:
+                    async with db.begin_nested():
+                        updated.update(await _update_skills(db, employee_empid, [item], skill_ids))
+                except IntegrityError:
+                    updated[item.id] = "duplicate"
+    for index, item in enumerate(batch.updates):
+        row = updated.get(item.id)
+        if last_update[item.id] != index or row == "duplicate":
+            results.append({"op": "update", "index": index, "status": "duplicate"})
+        elif row is None:
+            results.append({"op": "update", "index": index, "status": "not_found"})
+        else:
+            results.append({"op": "update", "index": index, "status": "updated", "skill": row})
+
+    # Step 3: creates; the unique index turns repeated names into no-ops
+    created = {}
+    if batch.creates:
+        inserted = await db.execute(
+            pg_insert(additional_skills_table)
+            .values([
+                {"employee_empid": employee_empid, "skill_id": skill_ids.get(item.skill_name), **item.model_dump()}
+                for item in batch.creates
+            ])
+            .on_conflict_do_nothing(index_elements=["employee_empid", "skill_name"])
+            .returning(*additional_skills_table.c)
+        )
+        created = {row.skill_name: row for row in inserted}
+    for index, item in enumerate(batch.creates):
+        row = created.pop(item.skill_name, None)
+        if row is None:
+            results.append({"op": "create", "index": index, "status": "duplicate"})
+        else:
+            results.append({"op": "create", "index": index, "status": "created", "skill": row})
+
+    counts = {
+        "created": sum(r["status"] == "created" for r in results),
+        "updated": sum(r["status"] == "updated" for r in results),
+        "deleted": len(deleted_ids),
+    }
+    if any(counts.values()):
+        await events.publish(db, [employee_empid], "additional_skills_batch", counts)
+        await people_index.mark_dirty_on_commit(db, [employee_empid])
+    await db.commit()
+
+    return {"results": results, **counts}
@@ -0,0 +1,96 @@
+# app/routes/admin_routes.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import cache, config, invalidation, profiling, slow_query_log
+from app.loop_monitor import monitor
+from app.database import get_db_async
+from app.auth_utils import get_current_active_admin
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(get_current_active_admin)]
+)
+
+@router.get("/slow-queries")
+async def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """
+    Returns the most recent statements that exceeded the slow-query threshold,
+    newest first, with their redacted parameters, route and EXPLAIN plan.
+    """
+    return slow_query_log.get_entries(limit)
+
+@router.delete("/slow-queries")
+async def clear_slow_queries():
+    """Empties the slow-query ring buffer."""
+    slow_query_log.clear()
+    return {"message": "Slow-query log cleared"}
+
+@router.get("/loop-lag")
+async def get_loop_lag(limit: int = Query(20, ge=1, le=1000)):
+    """
+    This worker's event-loop lag histogram (cumulative buckets, like a
+    Prometheus histogram) and the most recent stalls with their sampled stack
+    and route, newest first.
+    """
+    return monitor.report(limit)
+
+@router.post("/profiles/token")
+async def create_profile_token(
+    minutes: int = Query(config.PROFILE_TOKEN_MINUTES, ge=1, le=120),
+    current_admin: dict = Depends(get_current_active_admin)
+):
+    """
+    A signed token that turns on profiling for any request carrying it in the
+    X-Profile header (or ?profile= query parameter), e.g. when reproducing a
+    slow page in the affected user's session.
+    """
+    return {
+        "token": profiling.create_token(current_admin["username"], minutes),
+        "header": "X-Profile",
+        "expires_in_minutes": minutes,
+    }
+
+@router.get("/profiles")
+async def get_profiles():
+    """Profiles recorded by this worker, newest first."""
+    return profiling.list_profiles()
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: int, format: str = Query("html", pattern="^(html|speedscope|text|json)$")):
+    """
+    One profile as an HTML report, speedscope JSON (pyinstrument only), plain
+    text, or JSON with the summary and the SQL statements it issued.
+    """
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found (it may have been evicted)")
+    if format == "html":
+        return HTMLResponse(profile.render_html())
+    if format == "text":
+        return PlainTextResponse(profile.render_text())
+    if format == "speedscope":
+        rendered = profile.render_speedscope()
+        if rendered is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Speedscope output needs pyinstrument")
+        return Response(
+            rendered, media_type="application/json",
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+        )
+    return {**profile.summary(), "sql": profile.sql}
+
+@router.post("/caches/invalidate")
+async def invalidate_caches(topic: Optional[str] = None, db: AsyncSession = Depends(get_db_async)):
+    """
+    Drops in-memory caches and indexes of one topic ("org", "catalog",
+    "trainers", "skills"), or all of them, on every worker. Needed after
+    changing the org tables outside the API.
+    """
+    await invalidation.publish(db, topics=[topic] if topic else cache.topics())
+    await db.commit()
+    return {"message": f"Invalidated {topic or 'all'} caches"}
@@ -1,14 +1,18 @@
 # app/routes/assignment_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from datetime import date, datetime
+from typing import Dict, List
+from sqlalchemy import distinct, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.future import select
 
 from app.database import get_db_async
-from app import models
-from app.auth_utils import get_current_active_user # Using your auth dependency
+from app import events, http_cache, models, schedule, versions
+from app.auth_utils import get_current_active_user, get_current_active_manager # Using your auth dependency
+from app.org_directory import org_directory
+from app.routes.training_routes import TRAINING_COLUMNS
 
 router = APIRouter(
     prefix="/assignments",
@@ -18,61 +22,207 @@ router = APIRouter(
 class AssignmentCreate(BaseModel):
     training_id: int
     employee_username: str
+    # Assign even when the employee is already booked at that time
+    allow_conflicts: bool = False
+
+class BulkAssignmentCreate(BaseModel):
+    training_id: int
+    employee_usernames: List[str] = Field(..., min_length=1, max_length=500)
+    allow_conflicts: bool = False
+
+# One statement for any number of employees. Requested employees are numbered
+# in request order; the first `remaining` new ones get a seat and the rest are
+# waitlisted. ON CONFLICT on the unique (training_id, employee_empid) index
+# makes duplicates (in the request or already stored) a no-op. The join on
+# users skips unknown usernames instead of failing the whole batch on the FK.
+ASSIGN_EMPLOYEES_SQL = text("""
+    INSERT INTO training_assignments (training_id, employee_empid, manager_empid, assignment_date, status)
+    SELECT :training_id, requested.empid, :manager_empid, now(),
+           CASE WHEN CAST(:remaining AS integer) IS NULL
+                     OR row_number() OVER (ORDER BY requested.ord) <= CAST(:remaining AS integer)
+                THEN 'assigned' ELSE 'waitlisted' END
+    FROM unnest(CAST(:empids AS text[])) WITH ORDINALITY AS requested(empid, ord)
+    JOIN users ON users.username = requested.empid
+    WHERE NOT EXISTS (
+        SELECT 1 FROM training_assignments existing
+        WHERE existing.training_id = :training_id AND existing.employee_empid = requested.empid
+    )
+    ON CONFLICT (training_id, employee_empid) DO NOTHING
+    RETURNING employee_empid, status
+""")
+
+
+async def assign_employees(
+    db: AsyncSession, training_id: int, employee_usernames: List[str], manager_username: str,
+    allow_conflicts: bool = False,
+) -> dict:
+    """
+    Assigns a training to many employees in one transaction. The training row
+    is locked (SELECT ... FOR UPDATE) while seats are counted and handed out,
+    so concurrent assignments can never oversubscribe it. Employees already
+    attending or teaching an overlapping training are left out with status
+    "conflict" and the clashing trainings, unless allow_conflicts is set.
+    Usernames with no user account get status "unknown_employee", and
+    employees who don't report to the manager "not_in_team".
+    """
+    requested = list(dict.fromkeys(employee_usernames))
+    known_result = await db.execute(select(models.User.username).where(models.User.username.in_(requested)))
+    known = set(known_result.scalars())
+    # Read from manager_employee: a manager can only book seats for their own reports
+    team = await org_directory.managed_among(
+        db, manager_username, [username for username in requested if username in known]
+    )
+    candidates = [username for username in requested if username in team]
+
+    training_result = await db.execute(
+        select(
+            models.TrainingDetail.id, models.TrainingDetail.seat_capacity,
+            models.TrainingDetail.starts_at, models.TrainingDetail.ends_at,
+        )
+        .where(models.TrainingDetail.id == training_id)
+        .with_for_update()
+    )
+    training = training_result.first()
+    if training is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Training not found")
+
+    # One overlap query for the whole request, under the employees' schedule locks
+    conflicts = {}
+    if training.starts_at is not None:
+        await schedule.lock_schedules(db, candidates)
+        conflicts = await schedule.find_conflicts(
+            db, candidates, training.starts_at, training.ends_at, exclude_training_id=training_id
+        )
+    to_assign = candidates if allow_conflicts else [empid for empid in candidates if empid not in conflicts]
+
+    remaining = None
+    if training.seat_capacity is not None:
+        taken_result = await db.execute(
+            select(func.count()).select_from(models.TrainingAssignment).where(
+                models.TrainingAssignment.training_id == training_id,
+                models.TrainingAssignment.status == "assigned"
+            )
+        )
+        remaining = max(training.seat_capacity - taken_result.scalar_one(), 0)
+
+    inserted = await db.execute(ASSIGN_EMPLOYEES_SQL, {
+        "training_id": training_id,
+        "manager_empid": manager_username,
+        "remaining": remaining,
+        "empids": to_assign,
+    })
+    statuses = dict(inserted.all())
+    await versions.bump(db, [versions.assignments_of(empid) for empid in statuses])
+    for status in set(statuses.values()):
+        await events.publish(
+            db, [empid for empid, value in statuses.items() if value == status], "assignment_created",
+            {"training_id": training_id, "status": status}
+        )
+    await db.commit()
+
+    results = []
+    for username in requested:
+        if username not in known:
+            result = {"employee_username": username, "status": "unknown_employee"}
+        elif username not in team:
+            result = {"employee_username": username, "status": "not_in_team"}
+        elif username in statuses:
+            result = {"employee_username": username, "status": statuses[username]}
+        elif username in conflicts and not allow_conflicts:
+            result = {"employee_username": username, "status": "conflict"}
+        else:
+            result = {"employee_username": username, "status": "already_assigned"}
+        if username in conflicts:
+            result["conflicts"] = conflicts[username]
+        results.append(result)
+    counts = {"assigned": 0, "waitlisted": 0, "already_assigned": 0, "conflict": 0, "unknown_employee": 0, "not_in_team": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return {"training_id": training_id, "seat_capacity": training.seat_capacity, "results": results, **counts}
 
 @router.post("/", status_code=201)
 async def assign_training_to_employee(
     assignment: AssignmentCreate,
     db: AsyncSession = Depends(get_db_async),
-    current_user: dict = Depends(get_current_active_user) # Get the logged-in manager
+    current_user: dict = Depends(get_current_active_manager)
 ):
     """
     Creates an assignment record linking a training to an employee.
-    Called by the manager's dashboard.
+    Called by the manager's dashboard; the employee must report to the manager.
     """
     manager_username = current_user.get("username")
 
-    # Check if assignment already exists
-    existing_assignment_stmt = select(models.TrainingAssignment).where(
-        models.TrainingAssignment.training_id == assignment.training_id,
-        models.TrainingAssignment.employee_empid == assignment.employee_username
+    outcome = await assign_employees(
+        db, assignment.training_id, [assignment.employee_username], manager_username, assignment.allow_conflicts
     )
-    existing_assignment_result = await db.execute(existing_assignment_stmt)
-    if existing_assignment_result.scalar_one_or_none():
+    result = outcome["results"][0]
+    status = result["status"]
+
+    if status == "unknown_employee":
+        raise HTTPException(status_code=404, detail="Employee not found")
+    if status == "not_in_team":
+        raise HTTPException(status_code=403, detail="This employee is not in your team")
+    if status == "conflict":
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "The employee is already booked at this time", "conflicts": result["conflicts"]},
+        )
+    if status == "already_assigned":
         raise HTTPException(
             status_code=400, 
             detail="This training is already assigned to this employee"
         )
+    if status == "waitlisted":
+        return {"message": "Training is full; the employee has been added to the waitlist", "status": status}
+
+    return {"message": "Training assigned successfully", "status": status}
 
-    # Create the new assignment record
-    db_assignment = models.TrainingAssignment(
-        training_id=assignment.training_id,
-        employee_empid=assignment.employee_username,
-        manager_empid=manager_username
+@router.post("/bulk", status_code=201)
+async def assign_training_to_employees(
+    assignment: BulkAssignmentCreate,
+    db: AsyncSession = Depends(get_db_async),
+    current_user: dict = Depends(get_current_active_manager)
+):
+    """
+    Assigns one training to many of the manager's direct reports in a single
+    statement, honouring the training's seat capacity. Returns a status per
+    employee: assigned, waitlisted, already_assigned, conflict (with the
+    overlapping trainings), unknown_employee or not_in_team.
+    """
+    return await assign_employees(
+        db, assignment.training_id, assignment.employee_usernames, current_user.get("username"),
+        assignment.allow_conflicts,
     )
-    db.add(db_assignment)
-    await db.commit()
-    await db.refresh(db_assignment)
-    
-    return {"message": "Training assigned successfully"}
 
 @router.get("/my")
 async def get_my_assigned_trainings(
+    request: Request,
     db: AsyncSession = Depends(get_db_async),
     current_user: dict = Depends(get_current_active_user)
 ):
     """
     Returns training details for trainings assigned to the current logged-in user (employee).
+    The ETag combines the catalog version and the user's assignment version,
+    so an unchanged list is answered with a 304 without a query.
     """
     employee_username = current_user.get("username")
 
+    current = await versions.get_versions(db, [versions.CATALOG, versions.assignments_of(employee_username)])
+    catalog_version, assignment_version = current[versions.CATALOG], current[versions.assignments_of(employee_username)]
+    tag = f"assignments-{employee_username}-{catalog_version.number}-{assignment_version.number}"
+    last_modified = max(catalog_version.updated_at, assignment_version.updated_at)
+    if http_cache.is_fresh(request, tag, last_modified):
+        return http_cache.not_modified(request, tag, last_modified, encoded=False)
+
     # Join assignments with training details
-    stmt = select(models.TrainingDetail).join(
+    stmt = select(*TRAINING_COLUMNS, models.TrainingAssignment.status.label("assignment_status")).join(
         models.TrainingAssignment,
         models.TrainingAssignment.training_id == models.TrainingDetail.id
     ).where(models.TrainingAssignment.employee_empid == employee_username)
 
     result = await db.execute(stmt)
-    trainings = result.scalars().all()
+    trainings = result.all()
 
     # Serialize minimal fields
     def to_iso(val):
@@ -86,25 +236,123 @@ async def get_my_assigned_trainings(
                 return val
         return None
 
-    def serialize(td: models.TrainingDetail):
-        return {
-            "id": td.id,
-            "division": td.division,
-            "department": td.department,
-            "competency": td.competency,
-            "skill": td.skill,
-            "training_name": td.training_name,
-            "training_topics": td.training_topics,
-            "prerequisites": td.prerequisites,
-            "skill_category": td.skill_category,
-            "trainer_name": td.trainer_name,
-            "email": td.email,
-            "training_date": to_iso(td.training_date),
-            "duration": td.duration,
-            "time": td.time,
-            "training_type": td.training_type,
-            "seats": td.seats,
-            "assessment_details": td.assessment_details,
-        }
-
-    return [serialize(t) for t in trainings]
\ No newline at end of file
+    def serialize(row) -> dict:
+        training = row._asdict()
+        for field in ("training_date", "starts_at", "ends_at"):
+            training[field] = to_iso(training[field])
+        return training
+
+    return http_cache.respond_json(
+        [serialize(row) for row in trainings], tag, last_modified
+    )
+
+
+def _progress_counts(today: date):
+    """Aggregate columns shared by the team progress groupings."""
+    training_date = models.TrainingDetail.training_date
+    return (
+        func.count().label("assigned"),
+        func.count().filter(models.TrainingAssignment.status == "waitlisted").label("waitlisted"),
+        func.count().filter(training_date >= today).label("upcoming"),
+        func.count().filter(training_date < today).label("past"),
+    )
+
+@router.get("/team")
+async def get_team_assignment_progress(
+    db: AsyncSession = Depends(get_db_async),
+    current_user: dict = Depends(get_current_active_manager)
+):
+    """
+    Assignment progress for the current manager's direct reports: counts per
+    employee and per training, and per-skill coverage of the team. Every
+    figure comes from a grouped query; no training rows are loaded.
+    """
+    manager_username = current_user.get("username")
+    today = date.today()
+
+    team = await org_directory.reports(db, manager_username)
+    if not team:
+        return {"team_size": 0, "employees": [], "trainings": [], "skills": []}
+    team_empids = [member.employee_empid for member in team]
+
+    # Step 1: assignments of the team joined to the training columns we group on
+    assignments = (
+        select(models.TrainingAssignment.employee_empid)
+        .join(models.TrainingDetail, models.TrainingDetail.id == models.TrainingAssignment.training_id)
+        .where(models.TrainingAssignment.employee_empid.in_(team_empids))
+    )
+
+    # Step 2: per employee
+    employee_result = await db.execute(
+        assignments.with_only_columns(models.TrainingAssignment.employee_empid, *_progress_counts(today))
+        .group_by(models.TrainingAssignment.employee_empid)
+    )
+    empty = {"assigned": 0, "waitlisted": 0, "upcoming": 0, "past": 0}
+    by_employee = {row.employee_empid: row._asdict() for row in employee_result}
+    employees = [
+        {**empty, **by_employee.get(member.employee_empid, {}),
+         "employee_empid": member.employee_empid, "employee_name": member.employee_name}
+        for member in team
+    ]
+
+    # Step 3: per training
+    training_result = await db.execute(
+        assignments.with_only_columns(
+            models.TrainingDetail.id.label("training_id"), models.TrainingDetail.training_name,
+            models.TrainingDetail.skill, models.TrainingDetail.training_date,
+            models.TrainingDetail.seat_capacity, *_progress_counts(today)
+        )
+        .group_by(
+            models.TrainingDetail.id, models.TrainingDetail.training_name,
+            models.TrainingDetail.skill, models.TrainingDetail.training_date, models.TrainingDetail.seat_capacity
+        )
+        .order_by(models.TrainingDetail.training_date.desc(), models.TrainingDetail.id.desc())
+    )
+    trainings = []
+    for row in training_result:
+        training = row._asdict()
+        training["training_date"] = row.training_date.isoformat() if row.training_date else None
+        trainings.append(training)
+
+    # Step 4: per skill — team members assigned a training for the skill, next
+    # to how many of them have that skill among their competencies. Skills are
+    # grouped case- and whitespace-insensitively, as typed in the Excel sheets.
+    training_skill = func.lower(func.trim(models.TrainingDetail.skill))
+    skill_result = await db.execute(
+        assignments.with_only_columns(
+            training_skill.label("skill_key"), func.min(models.TrainingDetail.skill).label("skill"),
+            func.count(distinct(models.TrainingAssignment.employee_empid)).label("employees_assigned"),
+            *_progress_counts(today)
+        )
+        .where(models.TrainingDetail.skill.isnot(None))
+        .group_by(training_skill)
+    )
+    competency_skill = func.lower(func.trim(models.EmployeeCompetency.skill))
+    required_result = await db.execute(
+        select(
+            competency_skill.label("skill_key"), func.min(models.EmployeeCompetency.skill).label("skill"),
+            func.count(distinct(models.EmployeeCompetency.employee_empid)).label("employees_required"),
+        )
+        .where(
+            models.EmployeeCompetency.employee_empid.in_(team_empids),
+            models.EmployeeCompetency.skill.isnot(None)
+        )
+        .group_by(competency_skill)
+    )
+
+    team_size = len(team)
+    skills: Dict[str, dict] = {}
+    for row in required_result:
+        skills[row.skill_key] = {"skill": row.skill, "employees_required": row.employees_required, "employees_assigned": 0, **empty}
+    for row in skill_result:
+        entry = skills.setdefault(row.skill_key, {"skill": row.skill, "employees_required": 0})
+        entry.update({field: getattr(row, field) for field in ("employees_assigned", *empty)})
+    for entry in skills.values():
+        entry["coverage"] = round(entry["employees_assigned"] / team_size, 3)
+
+    return {
+        "team_size": team_size,
+        "employees": employees,
+        "trainings": trainings,
+        "skills": sorted(skills.values(), key=lambda entry: (-entry["employees_required"], entry["skill"])),
+    }
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update
 from app.database import get_db_async
 # Ensure you import your AdditionalSkill model
-from app.models import User, ManagerEmployee, EmployeeCompetency, AdditionalSkill
+from app.models import User, EmployeeCompetency, AdditionalSkill
 from app.auth_utils import get_current_active_user, get_current_active_manager
+from app.levels import parse_level
+from app import events, skill_history
+from app.people_index import people_index
+from app.org_directory import org_directory
 from pydantic import BaseModel
 
 # Create a single router for both endpoints with a common prefix
@@ -18,6 +22,17 @@ class SkillUpdateRequest(BaseModel):
     current_expertise: str
     target_expertise: str
 
+# Read paths select only the columns they serialize, as plain rows, instead
+# of hydrating full entities into the session's identity map.
+SKILL_COLUMNS = (
+    EmployeeCompetency.skill, EmployeeCompetency.competency,
+    EmployeeCompetency.current_expertise, EmployeeCompetency.target_expertise,
+)
+ADDITIONAL_SKILL_COLUMNS = (
+    AdditionalSkill.employee_empid, AdditionalSkill.id, AdditionalSkill.skill_name, AdditionalSkill.skill_level,
+    AdditionalSkill.skill_category, AdditionalSkill.description, AdditionalSkill.created_at,
+)
+
 # Helper function to get status based on string levels
 def get_status_from_levels(current_level_str: str, target_level_str: str) -> str:
     """
@@ -28,38 +43,18 @@ def get_status_from_levels(current_level_str: str, target_level_str: str) -> str
     if current_level_str is None or target_level_str is None:
         return "Error"
 
-    def convert_to_numeric(level_str: str) -> int:
-        """Convert level string to numeric value for comparison"""
-        level_str = level_str.strip()
-
-        # Handle L-format (L0, L1, L2, L3, L4, L5)
-        if level_str.upper().startswith('L'):
-            return int(level_str.upper().lstrip('L'))
+    current_level_num = parse_level(current_level_str)
+    target_level_num = parse_level(target_level_str)
 
-        # Handle text format (Beginner, Intermediate, Advanced, Expert)
-        level_mapping = {
-            'BEGINNER': 1,
-            'INTERMEDIATE': 2,
-            'ADVANCED': 3,
-            'EXPERT': 4
-        }
-        return level_mapping.get(level_str.upper(), -1)
-
-    try:
-        current_level_num = convert_to_numeric(current_level_str)
-        target_level_num = convert_to_numeric(target_level_str)
-
-        # If either conversion failed, return Error
-        if current_level_num == -1 or target_level_num == -1:
-            return "Error"
-
-        if current_level_num >= target_level_num:
-            return "Met"
-        else:
-            return "Gap"
-    except (ValueError, IndexError, TypeError):
+    # If either conversion failed, return Error
+    if current_level_num is None or target_level_num is None:
         return "Error"
 
+    if current_level_num >= target_level_num:
+        return "Met"
+    else:
+        return "Gap"
+
 @router.get("/manager/dashboard")
 async def get_manager_data(
     current_user: dict = Depends(get_current_active_manager),
@@ -71,40 +66,28 @@ async def get_manager_data(
     """
     manager_username = current_user.get("username")
 
-    # Resolve manager display name from ManagerEmployee table if available
-    manager_name_result = await db.execute(
-        select(ManagerEmployee.manager_name).where(ManagerEmployee.manager_empid == manager_username)
-    )
-    manager_name_row = manager_name_result.first()
-    manager_display_name = manager_name_row[0] if manager_name_row and manager_name_row[0] else manager_username
+    # Resolve manager display name, trainer flag and team from the org directory
+    org_entry = await org_directory.lookup(db, manager_username)
+    manager_display_name = org_entry.manager_name if org_entry and org_entry.manager_name else manager_username
+    manager_is_trainer = org_entry.manager_is_trainer if org_entry else False
 
     # Fetch manager's own skills
     manager_skills_result = await db.execute(
-        select(EmployeeCompetency).where(EmployeeCompetency.employee_empid == manager_username)
+        select(*SKILL_COLUMNS).where(EmployeeCompetency.employee_empid == manager_username)
     )
-    manager_skills_orm = manager_skills_result.scalars().all()
+    manager_skills_rows = manager_skills_result.all()
     manager_skills_list = [
         {
             "skill": comp.skill, "competency": comp.competency,
             "current_expertise": comp.current_expertise, "target_expertise": comp.target_expertise,
             "status": get_status_from_levels(comp.current_expertise, comp.target_expertise)
-        } for comp in manager_skills_orm
+        } for comp in manager_skills_rows
     ]
 
-    # Fetch manager_is_trainer from ManagerEmployee table
-    manager_trainer_result = await db.execute(
-        select(ManagerEmployee.manager_is_trainer).where(ManagerEmployee.manager_empid == manager_username)
-    )
-    manager_is_trainer_row = manager_trainer_result.first()
-    manager_is_trainer = manager_is_trainer_row[0] if manager_is_trainer_row else False
-    
     # Step 1: Get all employee IDs and names reporting to the current manager
-    manager_relations_result = await db.execute(
-        select(ManagerEmployee.employee_empid, ManagerEmployee.employee_name).where(ManagerEmployee.manager_empid == manager_username)
-    )
-    team_members = manager_relations_result.all()
-    team_member_usernames = [member.employee_empid for member in team_members]
-    team_member_names = {member.employee_empid: member.employee_name for member in team_members}
+    team_members = org_entry.reports if org_entry else ()
+    team_member_usernames = [empid for empid, _ in team_members]
+    team_member_names = dict(team_members)
 
     # Step 2: Prepare the base structure for all team members, including 'additional_skills'
     team_members_data = {
@@ -124,9 +107,10 @@ async def get_manager_data(
 
     # Step 3: Fetch all CORE competency data for the team members in a single query
     competencies_result = await db.execute(
-        select(EmployeeCompetency).where(EmployeeCompetency.employee_empid.in_(team_member_usernames))
+        select(EmployeeCompetency.employee_empid, *SKILL_COLUMNS)
+        .where(EmployeeCompetency.employee_empid.in_(team_member_usernames))
     )
-    competencies_data = competencies_result.scalars().all()
+    competencies_data = competencies_result.all()
     
     # Step 4: Populate the CORE skills for each team member
     for competency in competencies_data:
@@ -144,9 +128,9 @@ async def get_manager_data(
     
     # Step 5: Fetch all ADDITIONAL skill data for the team in a single query
     additional_skills_result = await db.execute(
-        select(AdditionalSkill).where(AdditionalSkill.employee_empid.in_(team_member_usernames))
+        select(*ADDITIONAL_SKILL_COLUMNS).where(AdditionalSkill.employee_empid.in_(team_member_usernames))
     )
-    additional_skills_data = additional_skills_result.scalars().all()
+    additional_skills_data = additional_skills_result.all()
 
     # Step 6: Populate the ADDITIONAL skills for each team member
     for add_skill in additional_skills_data:
@@ -170,6 +154,25 @@ async def get_manager_data(
         "manager_is_trainer": manager_is_trainer
     }
 
+@router.get("/manager/coverage")
+async def get_team_coverage(
+    subtree: bool = False,
+    min_level: int = Query(3, ge=1, le=5, description="Level at which someone counts as covering a skill"),
+    limit: int = Query(200, ge=1, le=5000, description="Skills listed, most at risk first"),
+    current_user: dict = Depends(get_current_active_manager),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Skill coverage of the manager's team (or whole subtree): holders and bus
+    factor per skill, the next-best person for single-holder skills, and the
+    closest substitute for every member who is the sole holder of a skill.
+    """
+    team = await org_directory.team(db, current_user.get("username"), subtree)
+    snapshot = await people_index.get(db)
+    # Imported here so workers load numpy only when someone asks for coverage.
+    from app import coverage
+    return coverage.analyze(snapshot, team, min_level, limit)
+
 @router.get("/engineer")
 async def get_engineer_data(
     current_user: dict = Depends(get_current_active_user),
@@ -186,18 +189,12 @@ async def get_engineer_data(
             detail="You do not have permission to access this resource"
         )
 
-    # MODIFIED: Fetch employee's name and trainer status in one query
-    employee_details_result = await db.execute(
-        select(
-            ManagerEmployee.employee_name,
-            ManagerEmployee.employee_is_trainer
-        ).where(ManagerEmployee.employee_empid == employee_username)
-    )
-    employee_details = employee_details_result.first()
+    # Employee's name and trainer status from the org directory
+    org_entry = await org_directory.lookup(db, employee_username)
 
     # Safely unpack details, providing default values if the employee is not found
-    employee_name = employee_details.employee_name if employee_details else None
-    is_trainer = employee_details.employee_is_trainer if employee_details else False
+    employee_name = org_entry.employee_name if org_entry else None
+    is_trainer = org_entry.employee_is_trainer if org_entry else False
     
     # Fetch user ID
     user_id_result = await db.execute(
@@ -207,9 +204,9 @@ async def get_engineer_data(
 
     # Fetch employee's competencies
     competencies_result = await db.execute(
-        select(EmployeeCompetency).where(EmployeeCompetency.employee_empid == employee_username)
+        select(EmployeeCompetency.id, *SKILL_COLUMNS).where(EmployeeCompetency.employee_empid == employee_username)
     )
-    competencies_orm = competencies_result.scalars().all()
+    competencies_rows = competencies_result.all()
 
     skills_list = [
         {
@@ -219,7 +216,7 @@ async def get_engineer_data(
             "target_expertise": comp.target_expertise,
             "status": get_status_from_levels(comp.current_expertise, comp.target_expertise),
         }
-        for comp in competencies_orm
+        for comp in competencies_rows
     ]
 
     # MODIFIED: Added 'employee_is_trainer' to the response
@@ -242,14 +239,7 @@ async def update_team_member_skill(
     """
     try:
         # Verify the employee is part of the manager's team
-        team_check_result = await db.execute(
-            select(ManagerEmployee.employee_empid)
-            .where(
-                ManagerEmployee.manager_empid == current_manager['username'],
-                ManagerEmployee.employee_empid == skill_update.employee_username
-            )
-        )
-        if not team_check_result.first():
+        if not await org_directory.manages(db, current_manager['username'], skill_update.employee_username):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only update skills for your team members"
@@ -260,6 +250,20 @@ async def update_team_member_skill(
             skill_update.target_expertise
         )
 
+        # Lock the rows being changed and keep their old levels for the history log
+        previous_result = await db.execute(
+            select(
+                EmployeeCompetency.skill, EmployeeCompetency.skill_id, EmployeeCompetency.department,
+                EmployeeCompetency.current_expertise, EmployeeCompetency.target_expertise,
+            )
+            .where(
+                EmployeeCompetency.employee_empid == skill_update.employee_username,
+                EmployeeCompetency.skill == skill_update.skill_name
+            )
+            .with_for_update()
+        )
+        previous = previous_result.all()
+
         update_stmt = (
             update(EmployeeCompetency)
             .where(
@@ -279,6 +283,26 @@ async def update_team_member_skill(
                 detail="Skill not found for this employee"
             )
 
+        await skill_history.record_changes(
+            db,
+            [
+                skill_history.LevelChange(
+                    skill_update.employee_username, row.skill, row.skill_id, row.department,
+                    row.current_expertise, row.target_expertise,
+                    skill_update.current_expertise, skill_update.target_expertise,
+                )
+                for row in previous
+            ],
+            changed_by=current_manager['username'],
+            source="manager_update",
+        )
+        await events.publish(db, [skill_update.employee_username], "skill_updated", {
+            "skill_name": skill_update.skill_name,
+            "current_expertise": skill_update.current_expertise,
+            "target_expertise": skill_update.target_expertise,
+            "status": new_status,
+        })
+        await people_index.mark_dirty_on_commit(db, [skill_update.employee_username])
         await db.commit()
 
         return {
@@ -0,0 +1,47 @@
+# app/routes/event_routes.py
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app import config
+from app.auth_utils import get_current_stream_user
+from app.events import broker
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+def format_event(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(current_user: dict = Depends(get_current_stream_user)):
+    """
+    Server-sent events for the current user: assignment_created, skill_updated,
+    additional_skill_{created,updated,deleted} and additional_skills_batch.
+    A `ready` event is sent on connect and a `resync` event when events were
+    missed; on either, refetch.
+    EventSource cannot set headers, so the token may be passed as ?access_token=.
+    """
+    username = current_user.get("username")
+
+    async def event_source():
+        async with broker.subscribe(username) as queue:
+            yield f"retry: 5000\n{format_event('ready', {'user': username})}"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=config.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream.
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event["type"], event["data"])
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,182 @@
+# app/routes/export_routes.py
+
+import asyncio
+import csv
+import io
+import tempfile
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import EmployeeCompetency, ManagerEmployee
+from app.auth_utils import get_current_active_manager
+from app.routes.dashboard_routes import get_status_from_levels
+from app.taxonomy import skill_key
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+FETCH_SIZE = 1000       # rows per round trip from the server-side cursor
+CHUNK_SIZE = 64 * 1024  # bytes per chunk sent to the client
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def team_query(manager_empid: str, subtree: bool):
+    """The manager's direct reports, or everyone below them (recursive CTE)."""
+    team = (
+        select(ManagerEmployee.employee_empid, ManagerEmployee.employee_name)
+        .where(ManagerEmployee.manager_empid == manager_empid)
+    )
+    if not subtree:
+        return team.cte("team")
+    team = team.cte("team", recursive=True)
+    # UNION rather than UNION ALL, so a cycle in the org data terminates.
+    return team.union(
+        select(ManagerEmployee.employee_empid, ManagerEmployee.employee_name)
+        .join(team, ManagerEmployee.manager_empid == team.c.employee_empid)
+    )
+
+
+async def skill_columns(session, team) -> Tuple[List[str], Dict[str, int]]:
+    """Column headers, one per distinct skill in the team, and skill key -> column number."""
+    result = await session.execute(
+        select(EmployeeCompetency.skill).distinct()
+        .join(team, team.c.employee_empid == EmployeeCompetency.employee_empid)
+        .where(EmployeeCompetency.skill.isnot(None))
+    )
+    names: Dict[str, str] = {}
+    for (skill,) in result:
+        key = skill_key(skill)
+        if key and key not in names:
+            names[key] = skill.strip()
+    ordered = sorted(names, key=lambda key: names[key].casefold())
+    return [names[key] for key in ordered], {key: number for number, key in enumerate(ordered)}
+
+
+async def matrix_rows(manager_empid: str, subtree: bool) -> AsyncIterator[list]:
+    """
+    Yields the header and then one row per employee: id, name, and
+    current/target/status for every skill column. Competency rows come from a
+    server-side cursor ordered by employee, so only one employee is in memory.
+    """
+    # The request's session is closed before a streaming body is sent, so the
+    # export owns its session for as long as it streams.
+    async with AsyncSessionLocal() as session:
+        team = team_query(manager_empid, subtree)
+        skills, column_of = await skill_columns(session, team)
+
+        header = ["Employee ID", "Employee Name"]
+        for skill in skills:
+            header += [f"{skill} - Current", f"{skill} - Target", f"{skill} - Status"]
+        yield header
+
+        stream = await session.stream(
+            select(
+                team.c.employee_empid, team.c.employee_name, EmployeeCompetency.skill,
+                EmployeeCompetency.current_expertise, EmployeeCompetency.target_expertise,
+            )
+            .outerjoin(EmployeeCompetency, EmployeeCompetency.employee_empid == team.c.employee_empid)
+            .order_by(team.c.employee_empid, EmployeeCompetency.id)
+            .execution_options(yield_per=FETCH_SIZE)
+        )
+        # Few distinct skill names and level pairs, many rows: memoize both lookups.
+        columns: Dict[Optional[str], Optional[int]] = {}
+        statuses: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+        row: Optional[list] = None
+        current_empid = None
+        # partitions() fetches a batch per await instead of one row per await.
+        async for partition in stream.partitions(FETCH_SIZE):
+            for record in partition:
+                if record.employee_empid != current_empid:
+                    if row is not None:
+                        yield row
+                    current_empid = record.employee_empid
+                    row = [record.employee_empid, record.employee_name] + [None] * (3 * len(skills))
+                if record.skill not in columns:
+                    columns[record.skill] = column_of.get(skill_key(record.skill))
+                column = columns[record.skill]
+                if column is None:
+                    continue
+                levels = (record.current_expertise, record.target_expertise)
+                if levels not in statuses:
+                    statuses[levels] = get_status_from_levels(*levels)
+                offset = 2 + 3 * column
+                row[offset:offset + 3] = [record.current_expertise, record.target_expertise, statuses[levels]]
+        if row is not None:
+            yield row
+
+
+async def csv_chunks(rows: AsyncIterator[list]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    async for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _append_rows(worksheet, rows: List[list]) -> None:
+    for row in rows:
+        worksheet.append(row)
+
+
+async def xlsx_chunks(rows: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    """
+    Writes rows through openpyxl's write-only mode, which streams cells to a
+    temporary file instead of keeping the sheet in memory. Appending and
+    saving are CPU-bound, so they run in a worker thread, one batch at a time.
+    """
+    # Imported here so workers load openpyxl only when someone exports a workbook.
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Team Skills")
+    batch: List[list] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= FETCH_SIZE:
+            await asyncio.to_thread(_append_rows, worksheet, batch)
+            batch = []
+    if batch:
+        await asyncio.to_thread(_append_rows, worksheet, batch)
+
+    with tempfile.TemporaryFile() as output:
+        await asyncio.to_thread(workbook.save, output)
+        output.seek(0)
+        while True:
+            chunk = await asyncio.to_thread(output.read, CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _attachment(filename: str) -> Dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+@router.get("/team-skills.csv")
+async def export_team_skills_csv(
+    subtree: bool = False,
+    current_user: dict = Depends(get_current_active_manager)
+):
+    """
+    The team's skill matrix as CSV: one row per employee, current/target/status
+    columns per skill. With subtree=true, includes everyone below the manager.
+    """
+    rows = matrix_rows(current_user.get("username"), subtree)
+    return StreamingResponse(csv_chunks(rows), media_type="text/csv", headers=_attachment("team-skills.csv"))
+
+
+@router.get("/team-skills.xlsx")
+async def export_team_skills_xlsx(
+    subtree: bool = False,
+    current_user: dict = Depends(get_current_active_manager)
+):
+    """The same skill matrix as an Excel workbook."""
+    rows = matrix_rows(current_user.get("username"), subtree)
+    return StreamingResponse(xlsx_chunks(rows), media_type=XLSX_MEDIA_TYPE, headers=_attachment("team-skills.xlsx"))
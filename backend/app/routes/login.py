@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.database import get_db_async
-from app.models import User, ManagerEmployee
+from app.models import User
 from app.auth_utils import verify_password, create_access_token
 from app.schemas import UserLogin
+from app.org_directory import org_directory
 
 router = APIRouter()
 
@@ -17,19 +18,10 @@ async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db_async)):
     if not user or not verify_password(user_data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    # Determine role from manager_employee table
-    role = "employee"
-    manager_check = await db.execute(
-        select(ManagerEmployee).where(ManagerEmployee.manager_empid == user_data.username)
-    )
-    if manager_check.scalars().first():
-        role = "manager"
-
-    # Fetch employee name to add to the token
-    name_result = await db.execute(
-        select(ManagerEmployee.employee_name).where(ManagerEmployee.employee_empid == user_data.username)
-    )
-    employee_name = name_result.scalar_one_or_none()
+    # Determine role and employee name from the org directory
+    org_entry = await org_directory.lookup(db, user_data.username)
+    role = "manager" if org_entry and org_entry.is_manager else "employee"
+    employee_name = org_entry.employee_name if org_entry else None
 
     # Create token with username, role, and employee_name
     token = create_access_token({"sub": user_data.username, "role": role, "employee_name": employee_name})
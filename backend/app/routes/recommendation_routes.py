@@ -0,0 +1,102 @@
+# app/routes/recommendation_routes.py
+
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database import get_db_async
+from app.models import EmployeeCompetency, TrainingAssignment
+from app.auth_utils import get_current_active_user, get_current_active_manager
+from app.recommendations import gaps_from_rows, recommend, training_catalog_index
+from app.org_directory import org_directory
+
+router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
+
+
+async def load_gaps_and_assignments(db: AsyncSession, empids: List[str]):
+    """Gap rows and already-assigned training ids for all given employees, in two queries."""
+    competency_result = await db.execute(
+        select(
+            EmployeeCompetency.employee_empid, EmployeeCompetency.skill, EmployeeCompetency.competency,
+            EmployeeCompetency.current_expertise, EmployeeCompetency.target_expertise,
+        ).where(EmployeeCompetency.employee_empid.in_(empids))
+    )
+    gaps = gaps_from_rows(competency_result)
+
+    assignment_result = await db.execute(
+        select(TrainingAssignment.employee_empid, TrainingAssignment.training_id)
+        .where(TrainingAssignment.employee_empid.in_(empids))
+    )
+    assigned: Dict[str, Set[int]] = defaultdict(set)
+    for empid, training_id in assignment_result:
+        assigned[empid].add(training_id)
+    return gaps, assigned
+
+
+@router.get("/me")
+async def get_my_recommendations(
+    per_gap: int = Query(3, ge=1, le=20),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Upcoming trainings for each of the current user's competency gaps,
+    ranked by level fit and date.
+    """
+    username = current_user.get("username")
+    snapshot = await training_catalog_index.get(db)
+    gaps, assigned = await load_gaps_and_assignments(db, [username])
+    recommendations = recommend(snapshot, gaps, assigned, per_gap)
+
+    return {"employee_empid": username, "gaps": recommendations.get(username, [])}
+
+
+@router.get("/team")
+async def get_team_recommendations(
+    per_gap: int = Query(3, ge=1, le=20),
+    current_user: dict = Depends(get_current_active_manager),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Recommendations for every direct report of the current manager, computed
+    in one pass, plus the trainings that would close gaps for the most people.
+    """
+    manager_username = current_user.get("username")
+    team = await org_directory.reports(db, manager_username)
+    if not team:
+        return {"team": [], "top_trainings": []}
+
+    snapshot = await training_catalog_index.get(db)
+    gaps, assigned = await load_gaps_and_assignments(db, [member.employee_empid for member in team])
+    recommendations = recommend(snapshot, gaps, assigned, per_gap)
+
+    # How many team members each recommended training would help.
+    reach: Dict[int, dict] = {}
+    for empid, employee_gaps in recommendations.items():
+        for gap in employee_gaps:
+            for training in gap["trainings"]:
+                entry = reach.setdefault(training["training_id"], {
+                    "training_id": training["training_id"],
+                    "training_name": training["training_name"],
+                    "training_date": training["training_date"],
+                    "employees": set(),
+                })
+                entry["employees"].add(empid)
+    top_trainings = sorted(reach.values(), key=lambda t: (-len(t["employees"]), t["training_date"]))
+    for entry in top_trainings:
+        entry["employees"] = sorted(entry["employees"])
+
+    return {
+        "team": [
+            {
+                "employee_empid": member.employee_empid,
+                "employee_name": member.employee_name,
+                "gaps": recommendations.get(member.employee_empid, []),
+            }
+            for member in team
+        ],
+        "top_trainings": top_trainings[:20],
+    }
@@ -0,0 +1,55 @@
+# app/routes/search_routes.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db_async
+from app.auth_utils import get_current_active_manager
+from app.people_index import people_index, search
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("/people")
+async def search_people(
+    skill: str = Query(..., min_length=1),
+    min_level: int = Query(1, ge=0, le=5),
+    division: Optional[str] = None,
+    department: Optional[str] = None,
+    project: Optional[str] = None,
+    manager: Optional[str] = Query(None, description="Only people in this manager's subtree"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: dict = Depends(get_current_active_manager),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    People across the org holding `skill` at `min_level` or above, optionally
+    within a division, department, project or manager subtree. Ranked by
+    level, then manager-assessed competencies before self-reported skills.
+    """
+    snapshot = await people_index.get(db)
+    matches = search(
+        snapshot, skill, min_level,
+        division=division, department=department, project=project, manager_empid=manager,
+    )
+    page = matches[offset:offset + limit]
+    return {
+        "total": len(matches),
+        "next_offset": offset + limit if offset + limit < len(matches) else None,
+        "items": [
+            {
+                "employee_empid": person.empid,
+                "employee_name": person.name,
+                "division": person.division,
+                "department": person.department,
+                "project": person.project,
+                "skill": holding.skill,
+                "level": holding.level,
+                "expertise": holding.expertise,
+                "source": holding.source,
+            }
+            for person, holding in page
+        ],
+    }
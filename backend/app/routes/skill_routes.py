@@ -0,0 +1,24 @@
+# app/routes/skill_routes.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db_async
+from app.auth_utils import get_current_active_user
+from app.taxonomy import skill_suggest_index
+
+router = APIRouter(prefix="/skills", tags=["Skills"])
+
+@router.get("/suggest")
+async def suggest_skills(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Autocomplete over the skill dictionary. Matches the start of a skill name,
+    of any later word in it, or of a known alternative spelling.
+    """
+    suggestions = await skill_suggest_index.suggest(db, prefix, limit)
+    return [suggestion._asdict() for suggestion in suggestions]
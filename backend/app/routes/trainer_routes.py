@@ -0,0 +1,27 @@
+# app/routes/trainer_routes.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db_async
+from app.auth_utils import get_current_active_user
+from app.trainer_directory import trainer_directory
+
+router = APIRouter(prefix="/trainers", tags=["Trainers"])
+
+@router.get("/")
+async def find_trainers(
+    skill: Optional[str] = None,
+    competency: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Trainers for a skill and/or competency, highest expertise level first.
+    Entries matched to an employee flagged as trainer carry their empid.
+    """
+    trainers = await trainer_directory.find(db, skill=skill, competency=competency)
+    return trainers[:limit]
@@ -1,26 +1,85 @@
 # backend/app/routes/training_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import binascii
+import json
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import func, literal, literal_column, or_, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List
+from typing import List, Optional, Tuple
 
+from app import cache, http_cache, invalidation, schedule, versions
 from app.database import get_db_async
-from app.models import TrainingDetail, User, ManagerEmployee
-from app.schemas import TrainingCreate, TrainingResponse
+from app.models import TrainingDetail, User
+from app.schemas import TrainingCreate, TrainingResponse, TrainingPage, TrainingSearchResult
 from app.auth_utils import get_current_active_user
+from app.trainer_directory import trainer_directory
+from app.parsing import parse_seats, training_window
 
 router = APIRouter(prefix="/trainings", tags=["Trainings"])
 
+# Catalog totals per filter combination; flushed whenever the catalog changes.
+catalog_count_cache = cache.register("catalog", cache.TTLCache(ttl_seconds=300))
+# Pre-rendered GET /trainings/ bodies keyed by catalog version
+catalog_bodies = cache.register("catalog", cache.TTLCache(ttl_seconds=3600, max_entries=4))
+
+CATALOG_ORDER = (TrainingDetail.training_date.desc(), TrainingDetail.id.desc())
+# The columns TrainingResponse serializes. Catalog reads select these as plain
+# rows instead of hydrating TrainingDetail entities.
+TRAINING_COLUMNS = tuple(getattr(TrainingDetail, field) for field in TrainingResponse.model_fields)
+
+
+def encode_cursor(training_date: Optional[date], training_id: int) -> str:
+    raw = json.dumps([training_date.isoformat() if training_date else None, training_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[date], int]:
+    try:
+        training_date, training_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (date.fromisoformat(training_date) if training_date else None), int(training_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def count_trainings(db: AsyncSession, filters: list, filter_key: tuple) -> Tuple[int, bool]:
+    """
+    Returns (total, is_estimate). The unfiltered total comes from the planner's
+    row estimate on Postgres; filtered totals are counted once and cached.
+    """
+    cached = catalog_count_cache.get(filter_key)
+    if cached is not None:
+        return cached
+
+    counted = None
+    if not filters and db.bind.dialect.name == "postgresql":
+        estimate = (await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'training_details'::regclass")
+        )).scalar()
+        # reltuples is -1 until the table has been analyzed
+        if estimate is not None and estimate >= 0:
+            counted = (int(estimate), True)
+    if counted is None:
+        total = (await db.execute(select(func.count()).select_from(TrainingDetail).where(*filters))).scalar_one()
+        counted = (total, False)
+
+    catalog_count_cache.set(filter_key, counted)
+    return counted
+
 @router.post("/", response_model=TrainingResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_training(
     training_data: TrainingCreate,
+    allow_conflicts: bool = False,
     db: AsyncSession = Depends(get_db_async),
     current_user: dict = Depends(get_current_active_user)
 ):
     """
     Endpoint for a designated trainer to create a new training module.
-    It verifies the user's trainer status before proceeding.
+    It verifies the user's trainer status before proceeding. A training that
+    overlaps one the trainer teaches or attends is refused with 409 and the
+    conflicting trainings, unless allow_conflicts=true.
     """
     current_username = current_user.get("username")
     if not current_username:
@@ -29,22 +88,8 @@ async def create_new_training(
             detail="Could not validate credentials",
         )
 
-    stmt = select(ManagerEmployee).where(
-        (ManagerEmployee.manager_empid == current_username) | 
-        (ManagerEmployee.employee_empid == current_username)
-    )
-    result = await db.execute(stmt)
-    
-    # CORRECTED: .scalars().first() correctly handles cases where a user (manager)
-    # might appear in multiple rows. It safely gets the first match or None.
-    relation = result.scalars().first()
-
-    is_trainer = False
-    if relation:
-        if relation.manager_empid == current_username and relation.manager_is_trainer:
-            is_trainer = True
-        elif relation.employee_empid == current_username and relation.employee_is_trainer:
-            is_trainer = True
+    # Read from manager_employee, so a flag change applies immediately
+    is_trainer = await trainer_directory.is_trainer(db, current_username)
 
     if not is_trainer:
         raise HTTPException(
@@ -52,13 +97,30 @@ async def create_new_training(
             detail="Only designated trainers can create new training modules."
         )
 
+    starts_at, ends_at = training_window(training_data.training_date, training_data.time, training_data.duration)
+    if starts_at is not None:
+        await schedule.lock_schedules(db, [current_username])
+        conflicts = await schedule.find_conflicts(db, [current_username], starts_at, ends_at)
+        if conflicts and not allow_conflicts:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "The trainer is already booked at this time", "conflicts": conflicts[current_username]},
+            )
+
     new_training = TrainingDetail(
         **training_data.dict(),
+        seat_capacity=parse_seats(training_data.seats),
+        starts_at=starts_at,
+        ends_at=ends_at,
         trainer_name=current_username,
+        trainer_empid=current_username,
         email=current_username
     )
 
     db.add(new_training)
+    await versions.bump(db, [versions.CATALOG])
+    await invalidation.publish(db, topics=["catalog"])
     await db.commit()
     await db.refresh(new_training)
 
@@ -66,19 +128,136 @@ async def create_new_training(
 
 @router.get("/", response_model=List[TrainingResponse])
 async def get_all_trainings(
+    request: Request,
     db: AsyncSession = Depends(get_db_async),
     current_user: dict = Depends(get_current_active_user) 
 ):
     """
     Fetches all training details for the Training Catalog.
+    The body is rendered (and compressed) once per catalog version; a request
+    whose If-None-Match still matches gets a 304 without a query.
     """
     if not current_user.get("username"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials for fetching trainings",
         )
-        
-    result = await db.execute(select(TrainingDetail).order_by(TrainingDetail.training_date.desc()))
-    trainings = result.scalars().all()
-    return trainings
 
+    version = await versions.get_version(db, versions.CATALOG)
+    tag = f"catalog-{version.number}"
+    if http_cache.is_fresh(request, tag, version.updated_at):
+        return http_cache.not_modified(request, tag, version.updated_at)
+
+    rendered = catalog_bodies.get(version.number)
+    if rendered is None:
+        result = await db.execute(select(*TRAINING_COLUMNS).order_by(TrainingDetail.training_date.desc()))
+        trainings = result.all()
+        rendered = http_cache.render([TrainingResponse.model_validate(training) for training in trainings])
+        catalog_bodies.set(version.number, rendered)
+    return http_cache.respond(request, rendered, tag, version.updated_at)
+
+@router.get("/catalog", response_model=TrainingPage)
+async def get_training_catalog_page(
+    division: Optional[str] = None,
+    department: Optional[str] = None,
+    competency: Optional[str] = None,
+    skill: Optional[str] = None,
+    skill_category: Optional[str] = None,
+    training_type: Optional[str] = None,
+    trainer: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_async),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    One page of the Training Catalog, newest first, with server-side filters.
+    Pass the returned `next_cursor` back as `cursor` to get the following page.
+    """
+    equality_filters = {
+        "division": division,
+        "department": department,
+        "competency": competency,
+        "skill": skill,
+        "skill_category": skill_category,
+        "training_type": training_type,
+        "trainer_name": trainer,
+    }
+    filters = [getattr(TrainingDetail, column) == value for column, value in equality_filters.items() if value is not None]
+    if date_from:
+        filters.append(TrainingDetail.training_date >= date_from)
+    if date_to:
+        filters.append(TrainingDetail.training_date <= date_to)
+
+    async def fetch(conditions: list, count: int) -> list:
+        result = await db.execute(
+            select(*TRAINING_COLUMNS).where(*filters, *conditions).order_by(*CATALOG_ORDER).limit(count)
+        )
+        return list(result.all())
+
+    cursor_date, cursor_id = decode_cursor(cursor) if cursor else (None, None)
+
+    # Dated and undated trainings are walked as two separate index range scans
+    # (dated first), so each page stays a plain seek.
+    items = []
+    if cursor is None or cursor_date is not None:
+        dated = [TrainingDetail.training_date.isnot(None)]
+        if cursor_date is not None:
+            dated.append(tuple_(TrainingDetail.training_date, TrainingDetail.id) < tuple_(cursor_date, cursor_id))
+        items = await fetch(dated, limit + 1)
+    # Undated trainings can never match a date range.
+    if len(items) <= limit and not (date_from or date_to):
+        undated = [TrainingDetail.training_date.is_(None)]
+        if cursor is not None and cursor_date is None:
+            undated.append(TrainingDetail.id < cursor_id)
+        items += await fetch(undated, limit + 1 - len(items))
+
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_cursor = encode_cursor(items[-1].training_date, items[-1].id) if has_more else None
+
+    filter_key = tuple(sorted((k, v) for k, v in {**equality_filters, "date_from": date_from, "date_to": date_to}.items() if v is not None))
+    total, total_is_estimate = await count_trainings(db, filters, filter_key)
+
+    return {"items": items, "next_cursor": next_cursor, "total": total, "total_is_estimate": total_is_estimate}
+
+@router.get("/search", response_model=List[TrainingSearchResult])
+async def search_trainings(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db_async),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Ranked catalog search over training name, topics, skill, competency and
+    prerequisites. Full-text matches use the GIN-indexed search_vector column;
+    trigram word similarity on name and skill catches typos ("kubernets").
+    """
+    # search_vector is maintained by Postgres (migration 3) and deliberately not
+    # mapped on the model, so regular catalog reads never load it.
+    search_vector = literal_column("training_details.search_vector")
+    ts_query = func.websearch_to_tsquery("english", q)
+    similarity = func.greatest(
+        func.word_similarity(q, TrainingDetail.training_name),
+        func.word_similarity(q, func.coalesce(TrainingDetail.skill, "")),
+    )
+    rank = (func.ts_rank_cd(search_vector, ts_query) + similarity).label("rank")
+
+    stmt = (
+        select(*TRAINING_COLUMNS, rank)
+        .where(or_(
+            search_vector.op("@@")(ts_query),
+            literal(q).op("<%")(TrainingDetail.training_name),
+            literal(q).op("<%")(TrainingDetail.skill),
+        ))
+        .order_by(rank.desc(), TrainingDetail.training_date.desc(), TrainingDetail.id.desc())
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+
+    return [
+        TrainingSearchResult(**TrainingResponse.model_validate(row).model_dump(), rank=round(row.rank, 4))
+        for row in result.all()
+    ]
@@ -0,0 +1,75 @@
+# app/routes/trend_routes.py
+
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import skill_history
+from app.database import get_db_async
+from app.org_directory import org_directory
+from app.auth_utils import get_current_active_user, get_current_active_manager
+
+router = APIRouter(prefix="/trends", tags=["Trends"])
+
+MAX_BUCKETS = 260  # five years of weeks
+GRANULARITY = Query("month", pattern="^(week|month)$")
+
+
+def _range(start: Optional[date], end: Optional[date], granularity: str):
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    days_per_bucket = 7 if granularity == "week" else 28
+    if (end - start).days // days_per_bucket > MAX_BUCKETS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {MAX_BUCKETS} buckets per request")
+    return start, end
+
+
+async def _trend(db: AsyncSession, scope_kind: str, scope_id: str, granularity: str, start, end) -> dict:
+    start, end = _range(start, end, granularity)
+    buckets = await skill_history.trend(db, scope_kind, scope_id, granularity, start, end)
+    return {"scope": scope_kind, "id": scope_id, "granularity": granularity, "buckets": buckets}
+
+
+@router.get("/employee/{empid}")
+async def employee_trend(
+    empid: str,
+    granularity: str = GRANULARITY,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """An employee's average level and gap per week or month. Visible to the employee and their managers."""
+    username = current_user.get("username")
+    if empid != username and not await org_directory.manages(db, username, empid):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this employee's trend")
+    return await _trend(db, "employee", empid, granularity, start, end)
+
+
+@router.get("/team")
+async def team_trend(
+    granularity: str = GRANULARITY,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: dict = Depends(get_current_active_manager),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """The manager's direct reports, averaged over all their rated skills."""
+    return await _trend(db, "team", current_user.get("username"), granularity, start, end)
+
+
+@router.get("/department/{department}")
+async def department_trend(
+    department: str,
+    granularity: str = GRANULARITY,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: dict = Depends(get_current_active_manager),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """A department's average level and gap per week or month."""
+    return await _trend(db, "department", department, granularity, start, end)
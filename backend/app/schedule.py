@@ -0,0 +1,87 @@
+# app/schedule.py
+"""
+Schedule conflicts between trainings.
+
+A training occupies [starts_at, ends_at), parsed from its date, time and
+duration at ingest (parsing.training_window). A person is busy during the
+trainings they hold a seat in and the ones they teach, matched on the
+trainer's employee id resolved at ingest (`trainer_empid`). Overlap is tested
+against the GiST index on tsrange(starts_at, ends_at) (migration 9), so a
+check is an index probe for the trainings in that window, however long
+anyone's schedule is, and one statement covers any number of people.
+
+Two requests can each find a free slot and then book it. Callers therefore
+take `lock_schedules` on everyone involved first. It takes per-person
+advisory locks, which are held until the transaction ends.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# The overlap predicate matches the expression index exactly; a training with
+# no date has NULL bounds and must not read as the unbounded range.
+_OVERLAPS = (
+    "t.starts_at IS NOT NULL AND t.id <> :training_id "
+    "AND tsrange(t.starts_at, t.ends_at) && tsrange(:starts_at, :ends_at)"
+)
+
+CONFLICTS_SQL = text(f"""
+    SELECT a.employee_empid AS empid, t.id AS training_id, t.training_name, t.starts_at, t.ends_at,
+           'attending' AS role
+    FROM training_details t
+    JOIN training_assignments a
+      ON a.training_id = t.id AND a.status = 'assigned' AND a.employee_empid = ANY(CAST(:empids AS text[]))
+    WHERE {_OVERLAPS}
+    UNION ALL
+    SELECT t.trainer_empid, t.id, t.training_name, t.starts_at, t.ends_at, 'teaching'
+    FROM training_details t
+    WHERE t.trainer_empid = ANY(CAST(:empids AS text[])) AND {_OVERLAPS}
+    ORDER BY 1, 4
+""")
+
+# Sorted, so two requests locking overlapping sets can't deadlock.
+LOCK_SCHEDULES_SQL = text("""
+    SELECT pg_advisory_xact_lock(hashtext('schedule:' || ordered.empid))
+    FROM (SELECT DISTINCT empid FROM unnest(CAST(:empids AS text[])) AS empid ORDER BY empid) AS ordered
+""")
+
+
+async def lock_schedules(db: AsyncSession, empids: Iterable[str]) -> None:
+    """Serializes schedule changes for these people until the transaction ends."""
+    empids = list(empids)
+    if empids:
+        await db.execute(LOCK_SCHEDULES_SQL, {"empids": empids})
+
+
+async def find_conflicts(
+    db: AsyncSession,
+    empids: Iterable[str],
+    starts_at: Optional[datetime],
+    ends_at: Optional[datetime],
+    exclude_training_id: Optional[int] = None,
+) -> Dict[str, List[dict]]:
+    """empid -> the trainings it attends or teaches that overlap [starts_at, ends_at)."""
+    empids = list(empids)
+    if not empids or starts_at is None or ends_at is None:
+        return {}
+    result = await db.execute(CONFLICTS_SQL, {
+        "empids": empids,
+        "starts_at": starts_at,
+        "ends_at": ends_at,
+        # ids are positive, so 0 excludes nothing
+        "training_id": exclude_training_id or 0,
+    })
+    conflicts: Dict[str, List[dict]] = defaultdict(list)
+    for row in result:
+        conflicts[row.empid].append({
+            "training_id": row.training_id,
+            "training_name": row.training_name,
+            "starts_at": row.starts_at.isoformat(),
+            "ends_at": row.ends_at.isoformat(),
+            "role": row.role,
+        })
+    return dict(conflicts)
@@ -2,7 +2,7 @@
 
 from pydantic import BaseModel, Field
 from datetime import datetime, date
-from typing import Optional
+from typing import List, Optional
 
 class UserRegister(BaseModel):
     emp_id: str
@@ -30,12 +30,34 @@ class AdditionalSkillUpdate(AdditionalSkillBase):
 class AdditionalSkillResponse(AdditionalSkillBase):
     id: int
     employee_empid: str
+    skill_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
 
+class AdditionalSkillBatchUpdate(AdditionalSkillUpdate):
+    id: int
+
+class AdditionalSkillBatch(BaseModel):
+    creates: List[AdditionalSkillCreate] = Field(default_factory=list, max_length=500)
+    updates: List[AdditionalSkillBatchUpdate] = Field(default_factory=list, max_length=500)
+    deletes: List[int] = Field(default_factory=list, max_length=500)
+
+class AdditionalSkillBatchResult(BaseModel):
+    # op is create/update/delete; index is the item's position in its list
+    op: str
+    index: int
+    status: str  # created, updated, deleted, duplicate, not_found
+    skill: Optional[AdditionalSkillResponse] = None
+
+class AdditionalSkillBatchResponse(BaseModel):
+    results: List[AdditionalSkillBatchResult]
+    created: int
+    updated: int
+    deleted: int
+
 # --- Schemas for Training Feature ---
 
 # CORRECTED: Added all the fields sent by the Angular form to match the request
@@ -59,6 +81,18 @@ class TrainingResponse(TrainingCreate):
     id: int
     trainer_name: Optional[str] = None 
     email: Optional[str] = None
+    # Parsed from training_date, time and duration; None when undated
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class TrainingPage(BaseModel):
+    items: List[TrainingResponse]
+    next_cursor: Optional[str] = None
+    total: int
+    total_is_estimate: bool = False
+
+class TrainingSearchResult(TrainingResponse):
+    rank: float
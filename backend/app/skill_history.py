@@ -0,0 +1,210 @@
+# app/skill_history.py
+"""
+Skill-level history and trend rollups.
+
+Every competency level change is appended to `skill_level_history` in the
+transaction that makes it. The same call adds the change's effect to
+`skill_trend_rollup` for the employee, their manager's team and their
+department, per week and per month: the delta of the summed current level,
+the summed gap to target and the number of rated skills. The state at any
+bucket is the running sum of those deltas, so a year of monthly trend is a
+dozen rollup rows plus one baseline sum, whatever the size of the history.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import cache
+from app.levels import parse_level
+from app.models import SkillLevelHistory, SkillTrendRollup
+from app.org_directory import org_directory
+
+GRANULARITIES = ("week", "month")
+UPSERT_BATCH = 2000  # rollup rows per statement (8 parameters each)
+
+
+class LevelChange(NamedTuple):
+    employee_empid: str
+    skill: Optional[str]
+    skill_id: Optional[int]
+    department: Optional[str]
+    previous_current_expertise: Optional[str]
+    previous_target_expertise: Optional[str]
+    current_expertise: Optional[str]
+    target_expertise: Optional[str]
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return month_start(day)
+
+
+def next_bucket(day: date, granularity: str) -> date:
+    return day + timedelta(days=7) if granularity == "week" else next_month(day)
+
+
+def _contribution(current: Optional[str], target: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(level, gap) a rating adds to the sums, or None if it has no usable current level."""
+    level = parse_level(current) if current else None
+    if level is None:
+        return None
+    target_level = parse_level(target) if target else None
+    return level, max(target_level - level, 0) if target_level is not None else 0
+
+
+# --- Partitions ---
+
+_partitions_ready: Set[date] = set()
+
+
+def partition_name(month: date) -> str:
+    return f"skill_level_history_y{month.year}m{month.month:02d}"
+
+
+async def ensure_partition(db, month: date) -> None:
+    """
+    Creates the monthly partition on Postgres if this worker hasn't seen it yet.
+    The CREATE is part of the caller's transaction, so the month only counts
+    as ready once that commits; after a rollback the next write retries it.
+    """
+    if month in _partitions_ready:
+        return
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF skill_level_history "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        ))
+    cache.call_on_commit(db, lambda: _partitions_ready.add(month))
+
+
+# --- Writes ---
+
+async def record_changes(
+    db: AsyncSession,
+    changes: Iterable[LevelChange],
+    changed_by: Optional[str],
+    source: str,
+    recorded_at: Optional[datetime] = None,
+) -> None:
+    """Appends the changes to the history and folds them into the rollups, in the caller's transaction."""
+    changes = list(changes)
+    if not changes:
+        return
+    recorded_at = recorded_at or datetime.utcnow()
+    await ensure_partition(db, month_start(recorded_at.date()))
+
+    # Step 1: history rows (one executemany)
+    await db.execute(insert(SkillLevelHistory), [
+        {**change._asdict(), "recorded_at": recorded_at, "changed_by": changed_by, "source": source}
+        for change in changes
+    ])
+
+    # Step 2: each employee's managers, for the team scope
+    managers = await org_directory.managers_of(db, {change.employee_empid for change in changes})
+
+    # Step 3: deltas, summed per rollup row so the upsert touches each row once
+    deltas: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    for change in changes:
+        before = _contribution(change.previous_current_expertise, change.previous_target_expertise)
+        after = _contribution(change.current_expertise, change.target_expertise)
+        level_delta = (after[0] if after else 0) - (before[0] if before else 0)
+        gap_delta = (after[1] if after else 0) - (before[1] if before else 0)
+        count_delta = (after is not None) - (before is not None)
+
+        scopes = [("employee", change.employee_empid)]
+        scopes += [("team", manager_empid) for manager_empid in managers.get(change.employee_empid, ())]
+        if change.department:
+            scopes.append(("department", change.department))
+        for scope_kind, scope_id in scopes:
+            for granularity in GRANULARITIES:
+                key = (scope_kind, scope_id, granularity, bucket_start(recorded_at.date(), granularity))
+                totals = deltas[key]
+                totals[0] += level_delta
+                totals[1] += gap_delta
+                totals[2] += count_delta
+                totals[3] += 1
+
+    # Step 4: upserts that add the deltas to existing rollup rows, batched
+    # to stay under the driver's bind parameter limit
+    rows = [
+        {
+            "scope_kind": scope_kind, "scope_id": scope_id, "granularity": granularity, "bucket_start": bucket,
+            "level_sum_delta": level, "gap_sum_delta": gap, "skill_count_delta": count, "changes": changed,
+        }
+        for (scope_kind, scope_id, granularity, bucket), (level, gap, count, changed) in deltas.items()
+    ]
+    for offset in range(0, len(rows), UPSERT_BATCH):
+        statement = pg_insert(SkillTrendRollup).values(rows[offset:offset + UPSERT_BATCH])
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=["scope_kind", "scope_id", "granularity", "bucket_start"],
+            set_={
+                column: getattr(SkillTrendRollup, column) + getattr(statement.excluded, column)
+                for column in ("level_sum_delta", "gap_sum_delta", "skill_count_delta", "changes")
+            },
+        ))
+
+
+# --- Reads ---
+
+async def trend(
+    db: AsyncSession, scope_kind: str, scope_id: str, granularity: str, start: date, end: date
+) -> List[dict]:
+    """Average level and gap per bucket from `start` to `end`, read from the rollups only."""
+    start, end = bucket_start(start, granularity), bucket_start(end, granularity)
+    scope = (
+        SkillTrendRollup.scope_kind == scope_kind,
+        SkillTrendRollup.scope_id == scope_id,
+        SkillTrendRollup.granularity == granularity,
+    )
+    baseline_result = await db.execute(
+        select(
+            func.coalesce(func.sum(SkillTrendRollup.level_sum_delta), 0),
+            func.coalesce(func.sum(SkillTrendRollup.gap_sum_delta), 0),
+            func.coalesce(func.sum(SkillTrendRollup.skill_count_delta), 0),
+        ).where(*scope, SkillTrendRollup.bucket_start < start)
+    )
+    level_sum, gap_sum, skill_count = baseline_result.one()
+
+    rows_result = await db.execute(
+        select(
+            SkillTrendRollup.bucket_start, SkillTrendRollup.level_sum_delta, SkillTrendRollup.gap_sum_delta,
+            SkillTrendRollup.skill_count_delta, SkillTrendRollup.changes,
+        )
+        .where(*scope, SkillTrendRollup.bucket_start >= start, SkillTrendRollup.bucket_start <= end)
+    )
+    in_range = {row.bucket_start: row for row in rows_result}
+
+    buckets = []
+    bucket = start
+    while bucket <= end:
+        row = in_range.get(bucket)
+        changes = 0
+        if row is not None:
+            level_sum += row.level_sum_delta
+            gap_sum += row.gap_sum_delta
+            skill_count += row.skill_count_delta
+            changes = row.changes
+        buckets.append({
+            "bucket_start": bucket.isoformat(),
+            "average_level": round(level_sum / skill_count, 2) if skill_count else None,
+            "average_gap": round(gap_sum / skill_count, 2) if skill_count else None,
+            "rated_skills": skill_count,
+            "changes": changes,
+        })
+        bucket = next_bucket(bucket, granularity)
+    return buckets
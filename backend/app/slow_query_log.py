@@ -0,0 +1,172 @@
+# app/slow_query_log.py
+"""
+Records statements issued through the async engine that take longer than
+SLOW_QUERY_THRESHOLD_MS, together with the names and types of their
+parameters, the calling route and an EXPLAIN plan captured in the background.
+Parameter values are stored only with SLOW_QUERY_LOG_VALUES, and then still
+redacted for known secret columns.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app import config, profiling
+from app.request_context import get_current_route
+
+logger = logging.getLogger(__name__)
+
+# With SLOW_QUERY_LOG_VALUES, bound parameters for these columns are still
+# never stored (users.hashed_password).
+REDACTED_COLUMNS = ("hashed_password",)
+REDACTED = "***"
+
+# Only plain DML/queries can be explained; EXPLAIN without ANALYZE never executes them.
+EXPLAINABLE_PREFIXES = ("select", "with", "insert", "update", "delete")
+
+_SKIP_OPTION = "skip_slow_query_log"
+_START_TIME_KEY = "slow_query_log_start"
+
+_entries: deque = deque(maxlen=config.SLOW_QUERY_LOG_SIZE)
+_entry_ids = itertools.count(1)
+_engine: Optional[AsyncEngine] = None
+_pending_plans: set = set()
+# Never run more than a couple of EXPLAINs at once, so a burst of slow
+# statements cannot exhaust the connection pool.
+_explain_slots: Optional[asyncio.Semaphore] = None
+
+
+def install(engine: AsyncEngine) -> None:
+    """Attaches the slow-query hooks to the given async engine."""
+    global _engine
+    _engine = engine
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def get_entries(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Returns the logged statements, newest first."""
+    entries = list(reversed(_entries))
+    return entries[:limit] if limit else entries
+
+
+def clear() -> None:
+    _entries.clear()
+
+
+def _type_name(value) -> str:
+    return "NULL" if value is None else type(value).__name__
+
+
+def _describe_parameters(parameters, context):
+    """Parameter names (or positions) and value types, without the values."""
+    compiled_params = getattr(context, "compiled_parameters", None) if context is not None else None
+    if compiled_params:
+        parameters = compiled_params
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {key: _type_name(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and all(isinstance(params, (dict, list, tuple)) for params in parameters):
+            return [_describe_parameters(params, None) for params in parameters]
+        return [_type_name(value) for value in parameters]
+    return _type_name(parameters)
+
+
+def _redact_parameters(statement: str, parameters, context):
+    compiled_params = getattr(context, "compiled_parameters", None) if context is not None else None
+    if compiled_params:
+        return [
+            {
+                key: REDACTED if key.startswith(REDACTED_COLUMNS) else value
+                for key, value in params.items()
+            }
+            for params in compiled_params
+        ]
+    # Raw driver SQL has no bind names, so hide all parameters
+    # when the statement touches a redacted column.
+    if any(column in statement for column in REDACTED_COLUMNS):
+        return REDACTED
+    return parameters
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info[_START_TIME_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = conn.info.pop(_START_TIME_KEY, None)
+    if start_time is None:
+        return
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    profiling.record_statement(statement, elapsed_ms)
+    if elapsed_ms < config.SLOW_QUERY_THRESHOLD_MS:
+        return
+    if context is not None and context.execution_options.get(_SKIP_OPTION):
+        return
+
+    entry = {
+        "id": next(_entry_ids),
+        "logged_at": datetime.utcnow().isoformat(),
+        "duration_ms": round(elapsed_ms, 2),
+        "statement": statement,
+        "parameters": (
+            _redact_parameters(statement, parameters, context) if config.SLOW_QUERY_LOG_VALUES
+            else _describe_parameters(parameters, context)
+        ),
+        "executemany": executemany,
+        "route": get_current_route(),
+        "plan": None,
+        "plan_status": "not_captured",
+    }
+    _entries.append(entry)
+    logger.warning("Slow query (%.1f ms) on %s: %s", elapsed_ms, entry["route"], statement)
+
+    if (
+        config.SLOW_QUERY_EXPLAIN
+        and conn.dialect.name == "postgresql"
+        and not executemany
+        and statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES)
+    ):
+        _schedule_plan_capture(entry, statement, parameters)
+
+
+def _schedule_plan_capture(entry: Dict[str, Any], statement: str, parameters) -> None:
+    global _explain_slots
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if _explain_slots is None:
+        _explain_slots = asyncio.Semaphore(2)
+    if _explain_slots.locked():
+        entry["plan_status"] = "skipped_busy"
+        return
+
+    entry["plan_status"] = "pending"
+    task = loop.create_task(_capture_plan(entry, statement, parameters))
+    _pending_plans.add(task)
+    task.add_done_callback(_pending_plans.discard)
+
+
+async def _capture_plan(entry: Dict[str, Any], statement: str, parameters) -> None:
+    async with _explain_slots:
+        try:
+            async with _engine.connect() as conn:
+                conn = await conn.execution_options(**{_SKIP_OPTION: True})
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters
+                )
+                entry["plan"] = result.scalar()
+                entry["plan_status"] = "captured"
+        except Exception as e:
+            entry["plan_status"] = "failed"
+            entry["plan_error"] = str(e)
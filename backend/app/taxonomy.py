@@ -0,0 +1,247 @@
+# app/taxonomy.py
+"""
+Canonical skill dictionary.
+
+Free-text skill names from competencies, additional skills and the Excel
+sheets are reduced to a key (`skill_key`) so "Python", "python " and
+"Python3" land on one `skills` row. Every other spelling seen is stored in
+`skill_aliases`, which also takes manual synonyms ("js" -> JavaScript).
+
+The autocomplete index is a sorted array of terms (skill keys, every word
+suffix of a key, and aliases); a prefix lookup is one bisect plus a short
+forward scan.
+"""
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import cache, invalidation
+from app.models import AdditionalSkill, EmployeeCompetency, Skill, SkillAlias, Trainer, TrainingDetail
+
+_PUNCTUATION = re.compile(r"[^\w+#.\s]")
+# Version suffixes: a "v" prefix ("Python v3"), a dotted version ("Java 1.8",
+# "AUTOSAR 4.3") or a one- or two-digit major ("Python3", "HTML5",
+# "Angular 16"). Longer numbers name things ("ISO 26262", "ISO 9001",
+# "IEC 61508", "Office 365") and are kept. Only stripped when at least three
+# letters remain, so "ES6" and "S3" stay as they are.
+_VERSION_SUFFIX = re.compile(r"(?<=[a-z])\s*(?:v\d+(?:\.\d+)*|\d+(?:\.\d+)+|\d{1,2})$")
+
+
+def spelling_key(value: Optional[str]) -> Optional[str]:
+    """A spelling with case and whitespace differences removed."""
+    if not value:
+        return None
+    return " ".join(value.split()).casefold() or None
+
+
+def skill_key(value: Optional[str]) -> Optional[str]:
+    """The canonical key: spelling_key without punctuation or a trailing version number."""
+    spelling = spelling_key(value)
+    if not spelling:
+        return None
+    key = " ".join(_PUNCTUATION.sub(" ", spelling).split()).strip(".")
+    base = _VERSION_SUFFIX.sub("", key)
+    if len(base) >= 3:
+        key = base
+    return key or None
+
+
+async def resolve_skills(db: AsyncSession, names: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, int]:
+    """
+    Maps (name, category) pairs to skill ids, creating missing skills and
+    recording new spellings as aliases. Three to five statements for any
+    number of names. Returns {name: skill_id}.
+    """
+    wanted: Dict[str, Tuple[str, str, Optional[str]]] = {}
+    for name, category in names:
+        key = skill_key(name)
+        if key and name not in wanted:
+            wanted[name] = (key, spelling_key(name), category)
+    if not wanted:
+        return {}
+
+    # Step 1: known spellings (including manual synonyms)
+    alias_result = await db.execute(
+        select(SkillAlias.alias_key, SkillAlias.skill_id)
+        .where(SkillAlias.alias_key.in_({spelling for _, spelling, _ in wanted.values()}))
+    )
+    by_spelling = dict(alias_result.all())
+
+    # Step 2: canonical keys, inserting the missing ones
+    keys = {key for key, spelling, _ in wanted.values() if spelling not in by_spelling}
+    by_key: Dict[str, int] = {}
+    if keys:
+        key_result = await db.execute(select(Skill.key, Skill.id).where(Skill.key.in_(keys)))
+        by_key = dict(key_result.all())
+        missing = {}
+        for name, (key, spelling, category) in wanted.items():
+            if key in keys and key not in by_key and key not in missing:
+                missing[key] = {"key": key, "name": " ".join(name.split()), "category": category}
+        if missing:
+            await db.execute(
+                pg_insert(Skill).values(list(missing.values())).on_conflict_do_nothing(index_elements=["key"])
+            )
+            inserted = await db.execute(select(Skill.key, Skill.id).where(Skill.key.in_(missing)))
+            by_key.update(inserted.all())
+            await invalidation.publish(db, topics=["skills"])
+
+    # Step 3: remember spellings that differ from their key
+    new_aliases = {
+        spelling: by_key[key]
+        for key, spelling, _ in wanted.values()
+        if spelling not in by_spelling and spelling != key and key in by_key
+    }
+    if new_aliases:
+        await db.execute(
+            pg_insert(SkillAlias)
+            .values([{"alias_key": spelling, "skill_id": skill_id} for spelling, skill_id in new_aliases.items()])
+            .on_conflict_do_nothing(index_elements=["alias_key"])
+        )
+        await invalidation.publish(db, topics=["skills"])
+
+    return {
+        name: by_spelling.get(spelling) or by_key.get(key)
+        for name, (key, spelling, _) in wanted.items()
+    }
+
+
+async def populate(db: AsyncSession) -> int:
+    """
+    Registers the skills named in the trainer and training sheets and links
+    competency / additional-skill rows that have no skill_id yet. Returns the
+    number of rows linked.
+    """
+    for model in (Trainer, TrainingDetail):
+        result = await db.execute(
+            select(model.skill, func.min(model.competency)).where(model.skill.isnot(None)).group_by(model.skill)
+        )
+        await resolve_skills(db, result.all())
+
+    linked = 0
+    for model, name_column, category_column in (
+        (EmployeeCompetency, EmployeeCompetency.skill, EmployeeCompetency.competency),
+        (AdditionalSkill, AdditionalSkill.skill_name, AdditionalSkill.skill_category),
+    ):
+        result = await db.execute(
+            select(name_column, func.min(category_column))
+            .where(model.skill_id.is_(None), name_column.isnot(None))
+            .group_by(name_column)
+        )
+        skill_ids = await resolve_skills(db, result.all())
+        if not skill_ids:
+            continue
+        # executemany: one prepared UPDATE, one parameter set per distinct name
+        await db.execute(
+            update(model.__table__)
+            .where(name_column == bindparam("name"), model.skill_id.is_(None))
+            .values(skill_id=bindparam("resolved_id")),
+            [{"name": name, "resolved_id": skill_id} for name, skill_id in skill_ids.items()],
+        )
+        linked += len(skill_ids)
+    return linked
+
+
+# --- Autocomplete index ---
+
+class SkillSuggestion(NamedTuple):
+    id: int
+    name: str
+    category: Optional[str]
+    usage: int
+
+
+class SuggestSnapshot(NamedTuple):
+    # Parallel arrays sorted by term: the term, its skill id and whether the
+    # term is the start of the skill's name/alias (0) or a later word (1).
+    terms: List[str]
+    skill_ids: List[int]
+    match_ranks: List[int]
+    skills: Dict[int, SkillSuggestion]
+    # Ranked answers for one- and two-character prefixes, which would
+    # otherwise scan a large part of the array.
+    short_prefixes: Dict[str, List[int]]
+
+
+SHORT_PREFIX_LENGTH = 2
+SHORT_PREFIX_RESULTS = 50
+MAX_SCAN = 2000
+
+
+def _ranked(best: Dict[int, int], skills: Dict[int, SkillSuggestion]) -> List[int]:
+    """Name matches before word matches, then most used, then alphabetical."""
+    return sorted(best, key=lambda skill_id: (best[skill_id], -skills[skill_id].usage, skills[skill_id].name))
+
+
+class SkillSuggestIndex(cache.RebuildableIndex):
+    async def build(self, db: AsyncSession) -> SuggestSnapshot:
+        usage: Dict[int, int] = {}
+        for model in (EmployeeCompetency, AdditionalSkill):
+            result = await db.execute(
+                select(model.skill_id, func.count()).where(model.skill_id.isnot(None)).group_by(model.skill_id)
+            )
+            for skill_id, count in result:
+                usage[skill_id] = usage.get(skill_id, 0) + count
+
+        skills: Dict[int, SkillSuggestion] = {}
+        entries = set()
+        skill_result = await db.execute(select(Skill.id, Skill.key, Skill.name, Skill.category))
+        for row in skill_result:
+            skills[row.id] = SkillSuggestion(row.id, row.name, row.category, usage.get(row.id, 0))
+            entries.add((row.key, row.id, 0))
+            words = row.key.split()
+            for start in range(1, len(words)):
+                entries.add((" ".join(words[start:]), row.id, 1))
+        alias_result = await db.execute(select(SkillAlias.alias_key, SkillAlias.skill_id))
+        for alias_key, skill_id in alias_result:
+            entries.add((alias_key, skill_id, 0))
+
+        buckets: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for term, skill_id, rank in entries:
+            for length in range(1, min(len(term), SHORT_PREFIX_LENGTH) + 1):
+                best = buckets[term[:length]]
+                if rank < best.get(skill_id, 2):
+                    best[skill_id] = rank
+
+        ordered = sorted(entries)
+        return SuggestSnapshot(
+            [term for term, _, _ in ordered],
+            [skill_id for _, skill_id, _ in ordered],
+            [rank for _, _, rank in ordered],
+            skills,
+            {prefix: _ranked(best, skills)[:SHORT_PREFIX_RESULTS] for prefix, best in buckets.items()},
+        )
+
+    async def suggest(self, db: AsyncSession, prefix: str, limit: int = 10) -> List[SkillSuggestion]:
+        snapshot = await self.get(db)
+        return suggest(snapshot, prefix, limit)
+
+
+def suggest(snapshot: SuggestSnapshot, prefix: str, limit: int) -> List[SkillSuggestion]:
+    """Skills with a term starting with `prefix`, best first."""
+    prefix = spelling_key(prefix)
+    if not prefix:
+        return []
+    if len(prefix) <= SHORT_PREFIX_LENGTH and limit <= SHORT_PREFIX_RESULTS:
+        ranked = snapshot.short_prefixes.get(prefix, [])
+    else:
+        best: Dict[int, int] = {}
+        terms = snapshot.terms
+        index = bisect_left(terms, prefix)
+        end = min(len(terms), index + MAX_SCAN)
+        while index < end and terms[index].startswith(prefix):
+            skill_id = snapshot.skill_ids[index]
+            rank = snapshot.match_ranks[index]
+            if rank < best.get(skill_id, 2):
+                best[skill_id] = rank
+            index += 1
+        ranked = _ranked(best, snapshot.skills)
+    return [snapshot.skills[skill_id] for skill_id in ranked[:limit]]
+
+
+skill_suggest_index = cache.register("skills", SkillSuggestIndex())
@@ -0,0 +1,105 @@
+# app/trainer_directory.py
+"""
+In-memory trainer directory: the `trainers` sheet indexed by skill and
+competency, merged with the manager_is_trainer/employee_is_trainer flags
+from `manager_employee`. Rebuilt lazily after each Excel load or org change.
+It backs the /trainers/ listing only: whether someone may create trainings
+(`is_trainer`) is read from the table, since the flags change outside the API.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import cache
+from app.levels import parse_level
+from app.models import ManagerEmployee, Trainer
+from app.taxonomy import skill_key, spelling_key
+
+
+class TrainerSnapshot(NamedTuple):
+    # skill/competency key -> trainer entries, best expertise first
+    by_skill: Dict[str, List[dict]]
+    by_competency: Dict[str, List[dict]]
+    everyone: List[dict]
+
+
+def _rank(entry: dict) -> tuple:
+    level = parse_level(entry["expertise_level"])
+    return (-(level if level is not None else -1), not entry["is_designated_trainer"], entry["trainer_name"] or "")
+
+
+class TrainerDirectory(cache.RebuildableIndex):
+    async def build(self, db: AsyncSession) -> TrainerSnapshot:
+        relations = await db.execute(
+            select(
+                ManagerEmployee.manager_empid, ManagerEmployee.manager_name, ManagerEmployee.manager_is_trainer,
+                ManagerEmployee.employee_empid, ManagerEmployee.employee_name, ManagerEmployee.employee_is_trainer,
+            ).where(ManagerEmployee.manager_is_trainer | ManagerEmployee.employee_is_trainer)
+        )
+        empid_by_name: Dict[str, str] = {}
+        for row in relations:
+            if row.manager_is_trainer and row.manager_name:
+                empid_by_name[spelling_key(row.manager_name)] = row.manager_empid
+            if row.employee_is_trainer and row.employee_name:
+                empid_by_name[spelling_key(row.employee_name)] = row.employee_empid
+
+        trainers = await db.execute(
+            select(Trainer.trainer_name, Trainer.skill, Trainer.competency, Trainer.expertise_level)
+        )
+        by_skill: Dict[str, List[dict]] = defaultdict(list)
+        by_competency: Dict[str, List[dict]] = defaultdict(list)
+        everyone = []
+        for row in trainers:
+            empid = empid_by_name.get(spelling_key(row.trainer_name))
+            entry = {
+                "trainer_name": row.trainer_name,
+                "skill": row.skill,
+                "competency": row.competency,
+                "expertise_level": row.expertise_level,
+                "empid": empid,
+                "is_designated_trainer": empid is not None,
+            }
+            everyone.append(entry)
+            if skill_key(row.skill):
+                by_skill[skill_key(row.skill)].append(entry)
+            if skill_key(row.competency):
+                by_competency[skill_key(row.competency)].append(entry)
+
+        for entries in (*by_skill.values(), *by_competency.values(), everyone):
+            entries.sort(key=_rank)
+        return TrainerSnapshot(dict(by_skill), dict(by_competency), everyone)
+
+    async def is_trainer(self, db: AsyncSession, empid: str) -> bool:
+        """
+        Whether the employee is flagged as a trainer, read from the table: like
+        org_directory.manages, an authorization check can't wait for the
+        snapshot to notice a flag change.
+        """
+        result = await db.execute(
+            select(ManagerEmployee.manager_empid)
+            .where(or_(
+                and_(ManagerEmployee.manager_empid == empid, ManagerEmployee.manager_is_trainer),
+                and_(ManagerEmployee.employee_empid == empid, ManagerEmployee.employee_is_trainer),
+            ))
+            .limit(1)
+        )
+        return result.first() is not None
+
+    async def find(self, db: AsyncSession, skill: Optional[str] = None, competency: Optional[str] = None) -> List[dict]:
+        snapshot = await self.get(db)
+        if skill and competency:
+            competency_key = skill_key(competency)
+            return [e for e in snapshot.by_skill.get(skill_key(skill), []) if skill_key(e["competency"]) == competency_key]
+        if skill:
+            return snapshot.by_skill.get(skill_key(skill), [])
+        if competency:
+            return snapshot.by_competency.get(skill_key(competency), [])
+        return snapshot.everyone
+
+
+trainer_directory = cache.register("trainers", TrainerDirectory())
+cache.register("org", trainer_directory)
@@ -0,0 +1,91 @@
+# app/versions.py
+"""
+Data versions behind the HTTP ETags.
+
+`bump()` increments a version in the same transaction as the change it
+describes. Readers go through a per-worker copy, so a conditional request
+that is still fresh is answered without a query. Bumps reach the other
+workers' copies through the invalidation bus; DATA_VERSION_TTL_SECONDS
+bounds staleness if a message is ever missed.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app import cache, config, invalidation
+from app.models import DataVersion
+
+CATALOG = "catalog"
+
+
+def assignments_of(empid: str) -> str:
+    return f"assignments:{empid}"
+
+
+class Version(NamedTuple):
+    number: int
+    updated_at: datetime
+
+
+INITIAL = Version(0, datetime(2000, 1, 1))
+
+_local = cache.register("versions", cache.TTLCache(ttl_seconds=config.DATA_VERSION_TTL_SECONDS, max_entries=10000))
+
+
+async def bump(db: AsyncSession, names: Iterable[str]) -> None:
+    """Increments the versions (creating them at 1) as part of the current transaction."""
+    now = datetime.utcnow()
+    rows = [{"name": name, "version": 1, "updated_at": now} for name in dict.fromkeys(names)]
+    if not rows:
+        return
+    statement = pg_insert(DataVersion).values(rows)
+    result = await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": DataVersion.version + 1, "updated_at": statement.excluded.updated_at},
+        ).returning(DataVersion.name, DataVersion.version, DataVersion.updated_at)
+    )
+    bumped = {name: Version(number, updated_at) for name, number, updated_at in result}
+    await invalidation.publish(db, versions=bumped)
+
+
+def _remember(items: list) -> None:
+    """Applies bumped versions from an invalidation message: [name, number, updated_at]."""
+    for name, number, updated_at in items:
+        if isinstance(updated_at, str):
+            updated_at = datetime.fromisoformat(updated_at)
+        current = _local.get(name)
+        # Messages from different workers can interleave; never go backwards.
+        if current is None or current.number < number:
+            _local.set(name, Version(number, updated_at))
+
+
+async def get_versions(db: AsyncSession, names: Iterable[str]) -> Dict[str, Version]:
+    versions = {}
+    missing = []
+    for name in names:
+        version = _local.get(name)
+        if version is None:
+            missing.append(name)
+        else:
+            versions[name] = version
+    if missing:
+        result = await db.execute(
+            select(DataVersion.name, DataVersion.version, DataVersion.updated_at).where(DataVersion.name.in_(missing))
+        )
+        found = {name: Version(number, updated_at) for name, number, updated_at in result}
+        for name in missing:
+            versions[name] = found.get(name, INITIAL)
+            _local.set(name, versions[name])
+    return versions
+
+
+async def get_version(db: AsyncSession, name: str) -> Version:
+    return (await get_versions(db, [name]))[name]
+
+
+invalidation.handle("versions", _remember)
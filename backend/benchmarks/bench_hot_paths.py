@@ -0,0 +1,151 @@
+# benchmarks/bench_hot_paths.py
+"""
+Micro-benchmarks for backend hot paths, runnable offline against an in-memory
+SQLite database.
+
+    cd backend
+    python -m benchmarks.bench_hot_paths            # full sizes
+    python -m benchmarks.bench_hot_paths --quick    # smaller inputs for a fast check
+    python -m benchmarks.compare benchmarks/results/hot_paths-<old>.json benchmarks/results/hot_paths-<new>.json
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import List
+
+import pandas as pd
+from jose import jwt
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.auth_utils import ALGORITHM, SECRET_KEY, create_access_token
+from app.excel_loader import clean_headers, load_all_from_excel
+from app.models import AdditionalSkill, EmployeeCompetency, ManagerEmployee, TrainingDetail
+from app.routes.dashboard_routes import get_manager_data, get_status_from_levels
+from app.schemas import TrainingResponse
+from benchmarks import synthetic
+from benchmarks.common import create_sqlite_database, measure, measure_async, print_result, write_results
+
+FULL_SIZES = {
+    "level_pairs": 1_000_000,
+    "workbook_rows": [1_000, 10_000, 100_000],
+    "team_sizes": [10, 100, 1_000],
+    "catalog_rows": [1_000, 10_000],
+}
+QUICK_SIZES = {
+    "level_pairs": 100_000,
+    "workbook_rows": [1_000, 10_000],
+    "team_sizes": [10, 100],
+    "catalog_rows": [1_000],
+}
+
+
+def bench_status_from_levels(results: dict, sizes: dict) -> None:
+    pairs = synthetic.level_pairs(sizes["level_pairs"])
+
+    def run():
+        for current, target in pairs:
+            get_status_from_levels(current, target)
+
+    results[f"get_status_from_levels[{len(pairs)}]"] = measure(run, repeat=3)
+
+
+def bench_clean_headers(results: dict, sizes: dict, workbooks: dict) -> None:
+    for rows, workbook in workbooks.items():
+        workbook.seek(0)
+        df = pd.read_excel(workbook, sheet_name="Training Details", engine="openpyxl")
+        original_columns = df.columns
+
+        def run():
+            df.columns = original_columns
+            clean_headers(df)
+
+        results[f"clean_headers[{rows}]"] = measure(run, repeat=5, number=100)
+
+
+async def bench_load_all_from_excel(results: dict, workbooks: dict) -> None:
+    engine, session_factory = await create_sqlite_database()
+    try:
+        for rows, workbook in workbooks.items():
+            async def run():
+                workbook.seek(0)
+                async with session_factory() as db:
+                    await load_all_from_excel(workbook, db)
+
+            results[f"load_all_from_excel[{rows}]"] = await measure_async(run, repeat=1 if rows >= 100_000 else 3)
+    finally:
+        await engine.dispose()
+
+
+async def bench_manager_dashboard(results: dict, sizes: dict) -> None:
+    engine, session_factory = await create_sqlite_database()
+    try:
+        async with session_factory() as db:
+            for team_size in sizes["team_sizes"]:
+                rows = synthetic.team_rows(f"M{team_size}", team_size)
+                await db.execute(insert(ManagerEmployee), rows["manager_employee"])
+                await db.execute(insert(EmployeeCompetency), rows["employee_competency"])
+                await db.execute(insert(AdditionalSkill), rows["additional_skills"])
+            await db.commit()
+
+        for team_size in sizes["team_sizes"]:
+            current_user = {"username": f"M{team_size}", "role": "manager"}
+
+            async def run():
+                async with session_factory() as db:
+                    await get_manager_data(current_user=current_user, db=db)
+
+            results[f"manager_dashboard[team={team_size}]"] = await measure_async(run, repeat=5)
+    finally:
+        await engine.dispose()
+
+
+def bench_jwt(results: dict) -> None:
+    claims = {"sub": "5504763", "role": "manager", "employee_name": "Sundara Nagaveera Venkata Satish"}
+    token = create_access_token(claims)
+
+    results["jwt_create"] = measure(lambda: create_access_token(claims), repeat=5, number=1_000)
+    results["jwt_decode"] = measure(lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]), repeat=5, number=1_000)
+
+
+def bench_catalog_serialization(results: dict, sizes: dict) -> None:
+    # Same path FastAPI takes for response_model=List[TrainingResponse]:
+    # validate from ORM attributes, then encode to JSON.
+    adapter = TypeAdapter(List[TrainingResponse])
+    for rows in sizes["catalog_rows"]:
+        trainings = [TrainingDetail(id=i + 1, **row) for i, row in enumerate(synthetic.training_rows(rows))]
+        results[f"catalog_serialization[{rows}]"] = measure(
+            lambda: adapter.dump_json(adapter.validate_python(trainings)), repeat=5
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="use smaller inputs")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/hot_paths-<commit>.json)")
+    args = parser.parse_args()
+
+    # The loader logs every step at INFO; keep the output readable.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+    results: dict = {}
+
+    bench_status_from_levels(results, sizes)
+    bench_jwt(results)
+    bench_catalog_serialization(results, sizes)
+    await bench_manager_dashboard(results, sizes)
+
+    workbooks = {rows: synthetic.build_training_workbook(rows) for rows in sizes["workbook_rows"]}
+    bench_clean_headers(results, sizes, workbooks)
+    await bench_load_all_from_excel(results, workbooks)
+
+    for name, result in results.items():
+        print_result(name, result)
+    path = write_results("hot_paths", results, args.output, sizes=sizes, seed=synthetic.DEFAULT_SEED)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+# benchmarks/bench_projection.py
+"""
+Column projections versus full ORM hydration on the dashboard and catalog
+read paths, against an in-memory SQLite database. Each path is timed both
+ways: loading entities and copying attributes out (what the routes used to
+do), and selecting only the serialized columns as rows (what they do now).
+Reports time per row and peak Python memory (tracemalloc) per call.
+
+    cd backend
+    python -m benchmarks.bench_projection            # full sizes
+    python -m benchmarks.bench_projection --quick    # smaller inputs for a fast check
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from typing import Awaitable, Callable
+
+from sqlalchemy import insert
+from sqlalchemy.future import select
+
+from app.models import AdditionalSkill, EmployeeCompetency, ManagerEmployee, TrainingDetail
+from app.routes.dashboard_routes import SKILL_COLUMNS, get_status_from_levels
+from app.routes.training_routes import TRAINING_COLUMNS
+from app.schemas import TrainingResponse
+from benchmarks import synthetic
+from benchmarks.common import create_sqlite_database, measure_async, write_results
+
+FULL_SIZES = {"team_sizes": [100, 1_000, 5_000], "catalog_rows": [1_000, 10_000]}
+QUICK_SIZES = {"team_sizes": [100, 1_000], "catalog_rows": [1_000]}
+
+
+async def peak_memory(fn: Callable[[], Awaitable[int]]) -> int:
+    """Peak bytes allocated by Python during one call."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def compare(results: dict, name: str, variants: dict) -> None:
+    for variant, fn in variants.items():
+        rows = await fn()
+        result = await measure_async(fn, repeat=5)
+        result["rows"] = rows
+        result["per_row_us"] = result["median_s"] / rows * 1e6 if rows else None
+        result["peak_kb"] = await peak_memory(fn) / 1024
+        results[f"{name}[{variant}]"] = result
+
+
+async def bench_team_skills(results: dict, sizes: dict, session_factory) -> None:
+    async with session_factory() as db:
+        for team_size in sizes["team_sizes"]:
+            rows = synthetic.team_rows(f"M{team_size}", team_size)
+            await db.execute(insert(ManagerEmployee), rows["manager_employee"])
+            await db.execute(insert(EmployeeCompetency), rows["employee_competency"])
+            await db.execute(insert(AdditionalSkill), rows["additional_skills"])
+        await db.commit()
+
+    for team_size in sizes["team_sizes"]:
+        team = [f"M{team_size}-{i:05d}" for i in range(team_size)]
+
+        async def entities():
+            async with session_factory() as db:
+                result = await db.execute(select(EmployeeCompetency).where(EmployeeCompetency.employee_empid.in_(team)))
+                skills = [
+                    {
+                        "employee_empid": comp.employee_empid, "skill": comp.skill, "competency": comp.competency,
+                        "current_expertise": comp.current_expertise, "target_expertise": comp.target_expertise,
+                        "status": get_status_from_levels(comp.current_expertise, comp.target_expertise),
+                    }
+                    for comp in result.scalars().all()
+                ]
+            return len(skills)
+
+        async def projection():
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(EmployeeCompetency.employee_empid, *SKILL_COLUMNS)
+                    .where(EmployeeCompetency.employee_empid.in_(team))
+                )
+                skills = [
+                    {
+                        "employee_empid": row.employee_empid, "skill": row.skill, "competency": row.competency,
+                        "current_expertise": row.current_expertise, "target_expertise": row.target_expertise,
+                        "status": get_status_from_levels(row.current_expertise, row.target_expertise),
+                    }
+                    for row in result.all()
+                ]
+            return len(skills)
+
+        await compare(results, f"team_skills[team={team_size}]", {"entities": entities, "projection": projection})
+
+
+async def bench_catalog(results: dict, sizes: dict, session_factory) -> None:
+    for count in sizes["catalog_rows"]:
+        async with session_factory() as db:
+            await db.execute(TrainingDetail.__table__.delete())
+            await db.execute(insert(TrainingDetail), synthetic.training_rows(count))
+            await db.commit()
+
+        async def entities():
+            async with session_factory() as db:
+                result = await db.execute(select(TrainingDetail).order_by(TrainingDetail.training_date.desc()))
+                trainings = [TrainingResponse.model_validate(training) for training in result.scalars().all()]
+            return len(trainings)
+
+        async def projection():
+            async with session_factory() as db:
+                result = await db.execute(select(*TRAINING_COLUMNS).order_by(TrainingDetail.training_date.desc()))
+                trainings = [TrainingResponse.model_validate(row) for row in result.all()]
+            return len(trainings)
+
+        await compare(results, f"catalog[{count}]", {"entities": entities, "projection": projection})
+
+
+def print_projection_result(name: str, result: dict) -> None:
+    print(
+        f"{name:<45} median {result['median_s'] * 1000:9.2f} ms   "
+        f"{result['per_row_us'] or 0:7.2f} us/row   peak {result['peak_kb']:9.0f} KiB"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="use smaller inputs")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/projection-<commit>.json)")
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+    results: dict = {}
+
+    engine, session_factory = await create_sqlite_database()
+    try:
+        await bench_team_skills(results, sizes, session_factory)
+        await bench_catalog(results, sizes, session_factory)
+    finally:
+        await engine.dispose()
+
+    for name, result in results.items():
+        print_projection_result(name, result)
+    path = write_results("projection", results, args.output, sizes=sizes, seed=synthetic.DEFAULT_SEED)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
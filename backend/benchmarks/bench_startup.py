@@ -0,0 +1,71 @@
+# benchmarks/bench_startup.py
+"""
+Worker cold-start benchmark: imports app.main in fresh interpreters and records
+import time, peak RSS and whether the heavy upload-only libraries were loaded.
+
+    cd backend
+    python -m benchmarks.bench_startup [--runs 10]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import write_results
+
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "import_s": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+    "heavy_modules": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_probe() -> dict:
+    output = subprocess.check_output([sys.executable, "-c", PROBE], text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/startup-<commit>.json)")
+    args = parser.parse_args()
+
+    run_probe()  # warm the OS file cache and .pyc files
+    probes = [run_probe() for _ in range(args.runs)]
+    import_times = [p["import_s"] for p in probes]
+    results = {
+        "import_app_main": {
+            "repeat": args.runs,
+            "number": 1,
+            "min_s": min(import_times),
+            "median_s": statistics.median(import_times),
+            "mean_s": statistics.fmean(import_times),
+            "stdev_s": statistics.stdev(import_times) if args.runs > 1 else 0.0,
+            "max_rss_kb": statistics.median(p["max_rss_kb"] for p in probes),
+            "modules": probes[-1]["modules"],
+            "heavy_modules": probes[-1]["heavy_modules"],
+        }
+    }
+
+    result = results["import_app_main"]
+    print(f"import app.main: median {result['median_s'] * 1000:.1f} ms, "
+          f"peak RSS {result['max_rss_kb'] / 1024:.1f} MiB, {result['modules']} modules, "
+          f"heavy modules loaded: {result['heavy_modules'] or 'none'}")
+    path = write_results("startup", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/common.py
+"""
+Timing helpers, result files and the offline SQLite database shared by the
+benchmark scripts.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _summarize(times: list, number: int) -> Dict[str, Any]:
+    per_call = [t / number for t in times]
+    return {
+        "repeat": len(times),
+        "number": number,
+        "min_s": min(per_call),
+        "median_s": statistics.median(per_call),
+        "mean_s": statistics.fmean(per_call),
+        "stdev_s": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, number: int = 1) -> Dict[str, Any]:
+    """Times `fn` `number` times per round over `repeat` rounds (after one warm-up call)."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append(time.perf_counter() - start)
+    return _summarize(times, number)
+
+
+async def measure_async(fn: Callable[[], Awaitable[Any]], repeat: int = 5, number: int = 1) -> Dict[str, Any]:
+    """Async counterpart of `measure`."""
+    await fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        times.append(time.perf_counter() - start)
+    return _summarize(times, number)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(suite: str, results: Dict[str, Any], output: Optional[str] = None, **meta) -> Path:
+    """
+    Saves results as JSON. Files are named <suite>-<commit>.json by default so
+    runs from different commits can be compared with benchmarks/compare.py.
+    """
+    commit = git_commit()
+    path = Path(output) if output else RESULTS_DIR / f"{suite}-{commit or 'nocommit'}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "suite": suite,
+            "commit": commit,
+            "created_at": datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            **meta,
+        },
+        "benchmarks": results,
+    }
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    return path
+
+
+def print_result(name: str, result: Dict[str, Any]) -> None:
+    print(f"{name:<55} median {result['median_s'] * 1000:10.3f} ms   min {result['min_s'] * 1000:10.3f} ms")
+
+
+async def create_sqlite_database():
+    """
+    In-memory SQLite database with the application schema, so database-backed
+    benchmarks run offline. Returns (engine, session factory).
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return engine, session_factory
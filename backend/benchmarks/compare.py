@@ -0,0 +1,51 @@
+# benchmarks/compare.py
+"""
+Compares two benchmark result files and flags regressions.
+
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 0.10]
+
+Exits with status 1 when any benchmark's median slowed down by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown (default 0.10)")
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    print(f"old: {old['meta'].get('commit')}   new: {new['meta'].get('commit')}\n")
+
+    regressions = 0
+    for name, new_result in new["benchmarks"].items():
+        old_result = old["benchmarks"].get(name)
+        if old_result is None:
+            print(f"{name:<55} (new)")
+            continue
+        old_median, new_median = old_result["median_s"], new_result["median_s"]
+        change = (new_median - old_median) / old_median if old_median else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<55} {old_median * 1000:10.3f} ms -> {new_median * 1000:10.3f} ms  {change:+7.1%}{flag}")
+
+    for name in old["benchmarks"].keys() - new["benchmarks"].keys():
+        print(f"{name:<55} (removed)")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
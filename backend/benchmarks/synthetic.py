@@ -0,0 +1,179 @@
+# benchmarks/synthetic.py
+"""
+Reproducible synthetic data shaped like the Skill Orbit workbook and tables.
+Every generator takes a seed, so two runs (or two commits) see identical data.
+"""
+
+import io
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl import Workbook
+
+DEFAULT_SEED = 20250917
+
+LEVELS = ["L0", "L1", "L2", "L3", "L4", "L5"]
+TEXT_LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+DIVISIONS = ["I Div", "E Div", "P Div", "R Div"]
+DEPARTMENTS = ["IDSI", "IDSIS", "EDSA", "PDVT", "RDCX", "IDTA"]
+PROJECTS = ["COC", "CMPS", "ADAS", "BMS", "HMI", "EPS"]
+TRAINING_TYPES = ["Classroom", "Online", "Hands-on", "Workshop"]
+COMPETENCIES = [
+    "Test Automation", "Test Execution", "Automation", "Application Lifecycle Management (ALM)",
+    "Programming", "Requirements Engineering", "Model Based Design", "Cloud", "DevOps", "Safety",
+]
+SKILLS = [
+    "EXAM", "Softcar", "Python", "Integrity", "C", "C++", "Doors", "Simulink", "MATLAB", "Jenkins",
+    "Git", "Docker", "Kubernetes", "Vector cast", "EA", "Visual Studio", "CANoe", "AUTOSAR",
+    "ISO 26262", "Linux", "Bash", "Java", "Rust", "Go", "SQL", "Azure", "AWS", "Terraform",
+]
+TIMES = ["10.00 AM - 12.00 PM", "10.30 -11.30 AM", "02.00 PM -03.00 PM", "11:00 - 13:00", "3 PM"]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Kavya", "Rohan", "Sneha", "Vikram", "Ananya", "Arjun", "Meera"]
+LAST_NAMES = ["Sharma", "Reddy", "Iyer", "Patel", "Nair", "Rao", "Gupta", "Menon", "Das", "Bathini"]
+
+TRAINER_HEADERS = ["Skill", "Competency", "Trainer Name", "Expertise Level"]
+TRAINING_HEADERS = [
+    "Division", "Department", "Competency", "Skill", "TrainingName/Program",
+    "TrainingTopics, Material", "Perquisites", "Skill Category (L1 - L5)", "Trainer Name",
+    "Email ID", "Training Dates", "Duration (in Hrs)", "Time", "Training Type ",
+    "No. of Seats", "Assessment details*",
+]
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def level_pairs(count: int, seed: int = DEFAULT_SEED) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Current/target level pairs in the formats seen in real data, including bad values."""
+    rng = random.Random(seed)
+    pool = LEVELS + TEXT_LEVELS + [" l2 ", "L3 ", None, "N/A", "Lx"]
+    weights = [8] * len(LEVELS) + [2] * len(TEXT_LEVELS) + [1, 1, 1, 1, 1]
+    values = rng.choices(pool, weights=weights, k=count * 2)
+    return list(zip(values[0::2], values[1::2]))
+
+
+def training_rows(count: int, seed: int = DEFAULT_SEED, start: date = date(2025, 1, 6)) -> List[Dict]:
+    """Rows keyed by TrainingDetail column names."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        skill = rng.choice(SKILLS)
+        trainer = person_name(rng)
+        rows.append({
+            "division": rng.choice(DIVISIONS),
+            "department": rng.choice(DEPARTMENTS),
+            "competency": rng.choice(COMPETENCIES),
+            "skill": skill,
+            "training_name": f"{skill} {rng.choice(['Basic', 'Advanced', 'Deep Dive', 'Refresher'])} {i}",
+            "training_topics": ", ".join(rng.sample(SKILLS, 4)),
+            "prerequisites": rng.choice([None, "Basic programming", f"{skill} Basic"]),
+            "skill_category": rng.choice(LEVELS[1:]),
+            "trainer_name": trainer,
+            "email": trainer.lower().replace(" ", ".") + "@example.com",
+            "training_date": start + timedelta(days=rng.randrange(0, 730)),
+            "duration": str(rng.choice([1, 1.5, 2, 3, 4])),
+            "time": rng.choice(TIMES),
+            "training_type": rng.choice(TRAINING_TYPES),
+            "seats": str(rng.choice([10, 15, 20, 25, 30])),
+            "assessment_details": rng.choice([None, "Quiz", "Hands-on assignment"]),
+        })
+    return rows
+
+
+def trainer_rows(count: int, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """Rows keyed by Trainer column names."""
+    rng = random.Random(seed + 1)
+    return [
+        {
+            "skill": rng.choice(SKILLS),
+            "competency": rng.choice(COMPETENCIES),
+            "trainer_name": person_name(rng),
+            "expertise_level": rng.choice(LEVELS[1:]),
+        }
+        for _ in range(count)
+    ]
+
+
+def build_training_workbook(training_count: int, trainer_count: Optional[int] = None, seed: int = DEFAULT_SEED) -> io.BytesIO:
+    """
+    An in-memory .xlsx with the 'Trainers Details' and 'Training Details' sheets
+    that load_all_from_excel reads, using the same header spellings as the real file.
+    """
+    trainer_count = trainer_count if trainer_count is not None else max(10, training_count // 10)
+    workbook = Workbook(write_only=True)
+
+    trainers_sheet = workbook.create_sheet("Trainers Details")
+    trainers_sheet.append(TRAINER_HEADERS)
+    for row in trainer_rows(trainer_count, seed):
+        trainers_sheet.append([row["skill"], row["competency"], row["trainer_name"], row["expertise_level"]])
+
+    trainings_sheet = workbook.create_sheet("Training Details")
+    trainings_sheet.append(TRAINING_HEADERS)
+    for row in training_rows(training_count, seed):
+        trainings_sheet.append([
+            row["division"], row["department"], row["competency"], row["skill"], row["training_name"],
+            row["training_topics"], row["prerequisites"], row["skill_category"], row["trainer_name"],
+            row["email"], datetime.combine(row["training_date"], datetime.min.time()),
+            float(row["duration"]), row["time"], row["training_type"], int(row["seats"]),
+            row["assessment_details"],
+        ])
+
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def team_rows(
+    manager_empid: str,
+    team_size: int,
+    skills_per_person: int = 10,
+    additional_per_person: int = 3,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, List[Dict]]:
+    """
+    manager_employee, employee_competency and additional_skills rows for one
+    manager and `team_size` direct reports.
+    """
+    rng = random.Random(seed + team_size)
+    manager_name = person_name(rng)
+    relations, competencies, additional = [], [], []
+
+    for i in range(team_size):
+        empid = f"{manager_empid}-{i:05d}"
+        name = person_name(rng)
+        relations.append({
+            "manager_empid": manager_empid,
+            "manager_name": manager_name,
+            "employee_empid": empid,
+            "employee_name": name,
+            "manager_is_trainer": False,
+            "employee_is_trainer": rng.random() < 0.1,
+        })
+        division, department, project = rng.choice(DIVISIONS), rng.choice(DEPARTMENTS), rng.choice(PROJECTS)
+        for skill in rng.sample(SKILLS, min(skills_per_person, len(SKILLS))):
+            competencies.append({
+                "employee_empid": empid,
+                "employee_name": name,
+                "department": department,
+                "division": division,
+                "project": project,
+                "competency": rng.choice(COMPETENCIES),
+                "skill": skill,
+                "current_expertise": rng.choice(LEVELS[:5]),
+                "target_expertise": rng.choice(LEVELS[1:]),
+            })
+        for skill in rng.sample(SKILLS, min(additional_per_person, len(SKILLS))):
+            additional.append({
+                "employee_empid": empid,
+                "skill_name": skill,
+                "skill_level": rng.choice(LEVELS[1:] + TEXT_LEVELS),
+                "skill_category": rng.choice(["Technical", "Tool", "Domain", "Soft"]),
+                "description": None,
+                "created_at": datetime(2025, 1, 1) + timedelta(days=rng.randrange(0, 365)),
+                "updated_at": datetime(2025, 6, 1),
+            })
+
+    return {"manager_employee": relations, "employee_competency": competencies, "additional_skills": additional}
@@ -0,0 +1,244 @@
+# loadtest/harness.py
+"""
+Drives a running API with the Angular client's traffic mix and reports
+throughput and p50/p95/p99 latency per route.
+
+    cd backend
+    python -m loadtest.orggen loadtest/scenarios/steady.json --reset
+    uvicorn app.main:app --workers 4 &
+    python -m loadtest.harness loadtest/scenarios/steady.json --base-url http://127.0.0.1:8000
+
+Each virtual user logs in as a generated employee or manager and then loops
+over weighted actions (dashboard, catalog, assignments, additional-skills
+CRUD, occasional Excel upload) with a random think time between them.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks import synthetic
+from benchmarks.common import git_commit
+from loadtest.orggen import build_people, org_spec
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+DEFAULT_LOAD = {
+    "virtual_users": 20,
+    "duration_s": 60,
+    "ramp_up_s": 5,
+    "think_time_ms": [200, 1000],
+    "manager_share": 0.2,
+    "mix": {
+        "dashboard": 40,
+        "trainings": 25,
+        "my_assignments": 20,
+        "additional_skills": 14,
+        "upload_and_refresh": 1,
+    },
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[route] += 1
+            self.latencies[route].append(time.perf_counter() - start)
+            return None
+        self.latencies[route].append(time.perf_counter() - start)
+        self.status_codes[route][response.status_code] += 1
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+
+    def report(self, elapsed_s: float) -> Dict:
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            routes[route] = {
+                "requests": len(ordered),
+                "errors": self.errors[route],
+                "throughput_rps": len(ordered) / elapsed_s,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+                "status_codes": dict(self.status_codes[route]),
+            }
+        total = sum(r["requests"] for r in routes.values())
+        return {
+            "elapsed_s": elapsed_s,
+            "total_requests": total,
+            "total_errors": sum(r["errors"] for r in routes.values()),
+            "throughput_rps": total / elapsed_s,
+            "routes": routes,
+        }
+
+
+class VirtualUser:
+    def __init__(self, number: int, person: Dict, password: str, load: Dict, recorder: Recorder, workbook: bytes):
+        self.number = number
+        self.person = person
+        self.password = password
+        self.load = load
+        self.recorder = recorder
+        self.workbook = workbook
+        self.rng = random.Random(number)
+        self.role = person["role"]
+        self.skill_counter = itertools.count()
+        actions, weights = zip(*load["mix"].items())
+        self.actions, self.weights = list(actions), list(weights)
+
+    async def run(self, client: httpx.AsyncClient, deadline: float) -> None:
+        response = await self.recorder.call(
+            client, "POST /login", "POST", "/login",
+            json={"username": self.person["empid"], "password": self.password},
+        )
+        if response is None or response.status_code != 200:
+            return
+        body = response.json()
+        self.role = body.get("role", self.role)
+        headers = {"Authorization": f"Bearer {body['access_token']}"}
+
+        low, high = self.load["think_time_ms"]
+        while time.perf_counter() < deadline:
+            action = self.rng.choices(self.actions, weights=self.weights)[0]
+            await getattr(self, f"do_{action}")(client, headers)
+            await asyncio.sleep(self.rng.uniform(low, high) / 1000)
+
+    async def do_dashboard(self, client, headers):
+        if self.role == "manager":
+            await self.recorder.call(client, "GET /data/manager/dashboard", "GET", "/data/manager/dashboard", headers=headers)
+        else:
+            await self.recorder.call(client, "GET /data/engineer", "GET", "/data/engineer", headers=headers)
+
+    async def do_trainings(self, client, headers):
+        await self.recorder.call(client, "GET /trainings/", "GET", "/trainings/", headers=headers)
+
+    async def do_my_assignments(self, client, headers):
+        await self.recorder.call(client, "GET /assignments/my", "GET", "/assignments/my", headers=headers)
+
+    async def do_additional_skills(self, client, headers):
+        # Same sequence as the profile page: list, add, edit, remove.
+        await self.recorder.call(client, "GET /additional-skills/", "GET", "/additional-skills/", headers=headers)
+        skill = {
+            "skill_name": f"Load Test Skill {self.number}-{next(self.skill_counter)}",
+            "skill_level": "L2",
+            "skill_category": "Technical",
+            "description": "created by loadtest",
+        }
+        created = await self.recorder.call(client, "POST /additional-skills/", "POST", "/additional-skills/", headers=headers, json=skill)
+        if created is None or created.status_code != 200:
+            return
+        skill_id = created.json()["id"]
+        await self.recorder.call(
+            client, "PUT /additional-skills/{skill_id}", "PUT", f"/additional-skills/{skill_id}",
+            headers=headers, json={"skill_level": "L3"},
+        )
+        await self.recorder.call(
+            client, "DELETE /additional-skills/{skill_id}", "DELETE", f"/additional-skills/{skill_id}", headers=headers,
+        )
+
+    async def do_upload_and_refresh(self, client, headers):
+        files = {"file": ("loadtest.xlsx", self.workbook, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+        await self.recorder.call(client, "POST /upload-and-refresh", "POST", "/upload-and-refresh", headers=headers, files=files)
+
+
+async def run_scenario(scenario: Dict, base_url: str) -> Dict:
+    spec = org_spec(scenario.get("org"))
+    load = {**DEFAULT_LOAD, **scenario.get("load", {})}
+    people = build_people(spec)
+    managers = [p for p in people if p["role"] == "manager"]
+    employees = [p for p in people if p["role"] == "employee"]
+    workbook = synthetic.build_training_workbook(spec["catalog_size"], seed=spec["seed"]).getvalue()
+
+    rng = random.Random(spec["seed"])
+    recorder = Recorder()
+    users = []
+    for number in range(load["virtual_users"]):
+        pool = managers if managers and rng.random() < load["manager_share"] else employees
+        users.append(VirtualUser(number, rng.choice(pool), spec["password"], load, recorder, workbook))
+
+    limits = httpx.Limits(max_connections=load["virtual_users"], max_keepalive_connections=load["virtual_users"])
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        deadline = start + load["ramp_up_s"] + load["duration_s"]
+
+        async def start_user(user: VirtualUser, delay: float):
+            await asyncio.sleep(delay)
+            await user.run(client, deadline)
+
+        ramp_step = load["ramp_up_s"] / max(1, len(users))
+        await asyncio.gather(*(start_user(user, i * ramp_step) for i, user in enumerate(users)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "meta": {
+            "scenario": scenario.get("name"),
+            "commit": git_commit(),
+            "created_at": datetime.utcnow().isoformat(),
+            "base_url": base_url,
+            "org": {k: v for k, v in spec.items() if k != "password"},
+            "people": len(people),
+            "load": load,
+        },
+        "report": recorder.report(elapsed),
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"{'route':<36}{'reqs':>8}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in report["routes"].items():
+        print(
+            f"{route:<36}{stats['requests']:>8}{stats['errors']:>6}{stats['throughput_rps']:>9.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+        )
+    print(f"\nTotal: {report['total_requests']} requests, {report['total_errors']} errors, "
+          f"{report['throughput_rps']:.1f} req/s over {report['elapsed_s']:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", help="scenario JSON file (see loadtest/scenarios/)")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--output", help="report file (default: loadtest/results/<scenario>-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    with open(args.scenario) as f:
+        scenario = json.load(f)
+    result = asyncio.run(run_scenario(scenario, args.base_url))
+    print_report(result["report"])
+
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    path = Path(args.output) if args.output else RESULTS_DIR / f"{scenario.get('name', 'scenario')}-{result['meta']['commit']}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2))
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# loadtest/orggen.py
+"""
+Generates a synthetic organisation (manager tree, competencies, additional
+skills, training catalog and assignments) and loads it into Postgres.
+
+    cd backend
+    python -m loadtest.orggen loadtest/scenarios/steady.json --reset
+
+--reset empties the application tables first. Never point this at a real database.
+
+Catalog rows get the columns the Excel ingest derives (seat capacity, schedule
+window, trainer employee id) from the same helpers, and the skill dictionary
+is populated as after an upload, so seat, conflict and taxonomy paths see
+realistic data.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from typing import Dict, List
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app import taxonomy
+from app.auth_utils import get_password_hash
+from app.database import DATABASE_URL
+from app.models import (
+    AdditionalSkill, Base, EmployeeCompetency, ManagerEmployee, TrainingAssignment, TrainingDetail, User,
+)
+from app.org_directory import OrgDirectory
+from app.parsing import parse_seats, training_window
+from benchmarks import synthetic
+
+DEFAULT_ORG = {
+    "depth": 3,
+    "fan_out": 8,
+    "skills_per_person": 10,
+    "additional_skills_per_person": 3,
+    "catalog_size": 2000,
+    "assignments_per_person": 2,
+    "seed": synthetic.DEFAULT_SEED,
+    "password": "loadtest",
+}
+
+# Every table in the models, so tables added by later migrations are reset too
+APP_TABLES = [table.name for table in reversed(Base.metadata.sorted_tables)]
+BATCH_SIZE = 5000
+
+
+def org_spec(overrides: Dict) -> Dict:
+    return {**DEFAULT_ORG, **(overrides or {})}
+
+
+def build_people(spec: Dict) -> List[Dict]:
+    """
+    The manager tree: a root manager with `fan_out` reports per manager down to
+    `depth` levels. Only depends on the spec, so the load harness can rebuild it
+    without touching the database.
+    """
+    rng = random.Random(spec["seed"])
+    people = [{"empid": "E0000000", "name": synthetic.person_name(rng), "manager": None, "level": 0}]
+    frontier = [people[0]]
+    for level in range(1, spec["depth"] + 1):
+        next_frontier = []
+        for manager in frontier:
+            for _ in range(spec["fan_out"]):
+                person = {
+                    "empid": f"E{len(people):07d}",
+                    "name": synthetic.person_name(rng),
+                    "manager": manager["empid"],
+                    "level": level,
+                }
+                people.append(person)
+                next_frontier.append(person)
+        frontier = next_frontier
+
+    managers = {p["manager"] for p in people if p["manager"]}
+    for person in people:
+        person["role"] = "manager" if person["empid"] in managers else "employee"
+    return people
+
+
+def build_org(spec: Dict) -> Dict[str, List[Dict]]:
+    """All table rows for the organisation described by `spec`."""
+    rng = random.Random(spec["seed"] + 1)
+    people = build_people(spec)
+    by_empid = {p["empid"]: p for p in people}
+    trainer_flags = {p["empid"]: rng.random() < 0.05 for p in people}
+
+    # Trainings are taught by people flagged as trainers, named as in the Excel sheet
+    trainers = [p for p in people if trainer_flags[p["empid"]]] or people[:1]
+    catalog = synthetic.training_rows(spec["catalog_size"], seed=spec["seed"])
+    for training_id, training in enumerate(catalog, start=1):
+        training["id"] = training_id
+        trainer = rng.choice(trainers)["name"]
+        training["trainer_name"] = trainer
+        training["email"] = trainer.lower().replace(" ", ".") + "@example.com"
+        training["seat_capacity"] = parse_seats(training["seats"])
+        training["starts_at"], training["ends_at"] = training_window(
+            training["training_date"], training["time"], training["duration"]
+        )
+
+    relations, competencies, additional, assignments = [], [], [], []
+    for person in people:
+        if person["manager"]:
+            manager = by_empid[person["manager"]]
+            relations.append({
+                "manager_empid": manager["empid"],
+                "manager_name": manager["name"],
+                "employee_empid": person["empid"],
+                "employee_name": person["name"],
+                "manager_is_trainer": trainer_flags[manager["empid"]],
+                "employee_is_trainer": trainer_flags[person["empid"]],
+            })
+
+        division, department, project = (
+            rng.choice(synthetic.DIVISIONS), rng.choice(synthetic.DEPARTMENTS), rng.choice(synthetic.PROJECTS)
+        )
+        for skill in rng.sample(synthetic.SKILLS, min(spec["skills_per_person"], len(synthetic.SKILLS))):
+            competencies.append({
+                "employee_empid": person["empid"],
+                "employee_name": person["name"],
+                "department": department,
+                "division": division,
+                "project": project,
+                "competency": rng.choice(synthetic.COMPETENCIES),
+                "skill": skill,
+                "current_expertise": rng.choice(synthetic.LEVELS[:5]),
+                "target_expertise": rng.choice(synthetic.LEVELS[1:]),
+            })
+        for skill in rng.sample(synthetic.SKILLS, min(spec["additional_skills_per_person"], len(synthetic.SKILLS))):
+            additional.append({
+                "employee_empid": person["empid"],
+                "skill_name": skill,
+                "skill_level": rng.choice(synthetic.LEVELS[1:]),
+                "skill_category": rng.choice(["Technical", "Tool", "Domain", "Soft"]),
+                "description": None,
+            })
+        if person["manager"] and catalog:
+            for training in rng.sample(catalog, min(spec["assignments_per_person"], len(catalog))):
+                assignments.append({
+                    "training_id": training["id"],
+                    "employee_empid": person["empid"],
+                    "manager_empid": person["manager"],
+                })
+
+    password_hash = get_password_hash(spec["password"])
+    users = [{"username": p["empid"], "hashed_password": password_hash} for p in people]
+
+    return {
+        "users": users,
+        "manager_employee": relations,
+        "employee_competency": competencies,
+        "additional_skills": additional,
+        "training_details": catalog,
+        "training_assignments": assignments,
+    }
+
+
+async def load_org(spec: Dict, database_url: str, reset: bool = False) -> Dict[str, int]:
+    org = build_org(spec)
+    tables = [
+        ("users", User), ("manager_employee", ManagerEmployee), ("employee_competency", EmployeeCompetency),
+        ("additional_skills", AdditionalSkill), ("training_details", TrainingDetail),
+        ("training_assignments", TrainingAssignment),
+    ]
+    engine = create_async_engine(database_url)
+    try:
+        async with AsyncSession(engine) as db, db.begin():
+            if reset:
+                await db.execute(text(f"TRUNCATE {', '.join(APP_TABLES)} RESTART IDENTITY CASCADE"))
+            for name, model in tables:
+                rows = org[name]
+                if model is TrainingDetail:
+                    # Resolved against the org just loaded, as excel_loader does
+                    org_snapshot = await OrgDirectory().build(db)
+                    for row in rows:
+                        row["trainer_empid"] = org_snapshot.trainer_empid(row["email"], row["trainer_name"])
+                for start in range(0, len(rows), BATCH_SIZE):
+                    await db.execute(insert(model), rows[start:start + BATCH_SIZE])
+            await taxonomy.populate(db)
+            # Catalog ids were assigned explicitly; move the sequence past them.
+            await db.execute(text(
+                "SELECT setval(pg_get_serial_sequence('training_details', 'id'), "
+                "(SELECT COALESCE(MAX(id), 1) FROM training_details))"
+            ))
+    finally:
+        await engine.dispose()
+    return {name: len(org[name]) for name, _ in tables}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", help="scenario JSON file; its 'org' section describes the organisation")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--reset", action="store_true", help="truncate the application tables first")
+    args = parser.parse_args()
+
+    with open(args.scenario) as f:
+        spec = org_spec(json.load(f).get("org"))
+    counts = asyncio.run(load_org(spec, args.database_url, args.reset))
+    for name, count in counts.items():
+        print(f"{name:<22} {count:>9} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+from sqlalchemy.dialects import postgresql
+
+from app.routes.additional_skills import _update_statement
+from app.schemas import AdditionalSkillBatchUpdate
+
+
+def compile_for_postgres(statement) -> str:
+    return str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+def test_level_only_batch_types_skill_id():
+    # No item renames a skill, so every skill_id in the VALUES list is NULL;
+    # it must still be typed, or Postgres reads the column as text and the
+    # CASE against skills.skill_id (integer) fails.
+    items = [AdditionalSkillBatchUpdate(id=1, skill_level="L3"), AdditionalSkillBatchUpdate(id=2, skill_level="L2")]
+    sql = compile_for_postgres(_update_statement("E1", items, {}))
+    values = sql[sql.index("(VALUES"):sql.index(") AS changes")]
+    assert values.count("AS INTEGER)") == len(items)
+
+
+def test_rename_batch_binds_resolved_skill_id():
+    items = [AdditionalSkillBatchUpdate(id=1, skill_name="Rust"), AdditionalSkillBatchUpdate(id=2, skill_level="L4")]
+    statement = _update_statement("E1", items, {"Rust": 7})
+    params = statement.compile(dialect=postgresql.asyncpg.dialect()).params
+    assert 7 in params.values()
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from starlette.requests import Request
+
+from app.http_cache import is_fresh
+
+
+def request_with(headers: dict) -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_if_modified_since_with_unknown_zone_offset():
+    # parsedate_to_datetime returns a naive datetime for "-0000"
+    request = request_with({"If-Modified-Since": "Mon, 02 Mar 2026 10:00:00 -0000"})
+    assert is_fresh(request, "catalog-1", datetime(2026, 3, 2, 9, 0))
+    assert not is_fresh(request, "catalog-1", datetime(2026, 3, 2, 11, 0))
+
+
+def test_if_modified_since_gmt():
+    request = request_with({"If-Modified-Since": "Mon, 02 Mar 2026 10:00:00 GMT"})
+    assert is_fresh(request, "catalog-1", datetime(2026, 3, 2, 10, 0, 0, 500))
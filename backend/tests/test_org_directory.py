@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from app.org_directory import OrgSnapshot
+
+
+def relation(manager_empid, manager_name, employee_empid, employee_name, manager_is_trainer=False, employee_is_trainer=False):
+    return SimpleNamespace(
+        manager_empid=manager_empid, manager_name=manager_name, manager_is_trainer=manager_is_trainer,
+        employee_empid=employee_empid, employee_name=employee_name, employee_is_trainer=employee_is_trainer,
+    )
+
+
+ORG = OrgSnapshot([
+    relation("M1", "Asha Rao", "E1", "Ravi Kumar", manager_is_trainer=True),
+    relation("M2", "Ravi  Kumar", "E2", "Meera Iyer", manager_is_trainer=True),
+])
+
+
+def test_trainer_name_resolves_to_empid():
+    assert ORG.trainer_empid("asha rao") == "M1"
+
+
+def test_namesake_trainer_wins():
+    # E1 and M2 share a name; only M2 teaches
+    assert ORG.trainer_empid("Ravi Kumar") == "M2"
+
+
+def test_empid_is_taken_as_is_and_first_match_wins():
+    assert ORG.trainer_empid("E2", "Asha Rao") == "E2"
+    assert ORG.trainer_empid(None, "Meera Iyer") == "E2"
+
+
+def test_unknown_trainer_is_unresolved():
+    assert ORG.trainer_empid("nobody@example.com", "Nobody") is None
@@ -0,0 +1,42 @@
+from datetime import date, datetime, time
+
+import pytest
+
+from app.parsing import parse_seats, parse_time_range, training_window
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("10:00 AM", (time(10, 0), None)),
+    ("14:30", (time(14, 30), None)),
+    ("3 PM", (time(15, 0), None)),
+    ("10am - 12pm", (time(10, 0), time(12, 0))),
+    ("10 - 12pm", (time(10, 0), time(12, 0))),
+    ("10.30 -11.30 AM", (time(10, 30), time(11, 30))),
+    ("02.00 PM -03.00 PM", (time(14, 0), time(15, 0))),
+    ("Day 2, 10:00 AM", (time(10, 0), None)),
+])
+def test_time_ranges(value, expected):
+    assert parse_time_range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["Day 2", "Batch 1", "Session 12", "10"])
+def test_bare_numbers_are_not_times(value):
+    assert parse_time_range(value) == (None, None)
+
+
+def test_training_without_usable_time_blocks_the_day():
+    assert training_window(date(2025, 3, 4), "Day 2", "2") == (datetime(2025, 3, 4), datetime(2025, 3, 5))
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("20", 20),
+    ("20.0", 20),
+    (20.0, 20),
+    ("20 seats", 20),
+    ("1,000", 1000),
+    ("1,000 seats", 1000),
+    ("20,30", 20),
+    ("TBD", None),
+])
+def test_seats(value, expected):
+    assert parse_seats(value) == expected
@@ -0,0 +1,41 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app import config, slow_query_log
+from benchmarks.common import create_sqlite_database
+
+SECRET = "s3cret-token"
+
+
+def run_logged(statement, parameters):
+    async def run():
+        engine, _ = await create_sqlite_database()
+        slow_query_log.install(engine)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(statement, parameters)
+        finally:
+            await engine.dispose()
+
+    slow_query_log.clear()
+    asyncio.run(run())
+    return slow_query_log.get_entries()[0]
+
+
+def test_parameter_values_are_not_stored_by_default(monkeypatch):
+    monkeypatch.setattr(config, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    monkeypatch.setattr(config, "SLOW_QUERY_EXPLAIN", False)
+    entry = run_logged(text("SELECT :api_token, :n"), {"api_token": SECRET, "n": 3})
+    assert entry["parameters"] == [{"api_token": "str", "n": "int"}]
+    assert SECRET not in repr(entry)
+
+
+def test_values_are_opt_in_and_still_redacted(monkeypatch):
+    monkeypatch.setattr(config, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    monkeypatch.setattr(config, "SLOW_QUERY_EXPLAIN", False)
+    monkeypatch.setattr(config, "SLOW_QUERY_LOG_VALUES", True)
+    entry = run_logged(
+        text("SELECT :hashed_password, :username"), {"hashed_password": SECRET, "username": "E1"}
+    )
+    assert entry["parameters"] == [{"hashed_password": slow_query_log.REDACTED, "username": "E1"}]
@@ -0,0 +1,32 @@
+import pytest
+
+from app.taxonomy import skill_key
+from benchmarks.synthetic import SKILLS
+
+
+@pytest.mark.parametrize("spelling, key", [
+    ("Python3", "python"),
+    ("Python v3.11", "python"),
+    ("Python 3.11", "python"),
+    ("Angular 16", "angular"),
+    ("HTML5", "html"),
+    ("AUTOSAR 4.3", "autosar"),
+    ("ES6", "es6"),
+    ("S3", "s3"),
+])
+def test_version_suffixes_are_stripped(spelling, key):
+    assert skill_key(spelling) == key
+
+
+@pytest.mark.parametrize("standard, key", [
+    ("ISO 26262", "iso 26262"),
+    ("ISO 9001", "iso 9001"),
+    ("IEC 61508", "iec 61508"),
+])
+def test_standard_numbers_are_kept(standard, key):
+    assert skill_key(standard) == key
+
+
+def test_synthetic_skills_keep_distinct_keys():
+    keys = [skill_key(name) for name in SKILLS]
+    assert len(set(keys)) == len(SKILLS)